@@ -0,0 +1,235 @@
+"""
+ingest.py
+---------
+Command-line bulk ingestion: runs many article URLs through the scraper
+pipeline and the LangGraph workflow (which stores the results in Pinecone)
+without going through the HTTP API.
+
+This module:
+    - Reads URLs from a file or stdin, one per line (blank lines and lines
+      starting with "#" are ignored; duplicates are dropped after URL
+      normalization).
+    - Processes up to `--workers` URLs at a time on one event loop: the
+      scraper runs in worker threads, the LangGraph workflow is awaited.
+    - Appends one JSON line per finished URL to a checkpoint file, so an
+      interrupted run can be restarted with the same command and skips the
+      URLs that are already done. Failed URLs are retried with
+      `--retry-failed`.
+    - Prints throughput, per-stage latency (scrape, workflow) and failure
+      counts per stage when the run ends, and optionally writes them to a
+      JSON report.
+
+Usage:
+    $ uv run python -m app.cli.ingest urls.txt --workers 8
+    $ cat urls.txt | uv run python -m app.cli.ingest - --checkpoint run1.jsonl
+
+Functions:
+    main(argv: list[str] | None = None) -> int
+        Entry point; returns the process exit code (1 if any URL failed).
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+import asyncio
+from app.modules.pipeline import run_scraper_pipeline, run_langgraph_workflow
+from app.modules.scraper.cache import normalize_url
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+STAGES = ("scrape", "workflow")
+
+
+def read_urls(source) -> list:
+    urls, seen = [], set()
+    for line in source:
+        url = line.strip()
+        if not url or url.startswith("#"):
+            continue
+        key = normalize_url(url)
+        if key not in seen:
+            seen.add(key)
+            urls.append(url)
+    return urls
+
+
+def load_checkpoint(path: str) -> dict:
+    """Return {normalized url: last checkpoint record} from `path`."""
+    records = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # partial line from an interrupted write
+                records[normalize_url(record["url"])] = record
+    except FileNotFoundError:
+        pass
+    return records
+
+
+async def ingest_url(url: str) -> dict:
+    """Run one URL through both stages and return its checkpoint record."""
+    timings = {}
+    record = {"url": url, "status": "done", "timings": timings}
+
+    start = time.perf_counter()
+    try:
+        article = await asyncio.to_thread(run_scraper_pipeline, url)
+    except Exception as e:
+        article = None
+        record.update(status="failed", stage="scrape", message=str(e))
+    timings["scrape"] = round(time.perf_counter() - start, 3)
+    if article is not None and not article.get("cleaned_text"):
+        error = (article.get("fetch") or {}).get("error")
+        record.update(
+            status="failed",
+            stage="scrape",
+            message=error or "Failed to extract article.",
+        )
+    if record["status"] == "failed":
+        return record
+
+    start = time.perf_counter()
+    try:
+        result = await run_langgraph_workflow(article)
+        if result.get("status") == "stopped_due_to_error":
+            record.update(
+                status="failed", stage="workflow", message=str(result.get("message"))
+            )
+    except Exception as e:
+        record.update(status="failed", stage="workflow", message=str(e))
+    timings["workflow"] = round(time.perf_counter() - start, 3)
+    return record
+
+
+def _latency_summary(values: list) -> dict:
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "mean": round(statistics.fmean(ordered), 3),
+        "p50": round(ordered[len(ordered) // 2], 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def summarize(records: list, skipped: int, elapsed: float) -> dict:
+    failures = {}
+    for record in records:
+        if record["status"] == "failed":
+            failures[record["stage"]] = failures.get(record["stage"], 0) + 1
+    done = sum(record["status"] == "done" for record in records)
+    return {
+        "processed": len(records),
+        "succeeded": done,
+        "failed": len(records) - done,
+        "skipped": skipped,
+        "elapsed_seconds": round(elapsed, 1),
+        "articles_per_minute": round(len(records) / elapsed * 60, 2) if elapsed else 0,
+        "latency": {
+            stage: _latency_summary(
+                [r["timings"][stage] for r in records if stage in r["timings"]]
+            )
+            for stage in STAGES
+        },
+        "failures_by_stage": failures,
+    }
+
+
+def print_summary(summary: dict) -> None:
+    print(
+        f"\nProcessed {summary['processed']} URLs in {summary['elapsed_seconds']}s "
+        f"({summary['articles_per_minute']} articles/min): "
+        f"{summary['succeeded']} succeeded, {summary['failed']} failed, "
+        f"{summary['skipped']} skipped from checkpoint"
+    )
+    for stage, latency in summary["latency"].items():
+        if latency["count"]:
+            print(
+                f"  {stage:<9} n={latency['count']:<5} mean={latency['mean']}s "
+                f"p50={latency['p50']}s p95={latency['p95']}s max={latency['max']}s"
+            )
+    for stage, count in summary["failures_by_stage"].items():
+        print(f"  failed at {stage}: {count}")
+
+
+async def _ingest_all(todo: list, workers: int, checkpoint, records: list) -> None:
+    """Ingest `todo`, appending each finished record to `checkpoint` and `records`."""
+    semaphore = asyncio.Semaphore(workers)
+
+    async def run(url):
+        async with semaphore:
+            return await ingest_url(url)
+
+    tasks = [asyncio.create_task(run(url)) for url in todo]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            record = await next_done
+            record["finished_at"] = time.time()
+            checkpoint.write(json.dumps(record, ensure_ascii=False) + "\n")
+            checkpoint.flush()
+            records.append(record)
+            if len(records) % 10 == 0 or len(records) == len(todo):
+                print(f"{len(records)}/{len(todo)} done", file=sys.stderr)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Ingest articles into the Perspective pipeline."
+    )
+    parser.add_argument("input", nargs="?", default="-", help="URL file, or - for stdin")
+    parser.add_argument("--checkpoint", default="ingest_checkpoint.jsonl")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--retry-failed", action="store_true", help="Also redo URLs that failed before"
+    )
+    parser.add_argument("--report", help="Write the summary as JSON to this file")
+    args = parser.parse_args(argv)
+
+    if args.input == "-":
+        urls = read_urls(sys.stdin)
+    else:
+        with open(args.input, encoding="utf-8") as f:
+            urls = read_urls(f)
+
+    finished = load_checkpoint(args.checkpoint)
+    todo = [
+        url
+        for url in urls
+        if (record := finished.get(normalize_url(url))) is None
+        or (record["status"] == "failed" and args.retry_failed)
+    ]
+    skipped = len(urls) - len(todo)
+    logger.info(
+        f"Ingesting {len(todo)} URLs with {args.workers} workers "
+        f"({skipped} already in {args.checkpoint})"
+    )
+
+    records = []
+    start = time.perf_counter()
+    with open(args.checkpoint, "a", encoding="utf-8") as checkpoint:
+        try:
+            asyncio.run(_ingest_all(todo, args.workers, checkpoint, records))
+        except KeyboardInterrupt:
+            print("Interrupted; finished URLs are in the checkpoint.", file=sys.stderr)
+
+    summary = summarize(records, skipped, time.perf_counter() - start)
+    print_summary(summary)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,62 +1,121 @@
 """
 vector_store.py
 ------------------
-Initializes and manages the Pinecone vector database connection for the Perspective API.
+Initializes and manages the Pinecone vector database index for the Perspective API.
 
 This module:
-    - Loads Pinecone credentials from environment variables.
-    - Creates the Pinecone index if it does not exist.
+    - Defines the index name, dimensionality and similarity metric.
+    - Creates the index if it does not exist.
     - Connects to the specified index for vector operations.
 
+The Pinecone client and the connected index are owned by
+`app.utils.registry`; use `get_index()` from there instead of calling
+`init_index()` directly, so the process keeps a single index handle.
+
 Attributes:
-    PINECONE_API_KEY (str): API key for authenticating with Pinecone.
     INDEX_NAME (str): Name of the Pinecone index used for storing vectors.
     DIMENSIONS (int): Dimensionality of vector embeddings.
     METRIC (str): Similarity metric used for vector comparison.
-    index (pinecone.Index): Connected Pinecone index instance.
+
+Classes:
+    AsyncIndex
+        Awaitable upsert/query against the index's data-plane REST API,
+        sent through the shared pooled HTTP client.
+
+Functions:
+    init_index(pc: Pinecone) -> pinecone.Index:
+        Creates the index when needed and returns a connected handle.
 
 Raises:
-    ValueError: If `PINECONE_API_KEY` is not set in environment variables.
-    RuntimeError: If Pinecone initialization or index connection fails.
+    RuntimeError: If the index connection fails.
 """
 
-import os
-from pinecone import Pinecone, ServerlessSpec, CloudProvider, AwsRegion
+from app.utils.http_client import get_http_client
 from app.logging.logging_config import setup_logger
 
 
 logger = setup_logger(__name__)
 
-# Load Pinecone credentials from environment variables
-PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
-if not PINECONE_API_KEY:
-    raise ValueError("PINECONE_API_KEY environment variable is required")
-try:
-    # Initialize Pinecone client
-    pc = Pinecone(api_key=PINECONE_API_KEY)
-
-except Exception as e:
-    raise RuntimeError(f"Error occured while intialising pinecone client:{e}")
-
 # Constants
 INDEX_NAME = "perspective"
 DIMENSIONS = 384
 METRIC = "cosine"
+API_VERSION = "2025-04"
+REQUEST_TIMEOUT = 30.0
+
+
+def init_index(pc):
+    from pinecone import ServerlessSpec, CloudProvider, AwsRegion
+
+    # Create index if it doesn't exist
+    if not pc.has_index(INDEX_NAME):
+        logger.info(f"Creating index: {INDEX_NAME}")
+        pc.create_index(
+            name=INDEX_NAME,
+            dimension=DIMENSIONS,
+            metric=METRIC,
+            spec=ServerlessSpec(cloud=CloudProvider.AWS, region=AwsRegion.US_EAST_1),
+        )
+    else:
+        logger.info(f"Index '{INDEX_NAME}' already exists")
+
+    try:
+        # Connect to the index
+        return pc.Index(INDEX_NAME)
+    except Exception as e:
+        raise RuntimeError(
+            f"Error occured while connecting to the index {INDEX_NAME}:{e}"
+        )
+
+
+class AsyncIndex:
+    """
+    Minimal async client for one Pinecone index.
+
+    The Pinecone SDK's asyncio support needs extra dependencies; the two
+    data-plane calls the app makes are simple JSON requests, so they go
+    through the shared httpx client instead.
+
+    Args:
+        host (str): Index host, as returned by `describe_index`.
+        api_key (str): Pinecone API key.
+    """
+
+    def __init__(self, host: str, api_key: str):
+        self.base_url = host if host.startswith("http") else f"https://{host}"
+        self.headers = {
+            "Api-Key": api_key,
+            "X-Pinecone-API-Version": API_VERSION,
+            "Content-Type": "application/json",
+        }
+
+    async def _post(self, path: str, body: dict) -> dict:
+        res = await get_http_client().apost(
+            f"{self.base_url}{path}",
+            json=body,
+            headers=self.headers,
+            timeout=REQUEST_TIMEOUT,
+        )
+        if not res.ok:
+            raise RuntimeError(
+                f"Pinecone {path} failed with HTTP {res.status}: {res.text[:200]}"
+            )
+        return res.json()
+
+    async def upsert(self, vectors, namespace: str = "default") -> dict:
+        return await self._post(
+            "/vectors/upsert", {"vectors": vectors, "namespace": namespace}
+        )
 
-# Create index if it doesn't exist
-if not pc.has_index(INDEX_NAME):
-    logger.info(f"Creating index: {INDEX_NAME}")
-    pc.create_index(
-        name=INDEX_NAME,
-        dimension=DIMENSIONS,
-        metric=METRIC,
-        spec=ServerlessSpec(cloud=CloudProvider.AWS, region=AwsRegion.US_EAST_1),
-    )
-else:
-    logger.info(f"Index '{INDEX_NAME}' already exists")
-
-try:
-    # Connect to the index
-    index = pc.Index(INDEX_NAME)
-except Exception as e:
-    raise RuntimeError(f"Error occured while connecting to the index {INDEX_NAME}:{e}")
+    async def query(
+        self, vector, top_k: int = 5, include_metadata: bool = True, namespace: str = "default"
+    ) -> dict:
+        return await self._post(
+            "/query",
+            {
+                "vector": vector,
+                "topK": top_k,
+                "includeMetadata": include_metadata,
+                "namespace": namespace,
+            },
+        )
@@ -4,14 +4,19 @@ check_bias.py
 Provides functionality to evaluate the bias score of an article using the Groq API.
 
 This module:
-    - Loads environment variables for Groq API credentials.
-    - Connects to the Groq client.
+    - Calls the LLM through `app.utils.llm` (cached by default).
     - Defines `check_bias()` to analyze a given article's bias and return a score.
 
 Functions:
-    check_bias(text: str) -> dict:
-        Analyzes the input article text and returns a bias score between 0 and 100,
+    async check_bias(article: dict | str) -> dict:
+        Analyzes the article and returns a bias score between 0 and 100,
         where 0 indicates the least bias and 100 indicates the highest bias.
+        Accepts the scraper pipeline output (its text is trimmed to the bias
+        token budget using the article digest) or plain text.
+
+    parse_bias_score(raw: str) -> int | None:
+        Returns the first integer of a `check_bias` reply, clamped to
+        0-100, or None if the reply contains no number.
 
 Environment Variables:
     GROQ_API_KEY (str): API key for authenticating with Groq.
@@ -22,29 +27,32 @@ Raises:
 """
 
 
-import os
-from groq import Groq
-from dotenv import load_dotenv
-import json
+import re
+from app.utils.llm import chat_completion
+from app.modules.scraper.digest import stage_text
 from app.logging.logging_config import setup_logger
 
 logger = setup_logger(__name__)
 
-load_dotenv()
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+def parse_bias_score(raw):
+    m = re.search(r"\b(\d{1,3})\b", str(raw))
+    return max(0, min(100, int(m.group(1)))) if m else None
 
 
-def check_bias(text):
+async def check_bias(article):
     try:
-        logger.debug(f"Raw article text: {text}")
-        logger.debug(f"JSON dump of text: {json.dumps(text)}")
+        if isinstance(article, dict):
+            text = stage_text(article, "bias")
+        else:
+            text = stage_text({"cleaned_text": article}, "bias")
+        logger.debug(f"Article text for bias check: {text}")
 
         if not text:
             logger.error("Missing or empty 'cleaned_text'")
             raise ValueError("Missing or empty 'cleaned_text'")
 
-        chat_completion = client.chat.completions.create(
+        bias_score = await chat_completion(
             messages=[
                 {
                     "role": "system",
@@ -64,8 +72,10 @@ def check_bias(text):
             model="gemma2-9b-it",
             temperature=0.3,
             max_tokens=512,
+            # Only replies containing a score are worth serving again.
+            cacheable=lambda reply: parse_bias_score(reply) is not None,
         )
-        bias_score = chat_completion.choices[0].message.content.strip()
+        bias_score = bias_score.strip()
         logger.info(f"Bias score calculated: {bias_score}")
 
         return {
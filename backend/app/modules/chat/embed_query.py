@@ -5,7 +5,9 @@ Provides functionality to generate vector embeddings for text queries using
 the Sentence Transformers library.
 
 This module:
-    - Loads a pre-trained "all-MiniLM-L6-v2" model.
+    - Uses the shared "all-MiniLM-L6-v2" model from `app.utils.registry`,
+      through `app.utils.providers` (kind "embedding") so embeddings can
+      be recorded and replayed.
     - Defines a helper function `embed_query()` to encode a query string into
       a list of numerical embeddings.
 
@@ -20,12 +22,15 @@ Model:
 """
 
 
-from sentence_transformers import SentenceTransformer
-
-embedder = SentenceTransformer("all-MiniLM-L6-v2")
+from app.utils.registry import get_embedder, EMBEDDING_MODEL
+from app.utils.providers import provide_sync
 
 
 def embed_query(query: str):
-    embeddings = embedder.encode(query).tolist()
+    embeddings = provide_sync(
+        "embedding",
+        (EMBEDDING_MODEL, query),
+        lambda: get_embedder().encode(query).tolist(),
+    )
 
     return embeddings
@@ -5,46 +5,51 @@ Provides functionality to perform semantic search queries on the Pinecone
 vector database for Retrieval-Augmented Generation (RAG) workflows.
 
 This module:
-    - Loads Pinecone credentials from environment variables.
-    - Connects to the "perspective" index in Pinecone.
+    - Uses the shared async "perspective" index handle from
+      `app.utils.registry`, through `app.utils.providers` (kind
+      "pinecone") so queries can be recorded and replayed.
     - Defines `search_pinecone()` to search stored vector embeddings and
       retrieve the most relevant matches.
 
 Functions:
-    search_pinecone(query: str, top_k: int = 5) -> list[dict]:
+    async search_pinecone(query: str, top_k: int = 5) -> list[dict]:
         Encodes the input query, searches Pinecone for the most similar
-        vectors, and returns a list of matches with metadata.
-
-Environment Variables:
-    PINECONE_API_KEY (str): API key for authenticating with Pinecone.
+        vectors, and returns a list of matches with metadata. The query is
+        embedded in a worker thread.
 
 Dependencies:
     - app.modules.chat.embed_query (for generating embeddings)
-    - pinecone (Pinecone client library)
+    - app.utils.registry (shared Pinecone index handle)
 """
 
 
-from pinecone import Pinecone
-from dotenv import load_dotenv
+import asyncio
 from app.modules.chat.embed_query import embed_query
-import os
-
-load_dotenv()
+from app.utils.registry import get_async_index
+from app.utils.concurrency import limit
+from app.utils.providers import provide
 
-pc = Pinecone(os.getenv("PINECONE_API_KEY"))
-index = pc.Index("perspective")
 
+async def search_pinecone(query: str, top_k: int = 5):
+    async with limit("embedding"):
+        embeddings = await asyncio.to_thread(embed_query, query)
 
-def search_pinecone(query: str, top_k: int = 5):
-    embeddings = embed_query(query)
+    async def live():
+        index = await asyncio.to_thread(get_async_index)
+        return await index.query(
+            vector=embeddings, top_k=top_k, include_metadata=True, namespace="default"
+        )
 
-    results = index.query(
-        vector=embeddings, top_k=top_k, include_metadata=True, namespace="default"
-    )
+    async with limit("vector"):
+        results = await provide("pinecone", ("query", embeddings, top_k), live)
 
     matches = []
     for match in results["matches"]:
         matches.append(
-            {"id": match["id"], "score": match["score"], "metadata": match["metadata"]}
+            {
+                "id": match["id"],
+                "score": match["score"],
+                "metadata": match.get("metadata", {}),
+            }
         )
     return matches
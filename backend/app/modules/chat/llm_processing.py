@@ -4,7 +4,9 @@ llm_processing.py
 Handles Large Language Model (LLM) interactions for context-based question answering.
 
 This module:
-    - Connects to the Groq API using credentials from environment variables.
+    - Calls the LLM through `app.utils.llm`; answers are cached, so a
+      repeated question over the same retrieved context is answered from
+      the cache.
     - Builds a context string from retrieved documents.
     - Sends user questions along with context to the LLM.
     - Returns generated answers.
@@ -14,25 +16,29 @@ Functions:
         Extracts relevant fields (explanation or reasoning) from document
         metadata and combines them into a single context string.
 
-    ask_llm(question: str, docs: list[dict]) -> str:
+    build_messages(question: str, docs: list[dict]) -> list[dict]:
+        Chat messages asking the question over the documents' context.
+
+    async ask_llm(question: str, docs: list[dict]) -> str:
         Builds context from the provided documents, sends it along with the
         question to the LLM, and returns the model's answer.
 
+    async stream_llm(question: str, docs: list[dict]) -> AsyncIterator[str]:
+        Same prompt as `ask_llm`; yields the answer as it is generated.
+        Closing it early also closes the underlying LLM stream.
+
 Environment Variables:
     GROQ_API_KEY (str): API key for authenticating with Groq.
 """
 
 
-import os
-from groq import Groq
-from dotenv import load_dotenv
+from contextlib import aclosing
+from app.utils.llm import chat_completion, stream_chat_completion
 from app.logging.logging_config import setup_logger
 
 logger = setup_logger(__name__)
 
-load_dotenv()
-
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+ANSWER_MODEL = "gemma2-9b-it"
 
 
 def build_context(docs):
@@ -42,7 +48,7 @@ def build_context(docs):
     )
 
 
-def ask_llm(question, docs):
+def build_messages(question, docs):
     context = build_context(docs)
     logger.debug(f"Generated context for LLM:\n{context}")
     prompt = f"""You are an assistant that answers based on context.
@@ -53,13 +59,29 @@ Context:
 Question:
 {question}
 """
+    return [
+        {"role": "system", "content": "Use only the context to answer."},
+        {"role": "user", "content": prompt},
+    ]
+
 
-    response = client.chat.completions.create(
-        model="gemma2-9b-it",
-        messages=[
-            {"role": "system", "content": "Use only the context to answer."},
-            {"role": "user", "content": prompt},
-        ],
+async def ask_llm(question, docs):
+    answer = await chat_completion(
+        model=ANSWER_MODEL,
+        messages=build_messages(question, docs),
+        cache=True,
     )
     logger.info("LLM response retrieved successfully.")
-    return response.choices[0].message.content
+    return answer
+
+
+async def stream_llm(question, docs):
+    tokens = stream_chat_completion(
+        model=ANSWER_MODEL,
+        messages=build_messages(question, docs),
+        cache=True,
+    )
+    async with aclosing(tokens):
+        async for token in tokens:
+            yield token
+    logger.info("LLM response streamed successfully.")
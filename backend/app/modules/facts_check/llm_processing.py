@@ -4,46 +4,92 @@ llm_processing.py
 Handles claim extraction and fact verification tasks using the Groq LLM API.
 
 This module:
-    - Connects to the Groq API with credentials from environment variables.
+    - Calls the LLM through `app.utils.llm` (cached by default).
     - Extracts verifiable factual claims from text.
     - Verifies claims using provided search results and evidence.
     - Returns structured responses with verdicts and explanations.
 
 Functions:
-    run_claim_extractor_sdk(state: dict) -> dict:
+    async run_claim_extractor_sdk(state: dict) -> dict:
         Extracts up to three concise, verifiable claims from the input text
-        stored in the `state` dictionary.
+        stored in the `state` dictionary (within the claims token budget).
 
-    run_fact_verifier_sdk(search_results: list[dict]) -> dict:
+    async verify_claim(result: dict) -> dict | None:
+        Verifies one claim against its search result.
+
+    async verify_claims_batch(search_results: list[dict]) -> list[dict | None]:
+        Verifies all claims with one LLM call; returns a verdict or None
+        per claim, in claim order.
+
+    async run_fact_verifier_sdk(search_results: list[dict]) -> dict:
         Evaluates provided claims against web search evidence and returns
-        structured JSON verdicts for each claim.
+        structured JSON verdicts for each claim, in claim order. Claims are
+        verified concurrently, at most `FACT_CHECK_CONCURRENCY` at once,
+        each within `FACT_CHECK_VERIFY_TIMEOUT` seconds; a claim that times
+        out or fails is left out of the verdicts.
+
+Verification modes (`FACT_VERIFY_MODE`):
+    per_claim   One LLM call per claim (default).
+    batch       All claims and their evidence in one prompt; the reply is a
+                JSON list of verdicts validated against `BatchVerdict`.
+                Claims that are missing from the reply or malformed are
+                then verified on their own with `verify_claim`. Saves the
+                per-request overhead and the repeated instructions.
 
 Environment Variables:
     GROQ_API_KEY (str): API key for authenticating with Groq.
+    FACT_CHECK_CONCURRENCY (int): Claims searched or verified at once per
+        article (default 4).
+    FACT_CHECK_VERIFY_TIMEOUT (float): Seconds allowed for one claim's
+        verification, or for the whole batch call (default 30).
+    FACT_VERIFY_MODE (str): "per_claim" (default) or "batch".
+
+Metrics:
+    fact_verify_batch{result}: Claims answered by the batch call ("ok")
+        or verified again on their own ("retried").
 """
 
 
-import os
-from groq import Groq
-from dotenv import load_dotenv
+from app.utils.llm import chat_completion
+from app.utils.concurrency import gather_bounded
+from app.utils.metrics import metrics
+from app.modules.scraper.digest import stage_text
+from typing import Annotated, Literal
+from pydantic import BaseModel, BeforeValidator, Field, ValidationError
+import asyncio
 import json
+import os
 import re
 from app.logging.logging_config import setup_logger
 
 logger = setup_logger(__name__)
 
-load_dotenv()
+VERIFY_CONCURRENCY = int(os.getenv("FACT_CHECK_CONCURRENCY", 4))
+VERIFY_TIMEOUT = float(os.getenv("FACT_CHECK_VERIFY_TIMEOUT", 30))
+VERIFY_MODE = os.getenv("FACT_VERIFY_MODE", "per_claim").lower()
+
+
+def _normalize_verdict(value):
+    if isinstance(value, bool):
+        return "True" if value else "False"
+    return value.strip().capitalize() if isinstance(value, str) else value
+
+
+class BatchVerdict(BaseModel):
+    id: int = Field(..., description="Number of the claim in the prompt")
+    verdict: Annotated[Literal["True", "False"], BeforeValidator(_normalize_verdict)]
+    explanation: str = Field(..., min_length=1)
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 
 
-def run_claim_extractor_sdk(state):
+async def run_claim_extractor_sdk(state):
     try:
         text = state.get("cleaned_text")
         if not text:
             raise ValueError("Missing or empty 'cleaned_text' in state")
+        text = stage_text(state, "claims")
 
-        chat_completion = client.chat.completions.create(
+        extracted_claims = await chat_completion(
             messages=[
                 {
                     "role": "system",
@@ -67,8 +113,7 @@ def run_claim_extractor_sdk(state):
             temperature=0.3,
             max_tokens=512,
         )
-
-        extracted_claims = chat_completion.choices[0].message.content.strip()
+        extracted_claims = extracted_claims.strip()
         logger.debug(f"Extracted claims:\n{extracted_claims}")
 
 
@@ -87,68 +132,195 @@ def run_claim_extractor_sdk(state):
         }
 
 
-def run_fact_verifier_sdk(search_results):
+def _load_json(content: str):
+    """Parse a JSON reply, stripping markdown code blocks if present."""
+    return json.loads(re.sub(r"^```json|```$", "", content.strip()).strip())
+
+
+def _is_json(content: str) -> bool:
     try:
-        results_list = []
+        _load_json(content)
+        return True
+    except ValueError:
+        return False
 
-        for result in search_results:
-            source = result.get("link", "N/A")
-            claim = result.get("claim", "N/A")
-            evidence = (
-                f"{result.get('title', '')}"
-                f"\n{result.get('snippet', '')}"
-                f"\nLink: {source}"
-            )
 
-            chat_completion = client.chat.completions.create(
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a fact-checking assistant. "
-                            "Your job is to determine whether the given"
-                            " claim is True, False"
-                            "based on the provided web search evidence."
-                            " Keep it concise and structured."
-                        ),
-                    },
-                    {
-                        "role": "user",
-                        "content": (
-                            f"Claim: {claim}\n\n"
-                            f"Web Evidence:\n{evidence}\n\n"
-                            "Based on this evidence, is the claim true?\n"
-                            "Respond only in this JSON format:\n\n"
-                            "{\n"
-                            '  "verdict": "True" | "False",\n'
-                            '  "explanation": "...",\n'
-                            f'  "original_claim": "{claim}",\n'
-                            f'  "source_link": "{source}"\n'
-                            "}"
-                        ),
-                    },
-                ],
-                model="gemma2-9b-it",
-                temperature=0.3,
-                max_tokens=256,
-            )
+async def verify_claim(result):
+    """Verify one claim against its search result; None if the reply is not JSON."""
+    source = result.get("link", "N/A")
+    claim = result.get("claim", "N/A")
+    evidence = (
+        f"{result.get('title', '')}"
+        f"\n{result.get('snippet', '')}"
+        f"\nLink: {source}"
+    )
+
+    content = await chat_completion(
+        messages=[
+            {
+                "role": "system",
+                "content": (
+                    "You are a fact-checking assistant. "
+                    "Your job is to determine whether the given"
+                    " claim is True, False"
+                    "based on the provided web search evidence."
+                    " Keep it concise and structured."
+                ),
+            },
+            {
+                "role": "user",
+                "content": (
+                    f"Claim: {claim}\n\n"
+                    f"Web Evidence:\n{evidence}\n\n"
+                    "Based on this evidence, is the claim true?\n"
+                    "Respond only in this JSON format:\n\n"
+                    "{\n"
+                    '  "verdict": "True" | "False",\n'
+                    '  "explanation": "...",\n'
+                    f'  "original_claim": "{claim}",\n'
+                    f'  "source_link": "{source}"\n'
+                    "}"
+                ),
+            },
+        ],
+        model="gemma2-9b-it",
+        temperature=0.3,
+        max_tokens=256,
+        cacheable=_is_json,
+    )
+    logger.debug(f"Raw LLM fact verification output:\n{content}")
+
+    # Try parsing the JSON response
+    try:
+        return _load_json(content)
+    except Exception as parse_err:
+        logger.error(f"LLM JSON parse error for claim '{claim}': {parse_err}")
+        return None
 
-            content = chat_completion.choices[0].message.content.strip()
 
-            # Strip markdown code blocks if present
-            content = re.sub(r"^```json|```$", "", content).strip()
-            logger.debug(f"Raw LLM fact verification output:\n{content}")
+def _evidence(result):
+    return (
+        f"{result.get('title', '')}"
+        f"\n{result.get('snippet', '')}"
+        f"\nLink: {result.get('link', 'N/A')}"
+    )
 
-            # Try parsing the JSON response
-            try:
-                parsed = json.loads(content)
-            except Exception as parse_err:
-                logger.error(f"LLM JSON parse error: {parse_err}")
 
-            results_list.append(parsed)
+def _parse_batch(content: str, count: int) -> dict:
+    """Return {claim index: BatchVerdict} for the valid entries of `content`."""
+    try:
+        data = _load_json(content)
+    except (TypeError, json.JSONDecodeError) as e:
+        logger.error(f"Batch verification returned invalid JSON: {e}")
+        return {}
+    if isinstance(data, dict):
+        data = data.get("verdicts")
+    if not isinstance(data, list):
+        return {}
+
+    verdicts = {}
+    for item in data:
+        try:
+            verdict = BatchVerdict.model_validate(item)
+        except ValidationError as e:
+            logger.warning(f"Malformed verdict in batch reply: {e}")
+            continue
+        if 1 <= verdict.id <= count and verdict.id - 1 not in verdicts:
+            verdicts[verdict.id - 1] = verdict
+    return verdicts
+
+
+async def verify_claims_batch(search_results):
+    claims = "\n\n".join(
+        f"[{number}] Claim: {result.get('claim', 'N/A')}\n"
+        f"Web Evidence:\n{_evidence(result)}"
+        for number, result in enumerate(search_results, start=1)
+    )
+    content = await chat_completion(
+        messages=[
+            {
+                "role": "system",
+                "content": (
+                    "You are a fact-checking assistant. "
+                    "For each numbered claim, determine whether it is True or "
+                    "False based on the web search evidence given with it. "
+                    "Keep explanations concise. Respond only with a JSON "
+                    'object of the form {"verdicts": [{"id": <claim number>, '
+                    '"verdict": "True" | "False", "explanation": "..."}]} '
+                    "with one entry per claim."
+                ),
+            },
+            {"role": "user", "content": claims},
+        ],
+        model="gemma2-9b-it",
+        temperature=0.3,
+        max_tokens=256 * len(search_results),
+        response_format={"type": "json_object"},
+        cacheable=lambda reply: bool(_parse_batch(reply, len(search_results))),
+    )
+    logger.debug(f"Raw LLM batch verification output:\n{content}")
+    verdicts = _parse_batch(content, len(search_results))
+    return [
+        {
+            "verdict": verdicts[index].verdict,
+            "explanation": verdicts[index].explanation,
+            "original_claim": result.get("claim", "N/A"),
+            "source_link": result.get("link", "N/A"),
+        }
+        if index in verdicts
+        else None
+        for index, result in enumerate(search_results)
+    ]
+
+
+async def _verify_batch_mode(search_results):
+    try:
+        verdicts = await asyncio.wait_for(
+            verify_claims_batch(search_results), VERIFY_TIMEOUT
+        )
+    except Exception as e:
+        logger.error(f"Batch verification failed, verifying claims one by one: {e}")
+        verdicts = [None] * len(search_results)
+
+    missing = [i for i, verdict in enumerate(verdicts) if verdict is None]
+    metrics.increment("fact_verify_batch", len(verdicts) - len(missing), result="ok")
+    if missing:
+        metrics.increment("fact_verify_batch", len(missing), result="retried")
+        retried = await gather_bounded(
+            (verify_claim(search_results[i]) for i in missing),
+            VERIFY_CONCURRENCY,
+            VERIFY_TIMEOUT,
+        )
+        for i, outcome in zip(missing, retried):
+            verdicts[i] = outcome
+    return verdicts
+
+
+async def run_fact_verifier_sdk(search_results):
+    try:
+        if VERIFY_MODE == "batch":
+            outcomes = await _verify_batch_mode(search_results)
+        else:
+            # All claims are verified at once; verdicts keep the claim order.
+            outcomes = await gather_bounded(
+                (verify_claim(result) for result in search_results),
+                VERIFY_CONCURRENCY,
+                VERIFY_TIMEOUT,
+            )
+
+        results_list = []
+        for result, outcome in zip(search_results, outcomes):
+            claim = result.get("claim", "N/A")
+            if isinstance(outcome, asyncio.TimeoutError):
+                logger.warning(f"Verification timed out for claim: {claim}")
+                metrics.increment("fact_check_claims", stage="verify", outcome="timeout")
+            elif isinstance(outcome, Exception):
+                logger.error(f"Verification failed for claim: {claim} -> {outcome}")
+                metrics.increment("fact_check_claims", stage="verify", outcome="error")
+            elif outcome is not None:
+                results_list.append(outcome)
 
         return {
-            "claim": claim,
             "verifications": results_list,
             "status": "success",
         }
@@ -5,33 +5,42 @@ Provides a simple wrapper for performing Google Custom Search queries.
 
 This module:
     - Loads the Google Search API key from environment variables.
-    - Sends search requests to the Google Custom Search API.
+    - Sends search requests to the Google Custom Search API through the
+      shared pooled HTTP client, with a bounded timeout.
     - Returns the first search result with title, link, and snippet.
+    - Goes through `app.utils.providers` (kind "search"), so responses can
+      be recorded and replayed.
 
 Functions:
     search_google(query: str) -> list[dict]:
         Executes a Google search for the given query and returns the top result
         in a list containing its title, link, and snippet.
 
+    async asearch_google(query: str) -> list[dict]:
+        Same as `search_google`, for coroutines. At most
+        `SEARCH_MAX_CONCURRENCY` searches run at once per event loop.
+
 Environment Variables:
     SEARCH_KEY (str): API key for Google Custom Search API.
+    SEARCH_TIMEOUT (float): Timeout in seconds for a search request (default 10).
 """
 
 
-import requests
 from dotenv import load_dotenv
+from app.utils.http_client import get_http_client
+from app.utils.concurrency import limit
+from app.utils.providers import provide, provide_sync
 import os
 
 load_dotenv()
 
 GOOGLE_SEARCH = os.getenv("SEARCH_KEY")
+SEARCH_ENGINE_ID = "f637ab77b5d8b4a3c"
+SEARCH_URL = "https://www.googleapis.com/customsearch/v1"
+SEARCH_TIMEOUT = float(os.getenv("SEARCH_TIMEOUT", 10))
 
 
-def search_google(query):
-    results = requests.get(
-        f"https://www.googleapis.com/customsearch/v1?key={GOOGLE_SEARCH}&cx=f637ab77b5d8b4a3c&q={query}"
-    )
-    res = results.json()
+def _first_result(res):
     first = {}
     first["title"] = res["items"][0]["title"]
     first["link"] = res["items"][0]["link"]
@@ -40,3 +49,28 @@ def search_google(query):
     return [
         first,
     ]
+
+
+def search_google(query):
+    def live():
+        return get_http_client().get(
+            SEARCH_URL,
+            params={"key": GOOGLE_SEARCH, "cx": SEARCH_ENGINE_ID, "q": query},
+            timeout=SEARCH_TIMEOUT,
+        ).json()
+
+    return _first_result(provide_sync("search", (SEARCH_ENGINE_ID, query), live))
+
+
+async def asearch_google(query):
+    async def live():
+        results = await get_http_client().aget(
+            SEARCH_URL,
+            params={"key": GOOGLE_SEARCH, "cx": SEARCH_ENGINE_ID, "q": query},
+            timeout=SEARCH_TIMEOUT,
+        )
+        return results.json()
+
+    async with limit("search"):
+        res = await provide("search", (SEARCH_ENGINE_ID, query), live)
+    return _first_result(res)
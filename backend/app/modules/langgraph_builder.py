@@ -6,33 +6,55 @@ cleaned article text through multiple NLP tasks, with error handling
 and retry logic.
 
 Workflow:
-    1. Sentiment analysis on the cleaned text.
-    2. Fact-checking detected claims.
-    3. Generating a counter-perspective.
-    4. Judging the quality of the generated perspective.
-    5. Storing results and sending them downstream.
-    6. Error handling at any step if failures occur.
+    1. Analysis, as three parallel branches joined by `join_analysis`:
+         - sentiment analysis on the cleaned text,
+         - fact-checking detected claims,
+         - bias scoring (never fatal: `bias_score` is None if it fails),
+       or, with `COMBINED_ANALYSIS=true`, one combined call for sentiment,
+       bias score and claims followed by fact-checking.
+    2. Generating a counter-perspective.
+    3. Judging the quality of the generated perspective.
+    4. Storing results and sending them downstream.
+    5. Error handling at any step if failures occur.
 
 Core Features:
     - Uses a TypedDict (`MyState`) to define the shape of the pipeline's
       state, ensuring structured data flow between nodes.
+    - The parallel branches return partial updates; failures are
+      collected in `errors` (merged with a list reducer) and turned into
+      an error status by the join node. See `langgraph_nodes.join`.
     - Employs conditional edges to handle branching:
         * Routes to error handler if a node signals `"status": "error"`.
         * Retries perspective generation up to 3 times if judged score
           is below 70.
         * Moves to storage once retries are exhausted or score passes
           the threshold.
+        * With `PERSPECTIVE_CANDIDATES` above 1, generates that many
+          perspectives concurrently, scores them in one batched judge
+          call and moves on with the best one; there is no retry loop.
     - Ensures the graph terminates only after successful storage.
 
 Functions:
     build_langgraph() -> CompiledGraph
         Creates the StateGraph, adds processing nodes, defines
         transitions, and compiles the graph for execution.
+
+Environment Variables:
+    COMBINED_ANALYSIS (bool): Start with the combined analysis node instead
+        of the sentiment node (default false).
+    PERSPECTIVE_CANDIDATES (int): Best-of-N perspective generation when
+        above 1 (default 1).
 """
 
 
-from langgraph.graph import StateGraph
+import operator
+import os
+from typing import Annotated
+from langgraph.graph import START, StateGraph
 from app.modules.langgraph_nodes import (
+    analysis,
+    bias,
+    join,
     sentiment,
     fact_check,
     generate_perspective,
@@ -46,35 +68,83 @@ from typing_extensions import TypedDict
 
 class MyState(TypedDict):
     cleaned_text: str
+    digest: dict
+    claims: list[str]
+    bias_score: int | None
     facts: list[dict]
     sentiment: str
     perspective: str
+    candidates: list
     score: int
     retries: int
     status: str
+    error_from: str
+    message: str
+    errors: Annotated[list[dict], operator.add]
+
+
+COMBINED_ANALYSIS = os.getenv("COMBINED_ANALYSIS", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
 
 
 def build_langgraph():
     graph = StateGraph(MyState)
 
-    graph.add_node("sentiment_analysis", sentiment.run_sentiment_sdk)
-    graph.add_node("fact_checking", fact_check.run_fact_check)
-    graph.add_node("generate_perspective", generate_perspective.generate_perspective)
-    graph.add_node("judge_perspective", judge.judge_perspective)
+    if COMBINED_ANALYSIS:
+        # Also fills bias_score and the claims the fact-check node uses,
+        # so the two run in sequence.
+        graph.add_node("sentiment_analysis", analysis.run_combined_analysis)
+        graph.add_node("fact_checking", fact_check.run_fact_check)
+    else:
+        graph.add_node(
+            "sentiment_analysis", join.branch(sentiment.run_sentiment_sdk, ("sentiment",))
+        )
+        graph.add_node(
+            "fact_checking", join.branch(fact_check.run_fact_check, ("facts",))
+        )
+        graph.add_node(
+            "bias_detection", join.branch(bias.run_bias_detection, ("bias_score",))
+        )
+        graph.add_node("join_analysis", join.join_analysis)
+    best_of_n = generate_perspective.CANDIDATES > 1
+    if best_of_n:
+        graph.add_node(
+            "generate_perspective", generate_perspective.generate_candidates
+        )
+        graph.add_node("judge_perspective", judge.judge_candidates)
+    else:
+        graph.add_node(
+            "generate_perspective", generate_perspective.generate_perspective
+        )
+        graph.add_node("judge_perspective", judge.judge_perspective)
     graph.add_node("store_and_send", store_and_send.store_and_send)
     graph.add_node("error_handler", error_handler.error_handler)
 
-    graph.set_entry_point(
-        "sentiment_analysis",
-    )
+    if COMBINED_ANALYSIS:
+        graph.set_entry_point(
+            "sentiment_analysis",
+        )
+
+        graph.add_conditional_edges(
+            "sentiment_analysis",
+            lambda x: (
+                "error_handler" if x.get("status") == "error" else "fact_checking"
+            ),
+        )
+        analysis_exit = "fact_checking"
+    else:
+        branches = ["sentiment_analysis", "fact_checking", "bias_detection"]
+        for name in branches:
+            graph.add_edge(START, name)
+        # Runs once all three branches have finished.
+        graph.add_edge(branches, "join_analysis")
+        analysis_exit = "join_analysis"
 
     graph.add_conditional_edges(
-        "sentiment_analysis",
-        lambda x: ("error_handler" if x.get("status") == "error" else "fact_checking"),
-    )
-
-    graph.add_conditional_edges(
-        "fact_checking",
+        analysis_exit,
         lambda x: (
             "error_handler" if x.get("status") == "error" else "generate_perspective"
         ),
@@ -87,20 +157,29 @@ def build_langgraph():
         ),
     )
 
-    graph.add_conditional_edges(
-        "judge_perspective",
-        lambda state: (
-            "error_handler"
-            if state.get("status") == "error"
-            else (
-                "store_and_send"
-                if state.get("retries", 0) >= 3
-                else "generate_perspective"
-            )
-            if state.get("score", 0) < 70
-            else "store_and_send"
-        ),
-    )
+    if best_of_n:
+        # The best candidate is kept whatever its score.
+        graph.add_conditional_edges(
+            "judge_perspective",
+            lambda x: (
+                "error_handler" if x.get("status") == "error" else "store_and_send"
+            ),
+        )
+    else:
+        graph.add_conditional_edges(
+            "judge_perspective",
+            lambda state: (
+                "error_handler"
+                if state.get("status") == "error"
+                else (
+                    "store_and_send"
+                    if state.get("retries", 0) >= 3
+                    else "generate_perspective"
+                )
+                if state.get("score", 0) < 70
+                else "store_and_send"
+            ),
+        )
     graph.add_conditional_edges(
         "store_and_send",
         lambda x: ("error_handler" if x.get("status") == "error" else "__end__"),
@@ -0,0 +1,189 @@
+"""
+analysis.py
+-----------
+Combined article analysis: sentiment, bias score and verifiable claims
+from a single structured-output LLM call.
+
+Used as the first graph node when `COMBINED_ANALYSIS` is enabled, instead
+of the separate sentiment, bias and claim-extraction calls that each send
+the article to the model.
+
+This module:
+    - Sends the article (trimmed to the "analysis" digest budget) once,
+      asking for a JSON object that follows `CombinedAnalysis`.
+    - Validates every field on its own, so one malformed field does not
+      throw away the others.
+    - Falls back to the separate call for each field that is missing or
+      invalid: `run_sentiment_sdk` for sentiment, the bias node's
+      `run_bias_detection` for the bias score (None if it cannot be
+      scored, without failing the article). Missing claims
+      are left to the fact-check node, which then runs
+      `run_claim_extractor_sdk` as usual.
+    - Counts fallbacks in the `combined_analysis_fallbacks` metric,
+      labelled by field.
+
+Classes:
+    CombinedAnalysis (pydantic.BaseModel):
+        Schema of the combined response.
+
+Functions:
+    async run_combined_analysis(state: dict) -> dict:
+        Adds `sentiment`, `bias_score` and `claims` to the state.
+
+Environment Variables:
+    COMBINED_ANALYSIS (bool): Use this node in the graph (default false).
+    COMBINED_ANALYSIS_MAX_CLAIMS (int): Claims requested (default 3).
+"""
+
+import json
+import os
+from typing import Annotated, Literal
+from pydantic import BaseModel, BeforeValidator, Field, TypeAdapter, ValidationError
+from app.modules.scraper.digest import stage_text
+from app.modules.langgraph_nodes.sentiment import run_sentiment_sdk
+from app.modules.langgraph_nodes import bias
+from app.utils.llm import chat_completion
+from app.utils.metrics import metrics
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+MAX_CLAIMS = int(os.getenv("COMBINED_ANALYSIS_MAX_CLAIMS", 3))
+ANALYSIS_MODEL = "gemma2-9b-it"
+
+
+def _normalize_label(value):
+    return value.strip().lower() if isinstance(value, str) else value
+
+
+def _normalize_claims(value):
+    if isinstance(value, list):
+        value = [c.strip() for c in value if isinstance(c, str) and c.strip()]
+        return value[:MAX_CLAIMS]
+    return value
+
+
+def _normalize_score(value):
+    if isinstance(value, str) and value.strip().rstrip("%").strip().isdigit():
+        return int(value.strip().rstrip("%"))
+    return value
+
+
+Sentiment = Annotated[
+    Literal["positive", "negative", "neutral"], BeforeValidator(_normalize_label)
+]
+BiasScore = Annotated[int, Field(ge=0, le=100), BeforeValidator(_normalize_score)]
+Claims = Annotated[list[str], Field(min_length=1), BeforeValidator(_normalize_claims)]
+
+
+class CombinedAnalysis(BaseModel):
+    sentiment: Sentiment = Field(..., description="Overall sentiment of the article")
+    bias_score: BiasScore = Field(
+        ..., description="0 (least biased) to 100 (most biased)"
+    )
+    claims: Claims = Field(
+        ..., description="Short, independently verifiable factual claims"
+    )
+
+
+_FIELD_ADAPTERS = {
+    "sentiment": TypeAdapter(Sentiment),
+    "bias_score": TypeAdapter(BiasScore),
+    "claims": TypeAdapter(Claims),
+}
+
+
+async def _request_analysis(text: str) -> str:
+    return await chat_completion(
+        messages=[
+            {
+                "role": "system",
+                "content": (
+                    "You analyze news articles. Respond with a single JSON "
+                    "object and nothing else, with these keys:\n"
+                    '  "sentiment": one of "positive", "negative", "neutral";\n'
+                    '  "bias_score": an integer from 0 (least biased) to 100 '
+                    "(most biased);\n"
+                    f'  "claims": a list of at most {MAX_CLAIMS} short, '
+                    "fact-based claims from the article, each independently "
+                    "verifiable through internet search."
+                ),
+            },
+            {
+                "role": "user",
+                "content": f"Analyze the following article:\n\n{text}",
+            },
+        ],
+        model=ANALYSIS_MODEL,
+        temperature=0.2,
+        max_tokens=512,
+        response_format={"type": "json_object"},
+        cacheable=lambda reply: bool(_parse_fields(reply)),
+    )
+
+
+def _parse_fields(content: str) -> dict:
+    """Return the fields of `content` that pass validation."""
+    try:
+        data = json.loads(content)
+    except (TypeError, json.JSONDecodeError) as e:
+        logger.error(f"Combined analysis returned invalid JSON: {e}")
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    try:
+        return CombinedAnalysis.model_validate(data).model_dump()
+    except ValidationError:
+        pass
+
+    # Keep whichever fields are valid on their own.
+    fields = {}
+    for name, adapter in _FIELD_ADAPTERS.items():
+        try:
+            fields[name] = adapter.validate_python(data.get(name))
+        except ValidationError as e:
+            logger.warning(f"Combined analysis field '{name}' is invalid: {e}")
+    return fields
+
+
+async def run_combined_analysis(state):
+    try:
+        if not state.get("cleaned_text"):
+            raise ValueError("Missing or empty 'cleaned_text' in state")
+
+        try:
+            fields = _parse_fields(
+                await _request_analysis(stage_text(state, "analysis"))
+            )
+        except Exception as e:
+            logger.exception(f"Combined analysis call failed: {e}")
+            fields = {}
+
+        if "sentiment" not in fields:
+            metrics.increment("combined_analysis_fallbacks", field="sentiment")
+            result = await run_sentiment_sdk(state)
+            if result.get("status") == "error":
+                return result
+            fields["sentiment"] = result["sentiment"]
+
+        if "bias_score" not in fields:
+            metrics.increment("combined_analysis_fallbacks", field="bias_score")
+            # Like the bias branch, a missing score does not fail the article.
+            result = await bias.run_bias_detection(state)
+            fields["bias_score"] = result["bias_score"]
+
+        if "claims" not in fields:
+            # The fact-check node extracts claims itself when none are given.
+            metrics.increment("combined_analysis_fallbacks", field="claims")
+
+        logger.info(f"Combined analysis result: {fields}")
+        return {**state, **fields, "status": "success"}
+
+    except Exception as e:
+        logger.exception(f"Error in combined_analysis: {e}")
+        return {
+            "status": "error",
+            "error_from": "combined_analysis",
+            "message": str(e),
+        }
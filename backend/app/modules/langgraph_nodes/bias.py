@@ -0,0 +1,49 @@
+"""
+bias.py
+-------
+Graph node scoring the bias of the article, so `/process` returns the bias
+score without a separate `/bias` request.
+
+This module:
+    - Runs `check_bias` on the pipeline state (trimmed to the bias token
+      budget).
+    - Parses the model's reply into an integer between 0 and 100.
+    - Never fails the article: when the call fails or the reply has no
+      score, `bias_score` is None and the rest of the pipeline goes on.
+
+Functions:
+    async run_bias_detection(state: dict) -> dict:
+        Adds `bias_score` (int, or None if unavailable) to the state.
+
+Metrics:
+    bias_unavailable{reason}: Articles left without a bias score, because
+        the call failed ("error") or its reply had no number ("unparseable").
+"""
+
+
+from app.modules.bias_detection.check_bias import check_bias, parse_bias_score
+from app.utils.metrics import metrics
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+async def run_bias_detection(state):
+    try:
+        result = await check_bias(state)
+    except Exception as e:
+        result = {"status": "error", "message": str(e)}
+
+    score = None
+    if result.get("status") == "error":
+        metrics.increment("bias_unavailable", reason="error")
+        logger.warning(f"No bias score for article: {result.get('message')}")
+    else:
+        score = parse_bias_score(result["bias_score"])
+        if score is None:
+            metrics.increment("bias_unavailable", reason="unparseable")
+            logger.warning(
+                f"Couldn’t parse a bias score from: '{result['bias_score']}'"
+            )
+
+    return {**state, "bias_score": score, "status": "success"}
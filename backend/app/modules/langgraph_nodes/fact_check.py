@@ -9,7 +9,7 @@ This module:
     - Handles errors gracefully and returns structured error responses.
 
 Functions:
-    run_fact_check(state: dict) -> dict:
+    async run_fact_check(state: dict) -> dict:
         Executes the fact-checking process and returns either the verification results
         or an error message.
 """
@@ -22,14 +22,14 @@ logger = setup_logger(__name__)
 
 
 
-def run_fact_check(state):
+async def run_fact_check(state):
     try:
         text = state.get("cleaned_text")
 
         if not text:
             raise ValueError("Missing or empty 'cleaned_text' in state")
 
-        verifications, error_message = run_fact_check_pipeline(state)
+        verifications, error_message = await run_fact_check_pipeline(state)
 
         if error_message:
             logger.error(f"Error in fact-checking: {error_message}")
@@ -14,23 +14,31 @@ Classes:
         Data model for structured LLM output containing reasoning and perspective.
 
 Functions:
-    generate_perspective(state: dict) -> dict:
+    async generate_perspective(state: dict) -> dict:
         Generates an alternative perspective using the provided article text
         and verified facts.
+
+    async generate_candidates(state: dict) -> dict:
+        Generates `PERSPECTIVE_CANDIDATES` perspectives concurrently and
+        stores them under `candidates` for `judge.judge_candidates`.
+
+Environment Variables:
+    PERSPECTIVE_CANDIDATES (int): Candidates generated in parallel (default
+        1, which keeps the serial generate/judge retry loop).
 """
 
 
-from app.utils.prompt_templates import generation_prompt
-from langchain_groq import ChatGroq
+import asyncio
+import os
+from app.utils.registry import get_chat_model
+from app.utils.llm import invoke_structured
+from app.modules.scraper.digest import stage_text
 from pydantic import BaseModel, Field
 from app.logging.logging_config import setup_logger
 
 logger = setup_logger(__name__)
 
 
-prompt = generation_prompt
-
-
 class PerspectiveOutput(BaseModel):
     reasoning: str = Field(..., description="Chain-of-thought reasoning steps")
     perspective: str = Field(..., description="Generated opposite perspective")
@@ -38,43 +46,90 @@ class PerspectiveOutput(BaseModel):
 
 my_llm = "llama-3.3-70b-versatile"
 
-llm = ChatGroq(model=my_llm, temperature=0.7)
-
-structured_llm = llm.with_structured_output(PerspectiveOutput)
-
-
-chain = prompt | structured_llm
-
-
-def generate_perspective(state):
+CANDIDATES = max(1, int(os.getenv("PERSPECTIVE_CANDIDATES", 1)))
+
+_chain = None
+
+
+def get_chain():
+    """Build the prompt | structured LLM chain once, on first use."""
+    global _chain
+    if _chain is None:
+        from app.utils.prompt_templates import generation_prompt as prompt
+
+        llm = get_chat_model(my_llm, temperature=0.7)
+        structured_llm = llm.with_structured_output(PerspectiveOutput)
+        _chain = prompt | structured_llm
+    return _chain
+
+
+def _inputs(state) -> dict:
+    text = state["cleaned_text"]
+    facts = state.get("facts")
+
+    if not text:
+        raise ValueError("Missing or empty 'cleaned_text' in state")
+    elif not facts:
+        raise ValueError("Missing or empty 'facts' in state")
+
+    facts_str = "\n".join(
+        [
+            f"Claim: {f['original_claim']}\n"
+            "Verdict: {f['verdict']}\nExplanation: "
+            "{f['explanation']}"
+            for f in state["facts"]
+        ]
+    )
+    return {
+        "cleaned_article": stage_text(state, "perspective"),
+        "facts": facts_str,
+        "sentiment": state.get("sentiment", "neutral"),
+    }
+
+
+async def _generate(inputs: dict, candidate: int = 0) -> PerspectiveOutput:
+    # Candidates differ only by sampling, so each gets its own record key.
+    namespace = "perspective" if candidate == 0 else f"perspective:{candidate}"
+    return await invoke_structured(
+        get_chain(),
+        inputs,
+        PerspectiveOutput,
+        my_llm,
+        namespace,
+        temperature=0.7,
+    )
+
+
+async def generate_perspective(state):
     try:
         retries = state.get("retries", 0)
         state["retries"] = retries + 1
 
-        text = state["cleaned_text"]
-        facts = state.get("facts")
-
-        if not text:
-            raise ValueError("Missing or empty 'cleaned_text' in state")
-        elif not facts:
-            raise ValueError("Missing or empty 'facts' in state")
-
-        facts_str = "\n".join(
-            [
-                f"Claim: {f['original_claim']}\n"
-                "Verdict: {f['verdict']}\nExplanation: "
-                "{f['explanation']}"
-                for f in state["facts"]
-            ]
-        )
+        result = await _generate(_inputs(state))
+    except Exception as e:
+        logger.exception(f"Error in generate_perspective: {e}")
+        return {
+            "status": "error",
+            "error_from": "generate_perspective",
+            "message": f"{e}",
+        }
+    return {**state, "perspective": result, "status": "success"}
+
 
-        result = chain.invoke(
-            {
-                "cleaned_article": text,
-                "facts": facts_str,
-                "sentiment": state.get("sentiment", "neutral"),
-            }
+async def generate_candidates(state):
+    try:
+        inputs = _inputs(state)
+        outcomes = await asyncio.gather(
+            *(_generate(inputs, i) for i in range(CANDIDATES)), return_exceptions=True
         )
+        candidates = []
+        for outcome in outcomes:
+            if isinstance(outcome, Exception):
+                logger.error(f"Perspective candidate failed: {outcome}")
+            else:
+                candidates.append(outcome)
+        if not candidates:
+            raise ValueError(f"All {CANDIDATES} perspective candidates failed")
     except Exception as e:
         logger.exception(f"Error in generate_perspective: {e}")
         return {
@@ -82,4 +137,4 @@ def generate_perspective(state):
             "error_from": "generate_perspective",
             "message": f"{e}",
         }
-    return {**state, "perspective": result, "status": "success"}
+    return {**state, "candidates": candidates, "status": "success"}
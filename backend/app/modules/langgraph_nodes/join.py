@@ -0,0 +1,58 @@
+"""
+join.py
+-------
+Helpers for the parallel analysis stage of the graph: sentiment analysis,
+fact checking and bias detection run as concurrent branches and meet in
+`join_analysis` before perspective generation.
+
+Branches that run in the same step may not write the same state keys
+(LangGraph rejects concurrent writes to a plain key), but the analysis
+nodes return the whole state plus a `status`. `branch()` adapts them: a
+successful result is reduced to the keys the branch owns, and an error
+becomes one entry of the `errors` list, which the graph state merges
+with a reducer.
+
+Functions:
+    branch(node, keys: tuple[str, ...]) -> Callable
+        Wraps `node` so it returns only `keys`, or an `errors` entry.
+
+    join_analysis(state: dict) -> dict:
+        Waits for all branches; sets `status` to "error" (with the first
+        branch's `error_from` and every branch's message) if any failed.
+"""
+
+
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+def branch(node, keys):
+    async def run(state):
+        result = await node(state)
+        if result.get("status") == "error":
+            return {
+                "errors": [
+                    {
+                        "error_from": result.get("error_from"),
+                        "message": result.get("message"),
+                    }
+                ]
+            }
+        return {key: result[key] for key in keys if key in result}
+
+    run.__name__ = getattr(node, "__name__", "branch")
+    return run
+
+
+def join_analysis(state):
+    errors = state.get("errors") or []
+    if not errors:
+        return {"status": "success"}
+
+    logger.error(f"Analysis branches failed: {errors}")
+    return {
+        "status": "error",
+        "error_from": errors[0]["error_from"],
+        "message": "; ".join(f"{e['error_from']}: {e['message']}" for e in errors),
+    }
@@ -8,36 +8,41 @@ This module:
       and factual grounding of a generated perspective.
     - Returns a score from 0 (very poor) to 100 (excellent).
     - Handles parsing errors and unexpected responses gracefully.
+    - With several perspective candidates, scores them all in one call
+      and keeps the best one. Candidates missing from that reply are
+      scored on their own.
 
 Functions:
-    judge_perspective(state: dict) -> dict:
+    async score_perspective(text: str) -> int:
+        Scores one perspective; raises ValueError if no score is returned.
+
+    async judge_perspective(state: dict) -> dict:
         Evaluates the given perspective and returns an integer score with status metadata.
+
+    async judge_candidates(state: dict) -> dict:
+        Scores `state["candidates"]` in one batched call and sets
+        `perspective` and `score` to the best candidate.
+
+Metrics:
+    judge_batch{result}: Candidates scored by the batched call ("ok") or
+        scored again on their own ("retried").
 """
 
 
-import re
-from langchain_groq import ChatGroq
-from langchain.schema import HumanMessage
+import asyncio
+import json
+from app.modules.bias_detection.check_bias import parse_bias_score
+from app.utils.llm import chat_completion, invoke_chat_model
+from app.utils.metrics import metrics
 from app.logging.logging_config import setup_logger
 
 logger = setup_logger(__name__)
 
-# Init once
-groq_llm = ChatGroq(
-    model="gemma2-9b-it",
-    temperature=0.0,
-    max_tokens=10,
-)
-
+JUDGE_MODEL = "gemma2-9b-it"
 
-def judge_perspective(state):
-    try:
-        perspective_obj = state.get("perspective")
-        text = getattr(perspective_obj, "perspective", "").strip()
-        if not text:
-            raise ValueError("Empty 'perspective' for scoring")
 
-        prompt = f"""
+async def score_perspective(text: str) -> int:
+    prompt = f"""
 You are an expert evaluator. Please rate the following counter-perspective
 on originality, reasoning quality, and factual grounding. Provide ONLY
 a single integer score from 0 (very poor) to 100 (excellent).
@@ -46,21 +51,32 @@ a single integer score from 0 (very poor) to 100 (excellent).
 {text}
 """
 
-        response = groq_llm.invoke([HumanMessage(content=prompt)])
+    # Deterministic (temperature 0), so cached by default.
+    raw = await invoke_chat_model(
+        [{"role": "user", "content": prompt}],
+        JUDGE_MODEL,
+        temperature=0.0,
+        max_tokens=10,
+        cacheable=lambda reply: parse_bias_score(reply) is not None,
+    )
+    raw = raw.strip()
+
+    # 5) Pull the first integer 0–100 (same parsing as the bias score)
+    score = parse_bias_score(raw)
+    if score is None:
+        raise ValueError(f"Couldn’t parse a score from: '{raw}'")
 
-        if isinstance(response, list) and response:
-            raw = response[0].content.strip()
-        elif hasattr(response, "content"):
-            raw = response.content.strip()
-        else:
-            raw = str(response).strip()
+    return score
 
-        # 5) Pull the first integer 0–100
-        m = re.search(r"\b(\d{1,3})\b", raw)
-        if not m:
-            raise ValueError(f"Couldn’t parse a score from: '{raw}'")
 
-        score = max(0, min(100, int(m.group(1))))
+async def judge_perspective(state):
+    try:
+        perspective_obj = state.get("perspective")
+        text = getattr(perspective_obj, "perspective", "").strip()
+        if not text:
+            raise ValueError("Empty 'perspective' for scoring")
+
+        score = await score_perspective(text)
 
         return {**state, "score": score, "status": "success"}
 
@@ -71,3 +87,109 @@ a single integer score from 0 (very poor) to 100 (excellent).
             "error_from": "judge_perspective",
             "message": str(e),
         }
+
+
+def _parse_scores(content: str, count: int) -> dict:
+    """Return {candidate index: score} for the valid entries of `content`."""
+    try:
+        data = json.loads(content)
+    except (TypeError, json.JSONDecodeError) as e:
+        logger.error(f"Batched judge returned invalid JSON: {e}")
+        return {}
+    items = data.get("scores") if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        return {}
+
+    scores = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        index, score = item.get("id"), item.get("score")
+        if isinstance(score, str) and score.strip().isdigit():
+            score = int(score.strip())
+        if (
+            isinstance(index, int)
+            and 1 <= index <= count
+            and isinstance(score, (int, float))
+            and not isinstance(score, bool)
+        ):
+            scores.setdefault(index - 1, max(0, min(100, int(score))))
+    return scores
+
+
+async def _score_batch(texts: list) -> dict:
+    candidates = "\n\n".join(
+        f"=== Perspective {number} ===\n{text}"
+        for number, text in enumerate(texts, start=1)
+    )
+    content = await chat_completion(
+        messages=[
+            {
+                "role": "system",
+                "content": (
+                    "You are an expert evaluator. Rate each numbered "
+                    "counter-perspective on originality, reasoning quality, "
+                    "and factual grounding, from 0 (very poor) to 100 "
+                    "(excellent). Score each one on its own merits. Respond "
+                    'only with a JSON object of the form {"scores": '
+                    '[{"id": <perspective number>, "score": <integer>}]}.'
+                ),
+            },
+            {"role": "user", "content": candidates},
+        ],
+        model=JUDGE_MODEL,
+        temperature=0.0,
+        max_tokens=20 * len(texts) + 20,
+        response_format={"type": "json_object"},
+        cacheable=lambda reply: bool(_parse_scores(reply, len(texts))),
+    )
+    return _parse_scores(content, len(texts))
+
+
+async def judge_candidates(state):
+    try:
+        candidates = state.get("candidates") or []
+        texts = [getattr(c, "perspective", "").strip() for c in candidates]
+        if not any(texts):
+            raise ValueError("Empty 'candidates' for scoring")
+
+        try:
+            scores = await _score_batch(texts)
+        except Exception as e:
+            logger.error(f"Batched judge failed, scoring candidates one by one: {e}")
+            scores = {}
+
+        missing = [i for i, text in enumerate(texts) if text and i not in scores]
+        metrics.increment("judge_batch", len(scores), result="ok")
+        if missing:
+            metrics.increment("judge_batch", len(missing), result="retried")
+            retried = await asyncio.gather(
+                *(score_perspective(texts[i]) for i in missing), return_exceptions=True
+            )
+            for i, outcome in zip(missing, retried):
+                if isinstance(outcome, Exception):
+                    logger.error(f"Could not score perspective candidate {i}: {outcome}")
+                else:
+                    scores[i] = outcome
+        if not scores:
+            raise ValueError("No perspective candidate could be scored")
+
+        # Highest score wins; ties go to the earlier candidate.
+        best = max(scores, key=lambda i: (scores[i], -i))
+        logger.info(f"Perspective candidate scores: {scores}, keeping {best}")
+
+        return {
+            **state,
+            "perspective": candidates[best],
+            "score": scores[best],
+            "candidates": [],
+            "status": "success",
+        }
+
+    except Exception as e:
+        logger.exception(f"Error in judge_perspective: {e}")
+        return {
+            "status": "error",
+            "error_from": "judge_perspective",
+            "message": str(e),
+        }
@@ -4,35 +4,32 @@ sentiment.py
 Performs sentiment analysis on cleaned article text using Groq's LLM.
 
 This module:
-    - Accepts pre-processed article text from the pipeline state.
+    - Accepts pre-processed article text from the pipeline state, trimmed
+      to the sentiment token budget.
     - Uses an LLM to classify sentiment as Positive, Negative, or Neutral.
     - Returns the sentiment label along with updated pipeline state.
 
 Functions:
-    run_sentiment_sdk(state: dict) -> dict:
+    async run_sentiment_sdk(state: dict) -> dict:
         Analyzes sentiment and updates the state with the result.
 """
 
 
-import os
-from groq import Groq
-from dotenv import load_dotenv
+from app.utils.llm import chat_completion
+from app.modules.scraper.digest import stage_text
 from app.logging.logging_config import setup_logger
 
 logger = setup_logger(__name__)
 
-load_dotenv()
 
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
-
-
-def run_sentiment_sdk(state):
+async def run_sentiment_sdk(state):
     try:
         text = state.get("cleaned_text")
         if not text:
             raise ValueError("Missing or empty 'cleaned_text' in state")
+        text = stage_text(state, "sentiment")
 
-        chat_completion = client.chat.completions.create(
+        sentiment = await chat_completion(
             messages=[
                 {
                     "role": "system",
@@ -53,9 +50,7 @@ def run_sentiment_sdk(state):
             temperature=0.2,
             max_tokens=3,
         )
-
-        sentiment = chat_completion.choices[0].message.content.strip()
-        sentiment = sentiment.lower()
+        sentiment = sentiment.strip().lower()
 
         return {
             **state,
@@ -5,25 +5,28 @@ Handles chunking, embedding, and storing of data into a vector database.
 
 Workflow:
     1. Chunk raw data for retrieval-augmented generation (RAG).
-    2. Generate embeddings for the chunks.
+    2. Generate embeddings for the chunks (in a worker thread, at most
+       `EMBEDDING_MAX_CONCURRENCY` at once).
     3. Store the vectors in a vector database (Pinecone).
     4. Return the updated pipeline state.
 
 Functions:
-    store_and_send(state: dict) -> dict:
+    async store_and_send(state: dict) -> dict:
         Processes the given state through chunking, embedding, and storage.
 """
 
 
+import asyncio
 from app.modules.vector_store.chunk_rag_data import chunk_rag_data
 from app.modules.vector_store.embed import embed_chunks
 from app.utils.store_vectors import store
+from app.utils.concurrency import limit
 from app.logging.logging_config import setup_logger
 
 logger = setup_logger(__name__)
 
 
-def store_and_send(state):
+async def store_and_send(state):
     # to store data in vector db
     try:
         logger.debug(f"Received state for vector storage: {state}")
@@ -34,13 +37,14 @@ def store_and_send(state):
         except Exception as e:
             raise Exception(f"Failed to chunk data: {e}")
         try:
-            vectors = embed_chunks(chunks)
+            async with limit("embedding"):
+                vectors = await asyncio.to_thread(embed_chunks, chunks)
             if vectors:
                 logger.info(f"Embedding complete — {len(vectors)} vectors generated.")
         except Exception as e:
             raise Exception(f"failed to embed chunks: {e}")
         
-        store(vectors)
+        await store(vectors)
         logger.info("Vectors successfully stored in Pinecone.")
 
     except Exception as e:
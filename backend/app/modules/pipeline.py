@@ -5,58 +5,88 @@ Module that orchestrates the scraping, text cleaning, keyword extraction,
 and LangGraph workflow execution for article analysis.
 
 Workflow:
+    0. Caching:
+        - Scraper results are cached per normalized URL in `article_cache`,
+          so concurrent `/process` and `/bias` calls for the same article
+          share one extraction.
     1. Scraping:
         - Fetches article content from a given URL using 
-          `Article_extractor`, which attempts multiple extraction 
-          strategies with fallbacks.
+          `Article_extractor`, which downloads the page once and
+          attempts multiple extraction strategies with fallbacks on
+          the same HTML. With `SCRAPER_EXECUTION_MODE=process` the
+          parsing, cleaning and keyword stages run in a worker process
+          (see `scraper.process_pool`).
     2. Cleaning:
         - Processes extracted text to remove noise and formatting 
           artifacts via `clean_extracted_text`.
     3. Keyword Extraction:
         - Identifies important keywords from the cleaned article 
           using RAKE-based `extract_keywords`.
+    3b. Digest:
+        - Scores the article's sentences once (`build_digest`) so each
+          LLM stage can send a token-budgeted version of the article
+          (`digest.stage_text`) instead of the full text.
     4. LangGraph Processing:
-        - Passes structured state into a pre-compiled LangGraph 
-          workflow (`_LANGGRAPH_WORKFLOW`) for sentiment analysis, 
-          fact-checking, perspective generation, judging, and 
-          storage.
+        - Passes structured state into the LangGraph workflow for
+          sentiment analysis, fact-checking, perspective generation,
+          judging, and storage. The workflow is compiled once, on first
+          use or during the background start-up phase (`get_workflow`).
+        - The nodes are coroutines using async LLM, search and vector
+          clients; the workflow is awaited on the caller's event loop, at
+          most `WORKFLOW_MAX_CONCURRENCY` runs at a time.
 
 Core Functions:
     run_scraper_pipeline(url: str) -> dict
         Executes the scraping, cleaning, and keyword extraction stages, 
         returning a dictionary containing the cleaned text and keywords.
+        Results are served from the shared article cache when available.
     
-    run_langgraph_workflow(state: dict) -> dict
-        Invokes the pre-compiled LangGraph workflow with the provided 
+    async run_langgraph_workflow(state: dict) -> dict
+        Invokes the compiled LangGraph workflow with the provided 
         state dictionary and returns the result.
+
+    get_workflow()
+        Returns the compiled LangGraph workflow, compiling it once.
 """
 
 
-from app.modules.scraper.extractor import Article_extractor
-from app.modules.scraper.cleaner import clean_extracted_text
-from app.modules.scraper.keywords import extract_keywords
-from app.modules.langgraph_builder import build_langgraph
+from app.modules.scraper.process_pool import scrape_article
+from app.modules.scraper.cache import article_cache
+from app.utils.concurrency import limit
 from app.logging.logging_config import setup_logger
 import json
+import threading
 
 logger = setup_logger(__name__)
 
-# Compile once when module loads
-_LANGGRAPH_WORKFLOW = build_langgraph()
+_LANGGRAPH_WORKFLOW = None
+_workflow_lock = threading.Lock()
+
+
+def get_workflow():
+    """Return the compiled LangGraph workflow, compiling it on first call."""
+    global _LANGGRAPH_WORKFLOW
+    if _LANGGRAPH_WORKFLOW is None:
+        with _workflow_lock:
+            if _LANGGRAPH_WORKFLOW is None:
+                from app.modules.langgraph_builder import build_langgraph
+
+                _LANGGRAPH_WORKFLOW = build_langgraph()
+    return _LANGGRAPH_WORKFLOW
 
 
 def run_scraper_pipeline(url: str) -> dict:
-    extractor = Article_extractor(url)
-    raw_text = extractor.extract()
+    return article_cache.get_or_load(
+        url,
+        _scrape_article,
+        cacheable=lambda result: bool(result.get("cleaned_text")),
+        canonical_of=lambda result: result.get("canonical_url"),
+    )
 
-    # Clean the text
-    result = {}
-    cleaned_text = clean_extracted_text(raw_text["text"])
-    result["cleaned_text"] = cleaned_text
 
-    # Extract keywords
-    keywords = extract_keywords(cleaned_text)
-    result["keywords"] = keywords
+def _scrape_article(url: str) -> dict:
+    # Extraction, cleaning and keywords, in this thread or a worker process
+    result = scrape_article(url)
 
     logger.info(f"Scraper pipeline completed for URL: {url}")
     logger.debug(f"Scraper output: {json.dumps(result, ensure_ascii=False, indent=2)}")
@@ -64,8 +94,13 @@ def run_scraper_pipeline(url: str) -> dict:
     return result
 
 
-def run_langgraph_workflow(state: dict):
-    """Execute the pre-compiled LangGraph workflow."""
-    result = _LANGGRAPH_WORKFLOW.invoke(state)
+async def run_langgraph_workflow(state: dict):
+    """Execute the compiled LangGraph workflow."""
+    async with limit("workflow"):
+        result = await get_workflow().ainvoke(state)
+    # Internal inputs of the LLM stages, not part of the response.
+    result.pop("digest", None)
+    result.pop("candidates", None)
+    result.pop("errors", None)
     logger.info("LangGraph workflow executed successfully.")
     return result
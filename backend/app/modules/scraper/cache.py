@@ -0,0 +1,255 @@
+"""
+cache.py
+--------
+In-process cache for scraped articles, shared by every route that runs the
+scraper pipeline.
+
+The results page calls `/api/process` and `/api/bias` at the same time for
+the same URL. Both routes go through this cache, so an article is only
+downloaded, extracted, cleaned and keyword-scored once per page load.
+
+Main Features:
+    - URLs are normalized before lookup: tracking parameters are stripped,
+      AMP variants are mapped back to the regular article URL and the
+      canonical URL reported by the extractor is registered as an alias.
+    - Entries expire after a TTL and the least recently used entry is
+      evicted once the cache is full.
+    - Concurrent callers asking for the same URL share a single in-flight
+      extraction instead of starting their own.
+
+Classes:
+    ArticleCache
+        Thread-safe TTL + LRU cache with single-flight loading.
+
+Functions:
+    normalize_url(url: str) -> str
+        Returns the cache key for a URL.
+
+Attributes:
+    article_cache (ArticleCache): Process-wide cache used by the pipeline.
+
+Environment Variables:
+    ARTICLE_CACHE_TTL (int): Seconds an entry stays valid (default 3600).
+    ARTICLE_CACHE_SIZE (int): Maximum number of cached articles (default 256).
+"""
+
+import copy
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit, unquote
+from app.utils.metrics import metrics
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "yclid",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "_ga",
+    "_gl",
+    "cmpid",
+    "ocid",
+    "ref",
+    "ref_src",
+    "smid",
+    "spm",
+    "amp",
+    "outputtype",
+}
+TRACKING_PREFIXES = ("utm_", "__twitter", "at_")
+
+# Hosts that serve other sites' AMP pages under a path like /amp/s/<url>
+# or /c/s/<url>.
+AMP_CACHE_HOSTS = ("google.com", "www.google.com", "cdn.ampproject.org")
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def _unwrap_amp_cache(host: str, path: str):
+    """Return the publisher URL wrapped by an AMP cache, or None."""
+    if not host.endswith(AMP_CACHE_HOSTS):
+        return None
+    for prefix in ("/amp/s/", "/c/s/", "/amp/", "/c/"):
+        if path.startswith(prefix):
+            inner = path[len(prefix):]
+            scheme = "https" if "/s/" in prefix else "http"
+            return f"{scheme}://{unquote(inner)}"
+    return None
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so that trivially different links share a cache entry.
+
+    Lowercases scheme and host, drops default ports, fragments and tracking
+    parameters, sorts the remaining query string and resolves common AMP
+    URL shapes (`amp.` subdomains, `/amp` suffixes, `.amp.html` files and
+    Google/ampproject cache links) to the regular article URL.
+    """
+    url = (url or "").strip()
+    parts = urlsplit(url)
+    if not parts.scheme:
+        parts = urlsplit(f"http://{url}")
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    path = parts.path or "/"
+
+    inner = _unwrap_amp_cache(host, path)
+    if inner:
+        return normalize_url(inner)
+
+    if host.startswith("amp."):
+        host = host[len("amp."):]
+
+    if path.endswith(".amp.html"):
+        path = path[: -len(".amp.html")] + ".html"
+    elif path.rstrip("/").endswith("/amp"):
+        path = path.rstrip("/")[: -len("/amp")] or "/"
+
+    netloc = host
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{parts.port}"
+
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    )
+
+    return urlunsplit((scheme, netloc, path, urlencode(query), ""))
+
+
+class ArticleCache:
+    """
+    Thread-safe TTL + LRU cache with single-flight loading.
+
+    Args:
+        ttl (float): Seconds an entry stays valid.
+        max_entries (int): Maximum number of entries before LRU eviction.
+    """
+
+    def __init__(self, ttl: float = 3600, max_entries: int = 256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "shared": 0, "evictions": 0}
+
+    def _get_fresh(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _put(self, key, value, expires_at):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def get(self, url: str):
+        """Return a copy of the cached value for `url`, or None."""
+        with self._lock:
+            value = self._get_fresh(normalize_url(url))
+        return copy.deepcopy(value) if value is not None else None
+
+    def get_or_load(self, url: str, loader, cacheable=None, canonical_of=None):
+        """
+        Return the cached value for `url`, loading it at most once.
+
+        Args:
+            url (str): Article URL as sent by the client.
+            loader (Callable[[str], Any]): Called with `url` on a miss.
+            cacheable (Callable[[Any], bool], optional): Decides whether a
+                loaded value should be stored. Values are always shared with
+                callers waiting on the same in-flight load.
+            canonical_of (Callable[[Any], str | None], optional): Returns the
+                canonical URL of a loaded value, stored as an extra key.
+
+        Returns:
+            A deep copy of the cached or freshly loaded value.
+        """
+        key = normalize_url(url)
+
+        with self._lock:
+            value = self._get_fresh(key)
+            if value is not None:
+                self._stats["hits"] += 1
+                return copy.deepcopy(value)
+
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+                self._stats["misses"] += 1
+            else:
+                self._stats["shared"] += 1
+
+        if not owner:
+            logger.debug(f"Waiting on in-flight extraction for: {key}")
+            return copy.deepcopy(future.result())
+
+        try:
+            value = loader(url)
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            if cacheable is None or cacheable(value):
+                expires_at = time.monotonic() + self.ttl
+                self._put(key, value, expires_at)
+
+                canonical = canonical_of(value) if canonical_of else None
+                if canonical:
+                    canonical_key = normalize_url(canonical)
+                    if canonical_key != key:
+                        self._put(canonical_key, value, expires_at)
+
+        future.set_result(value)
+        return copy.deepcopy(value)
+
+    def invalidate(self, url: str) -> None:
+        with self._lock:
+            self._entries.pop(normalize_url(url), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+
+article_cache = ArticleCache(
+    ttl=float(os.getenv("ARTICLE_CACHE_TTL", 3600)),
+    max_entries=int(os.getenv("ARTICLE_CACHE_SIZE", 256)),
+)
+metrics.register_collector("article_cache", article_cache.stats)
@@ -11,22 +11,208 @@ Main Features:
     - Filters out lines that are too short to be meaningful.
     - Tidies spacing and formatting for readability.
 
+The boilerplate phrases are compiled once and screened in a single pass:
+the literal prefixes of all patterns are located in one scan of the text,
+and only the (rare) lines that contain one go through the individual
+patterns, in list order. The output is therefore identical to applying
+every pattern to the whole text one after another. The text is processed
+line by line as a generator.
+
+Classes:
+    CleanerEngine
+        Pre-compiled cleaner for a given list of boilerplate patterns.
+
 Functions:
     clean_extracted_text(text: str) -> str
         Cleans up extracted text by removing repetitive, promotional, or
         irrelevant content while preserving main article body.
+
+Environment Variables:
+    CLEANER_EXTRA_PATTERNS_FILE (str): Optional file with extra boilerplate
+        regexes, one per line (blank lines and lines starting with "#" are
+        ignored). They are applied after the built-in patterns.
 """
 
+import os
 import re
-import nltk
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+# Common boilerplate patterns (example: "Read more at...", "Subscribe", etc.)
+BOILERPLATE_PATTERNS = [
+    r"read more at.*",
+    r"subscribe to.*",
+    r"click here to.*",
+    r"follow us on.*",
+    r"advertisement",
+    r"sponsored content",
+    r"promoted by.*",
+    r"recommended for you",
+    r"© \d{4}.*",  # copyright lines
+    r"all rights reserved",
+    r"terms of service",
+    r"privacy policy",
+    r"cookie policy",
+    r"about us",
+    r"contact us",
+    r"share this article",
+    r"sign up for our newsletter",
+    r"report this ad",
+    r"this story was originally published.*",
+    r"originally appeared on.*",
+    r"download our app.*",
+    r"view comments",
+    r"comment below",
+    r"leave a comment",
+    r"next article",
+    r"previous article",
+    r"related articles",
+    r"top stories",
+    r"breaking news",
+    r"editor's picks",
+    r"latest news",
+    r"trending now",
+    r"this content is provided by.*",
+    r"image source:.*",
+    r"photo by.*",
+    r"disclaimer:.*",
+    r"support independent journalism.*",
+    r"if you enjoyed this article.*",
+    r"don’t miss out on.*",
+    r"watch the video",
+    r"listen to the podcast",
+    r"stay connected with.*",
+    r"visit our homepage.*",
+    r"post a job on.*",
+    r"powered by .*",
+]
+
+MIN_LINE_LENGTH = 30
+
+_MULTI_SPACE_RE = re.compile(r"[ \t]{2,}")
+_REGEX_META = set(".^$*+?{}[]\\|()")
+
+# Characters that `re.IGNORECASE` folds onto ASCII letters differently from
+# `str.lower()` (or that change length when lowered). Text containing any
+# of them is screened with the slower, exact regex instead.
+_CASEFOLD_SPECIALS = ("\u0130", "\u0131", "\u017f", "\u212a")
+
+
+def _literal_prefix(pattern: str) -> str:
+    """Return the literal text every match of `pattern` must start with."""
+    if "|" in pattern:
+        return ""
+    prefix = []
+    for ch in pattern:
+        if ch in _REGEX_META:
+            if ch in "?*{" and prefix:
+                prefix.pop()  # the preceding character is optional
+            break
+        prefix.append(ch)
+    return "".join(prefix)
+
+
+def _load_extra_patterns() -> list:
+    path = os.getenv("CLEANER_EXTRA_PATTERNS_FILE")
+    if not path:
+        return []
+    try:
+        with open(path, encoding="utf-8") as f:
+            patterns = [
+                line.rstrip("\n")
+                for line in f
+                if line.strip() and not line.lstrip().startswith("#")
+            ]
+    except OSError as e:
+        logger.error(f"Could not read cleaner patterns from {path}: {e}")
+        return []
+    logger.info(f"Loaded {len(patterns)} extra boilerplate patterns from {path}")
+    return patterns
 
-try:
-    nltk.data.find("corpora/stopwords")
-    nltk.data.find("corpora/punkt_tab")
 
-except LookupError:
-    nltk.download("stopwords")
-    nltk.download("punkt_tab")
+class CleanerEngine:
+    """
+    Cleaner with its boilerplate patterns compiled once.
+
+    Lines are screened in a single pass over the text: the literal prefix
+    of every pattern is searched for in a lowercased copy of the text, and
+    only lines containing one of them are run through the full patterns.
+    When a pattern has no usable literal prefix, or the text contains
+    characters whose case folding differs between `str.lower()` and
+    `re.IGNORECASE`, lines are screened with one compiled alternation of
+    all patterns instead.
+
+    Args:
+        patterns (list[str]): Boilerplate regexes, matched against single
+            lines. None of them may match a newline, which is what makes
+            line-by-line cleaning equivalent to cleaning the whole text.
+        min_line_length (int): Lines of this length or shorter are dropped.
+    """
+
+    def __init__(self, patterns, min_line_length: int = MIN_LINE_LENGTH):
+        self.patterns = [re.compile(p, re.IGNORECASE) for p in patterns]
+        self.screen = re.compile(
+            "|".join(f"(?:{p})" for p in patterns), re.IGNORECASE
+        )
+        prefixes = [_literal_prefix(p) for p in patterns]
+        if all(prefixes) and all(
+            ch.isascii() or ch.lower() == ch.upper() for p in prefixes for ch in p
+        ):
+            self.prefixes = sorted({p.lower() for p in prefixes})
+        else:
+            self.prefixes = None
+        self.min_line_length = min_line_length
+
+    def _flagged_offsets(self, text: str):
+        """Sorted offsets where a pattern may match, or None to screen every line."""
+        if self.prefixes is None or any(ch in text for ch in _CASEFOLD_SPECIALS):
+            return None
+        lowered = text.lower()
+        offsets = []
+        for prefix in self.prefixes:
+            i = lowered.find(prefix)
+            while i != -1:
+                offsets.append(i)
+                i = lowered.find(prefix, i + 1)
+        offsets.sort()
+        return offsets
+
+    def _strip_boilerplate(self, line: str) -> str:
+        for pattern in self.patterns:
+            line = pattern.sub("", line)
+        return line
+
+    def iter_lines(self, text: str):
+        """Yield the cleaned, non-junk lines of `text` one at a time."""
+        flagged = self._flagged_offsets(text)
+        start, k = 0, 0
+        for line in text.split("\n"):
+            end = start + len(line)
+            if flagged is None:
+                dirty = self.screen.search(line) is not None
+            else:
+                dirty = False
+                while k < len(flagged) and flagged[k] < end:
+                    dirty = True
+                    k += 1
+            start = end + 1
+
+            if dirty:
+                line = self._strip_boilerplate(line)
+            line = line.strip()
+            if len(line) > self.min_line_length:
+                yield _MULTI_SPACE_RE.sub(" ", line)
+
+    def clean(self, text: str) -> str:
+        if not text:
+            return ""
+        # Join lines back with a double newline for paragraphs
+        return "\n\n".join(self.iter_lines(text))
+
+
+_engine = CleanerEngine(BOILERPLATE_PATTERNS + _load_extra_patterns())
 
 
 def clean_extracted_text(text: str):
@@ -34,72 +220,4 @@ def clean_extracted_text(text: str):
     Clean up the extracted article text to remove boilerplate,
     repetitive lines, excessive whitespace, and unwanted junk.
     """
-    if not text:
-        return ""
-
-    # 1. Removing multiple line breaks to single line break
-    text = re.sub(r"\n{2,}", "\n\n", text)
-
-    # 2. Removing common boilerplate patterns
-    # (example: "Read more at...", "Subscribe", etc.)
-    boilerplate_phrases = [
-        r"read more at.*",
-        r"subscribe to.*",
-        r"click here to.*",
-        r"follow us on.*",
-        r"advertisement",
-        r"sponsored content",
-        r"promoted by.*",
-        r"recommended for you",
-        r"© \d{4}.*",  # copyright lines
-        r"all rights reserved",
-        r"terms of service",
-        r"privacy policy",
-        r"cookie policy",
-        r"about us",
-        r"contact us",
-        r"share this article",
-        r"sign up for our newsletter",
-        r"report this ad",
-        r"this story was originally published.*",
-        r"originally appeared on.*",
-        r"download our app.*",
-        r"view comments",
-        r"comment below",
-        r"leave a comment",
-        r"next article",
-        r"previous article",
-        r"related articles",
-        r"top stories",
-        r"breaking news",
-        r"editor's picks",
-        r"latest news",
-        r"trending now",
-        r"this content is provided by.*",
-        r"image source:.*",
-        r"photo by.*",
-        r"disclaimer:.*",
-        r"support independent journalism.*",
-        r"if you enjoyed this article.*",
-        r"don’t miss out on.*",
-        r"watch the video",
-        r"listen to the podcast",
-        r"stay connected with.*",
-        r"visit our homepage.*",
-        r"post a job on.*",
-        r"powered by .*",
-    ]
-    for pattern in boilerplate_phrases:
-        text = re.sub(pattern, "", text, flags=re.IGNORECASE)
-
-    # 3. Remove lines with too few characters (likely junk)
-    lines = text.split("\n")
-    cleaned_lines = [line.strip() for line in lines if len(line.strip()) > 30]
-
-    # 4. Join lines back with a double newline for paragraphs
-    cleaned_text = "\n\n".join(cleaned_lines)
-
-    # 5. Optional: Fix multiple spaces and trim
-    cleaned_text = re.sub(r"[ \t]{2,}", " ", cleaned_text).strip()
-
-    return cleaned_text
+    return _engine.clean(text)
@@ -0,0 +1,153 @@
+"""
+digest.py
+---------
+Builds a token-budgeted digest of an article once, in the scraper pipeline,
+so the LLM stages (sentiment, claim extraction, bias scoring and
+perspective generation) do not each send the full cleaned text.
+
+The digest is a list of the article's sentences, each with a score:
+    - sentences containing the article's RAKE keywords score higher,
+    - sentences with numbers, dates, quotes or named entities (capitalized
+      words inside the sentence) score higher, as they carry the checkable
+      facts,
+    - the lead of the article gets a position bonus.
+
+`stage_text()` turns the digest into the text for one stage: if the whole
+article fits the stage's budget it is returned unchanged; otherwise the
+opening sentences (a length-capped body) are kept and the rest of the
+budget is filled with the best-scoring sentences, emitted in article order.
+The first of those that does not fit is cut to the tokens left, and an
+article whose sentences cannot be split is cut to the budget, so an
+over-budget article never comes back empty.
+Token counts are estimated from character length, which is close enough
+for budgeting and needs no tokenizer.
+
+Functions:
+    estimate_tokens(text: str) -> int
+        Rough token count (about four characters per token).
+
+    build_digest(text: str, keywords: list[str] | None = None) -> dict
+        Splits and scores the sentences of `text`.
+
+    stage_text(state: dict, stage: str) -> str
+        Article text for `stage`, within that stage's token budget. Uses
+        `state["digest"]` when present, otherwise builds it from
+        `state["cleaned_text"]`.
+
+Environment Variables:
+    DIGEST_BUDGET_SENTIMENT (int): Token budget for sentiment (default 1500).
+    DIGEST_BUDGET_CLAIMS (int): Token budget for claim extraction (default 3000).
+    DIGEST_BUDGET_BIAS (int): Token budget for bias scoring (default 2000).
+    DIGEST_BUDGET_PERSPECTIVE (int): Token budget for perspective generation
+        (default 4000).
+    DIGEST_BUDGET_ANALYSIS (int): Token budget for the combined analysis
+        call (default 3000).
+    DIGEST_LEAD_SHARE (float): Share of a budget reserved for the opening
+        sentences (default 0.3).
+"""
+
+import math
+import os
+import re
+
+CHARS_PER_TOKEN = 4
+
+STAGE_BUDGETS = {
+    "sentiment": int(os.getenv("DIGEST_BUDGET_SENTIMENT", 1500)),
+    "claims": int(os.getenv("DIGEST_BUDGET_CLAIMS", 3000)),
+    "bias": int(os.getenv("DIGEST_BUDGET_BIAS", 2000)),
+    "perspective": int(os.getenv("DIGEST_BUDGET_PERSPECTIVE", 4000)),
+    "analysis": int(os.getenv("DIGEST_BUDGET_ANALYSIS", 3000)),
+}
+LEAD_SHARE = float(os.getenv("DIGEST_LEAD_SHARE", 0.3))
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?…])[\"'”’)]*\s+(?=[\"'“‘(]?[A-Z0-9])|\n+")
+_NUMBER_RE = re.compile(r"\d")
+_QUOTE_RE = re.compile(r"[\"“”]")
+# A capitalized word that does not start the sentence, e.g. "said Joe Biden".
+_ENTITY_RE = re.compile(r"(?<=[a-z,;:]\s)[A-Z][a-zA-Z]+")
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN) if text else 0
+
+
+def _split_sentences(text: str) -> list:
+    return [s.strip() for s in _SENTENCE_RE.split(text) if s and s.strip()]
+
+
+def _score(sentence: str, index: int, keywords: list) -> float:
+    lowered = sentence.lower()
+    score = sum(1.0 for keyword in keywords if keyword in lowered)
+    if _NUMBER_RE.search(sentence):
+        score += 1.0
+    if _QUOTE_RE.search(sentence):
+        score += 0.5
+    score += min(len(_ENTITY_RE.findall(sentence)), 3) * 0.5
+    # Lead sentences tend to summarize the story.
+    score += 1.5 / (1 + index)
+    return round(score, 3)
+
+
+def build_digest(text: str, keywords=None) -> dict:
+    keywords = [k.lower() for k in (keywords or [])[:15]]
+    sentences = _split_sentences(text or "")
+    return {
+        "tokens": estimate_tokens(text or ""),
+        "sentences": [
+            {
+                "text": sentence,
+                "tokens": estimate_tokens(sentence) + 1,
+                "score": _score(sentence, index, keywords),
+            }
+            for index, sentence in enumerate(sentences)
+        ],
+    }
+
+
+def _select(digest: dict, budget: int) -> str:
+    sentences = digest["sentences"]
+    chosen, used, cut = set(), 0, {}
+
+    lead_budget = int(budget * LEAD_SHARE)
+    for index, sentence in enumerate(sentences):
+        if used + sentence["tokens"] > lead_budget:
+            break
+        chosen.add(index)
+        used += sentence["tokens"]
+
+    ranked = sorted(
+        (i for i in range(len(sentences)) if i not in chosen),
+        key=lambda i: (-sentences[i]["score"], i),
+    )
+    for index in ranked:
+        if used + sentences[index]["tokens"] <= budget:
+            chosen.add(index)
+            used += sentences[index]["tokens"]
+        elif budget - used > 1:
+            # Cut the first sentence that does not fit to what is left, so a
+            # text without sentence breaks (or with one huge sentence) still
+            # yields something.
+            chars = (budget - used - 1) * CHARS_PER_TOKEN
+            cut[index] = sentences[index]["text"][:chars]
+            chosen.add(index)
+            used = budget
+
+    parts, previous = [], None
+    for index in sorted(chosen):
+        if previous is not None and index != previous + 1:
+            parts.append("\n\n")
+        elif parts:
+            parts.append(" ")
+        parts.append(cut.get(index, sentences[index]["text"]))
+        previous = index
+    return "".join(parts)
+
+
+def stage_text(state: dict, stage: str) -> str:
+    text = state.get("cleaned_text") or ""
+    budget = STAGE_BUDGETS.get(stage)
+    if budget is None or estimate_tokens(text) <= budget:
+        return text
+    digest = state.get("digest") or build_digest(text, state.get("keywords"))
+    return _select(digest, budget) or text[: budget * CHARS_PER_TOKEN]
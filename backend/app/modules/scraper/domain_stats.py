@@ -0,0 +1,230 @@
+"""
+domain_stats.py
+---------------
+Persistent per-domain statistics for the article extraction methods.
+
+Most traffic comes from a few hundred news domains, and on each of them the
+same extractor tends to win (or fail) every time. `Article_extractor` records
+every attempt here and asks for a per-domain ordering before extracting, so
+the historically best method runs first and methods that never work on a
+domain are skipped. A skipped method is tried again (first, once) when
+`EXTRACTOR_REPROBE_AFTER` seconds have passed since its last attempt, so
+an outage or a site redesign does not disable it for good.
+
+Stats are kept in memory and written through to a small SQLite table so they
+survive restarts.
+
+Classes:
+    DomainStats
+        Thread-safe stats table with ordering and skip decisions.
+
+Functions:
+    domain_of(url: str) -> str
+        Returns the lowercase host of a URL without a leading "www.".
+
+Attributes:
+    domain_stats (DomainStats): Process-wide stats table.
+
+Environment Variables:
+    EXTRACTOR_STATS_PATH (str): SQLite file for the stats (default
+        "extractor_stats.db"). Use ":memory:" to disable persistence.
+    EXTRACTOR_SKIP_AFTER (int): Failed attempts, with no success, after
+        which a method is skipped for a domain (default 5).
+    EXTRACTOR_REPROBE_AFTER (float): Seconds after which a skipped method
+        is tried again on its domain (default 86400, one day).
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+STATS_PATH = os.getenv("EXTRACTOR_STATS_PATH", "extractor_stats.db")
+SKIP_AFTER = int(os.getenv("EXTRACTOR_SKIP_AFTER", 5))
+REPROBE_AFTER = float(os.getenv("EXTRACTOR_REPROBE_AFTER", 24 * 3600))
+
+
+def domain_of(url: str) -> str:
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class DomainStats:
+    """
+    Per-domain, per-method extraction stats backed by SQLite.
+
+    Args:
+        path (str): SQLite database path, or ":memory:".
+        skip_after (int): Failures without any success before a method is
+            skipped on a domain.
+        reprobe_after (float): Seconds after its last attempt before a
+            skipped method is tried again.
+    """
+
+    def __init__(
+        self,
+        path: str = STATS_PATH,
+        skip_after: int = SKIP_AFTER,
+        reprobe_after: float = REPROBE_AFTER,
+    ):
+        self.path = path
+        self.skip_after = skip_after
+        self.reprobe_after = reprobe_after
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._db = None
+
+    def _connect(self):
+        if self._db is not None:
+            return self._db
+        try:
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS extractor_stats (
+                    domain TEXT NOT NULL,
+                    method TEXT NOT NULL,
+                    attempts INTEGER NOT NULL,
+                    successes INTEGER NOT NULL,
+                    total_length INTEGER NOT NULL,
+                    total_time REAL NOT NULL,
+                    last_attempt REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (domain, method)
+                )
+                """
+            )
+            columns = {row[1] for row in db.execute("PRAGMA table_info(extractor_stats)")}
+            if "last_attempt" not in columns:
+                # Tables written before re-probing; their skipped methods
+                # are due for a retry straight away.
+                db.execute(
+                    "ALTER TABLE extractor_stats"
+                    " ADD COLUMN last_attempt REAL NOT NULL DEFAULT 0"
+                )
+            for row in db.execute(
+                "SELECT domain, method, attempts, successes, total_length,"
+                " total_time, last_attempt FROM extractor_stats"
+            ):
+                domain, method, attempts, successes, length, elapsed, last = row
+                self._stats.setdefault(domain, {})[method] = {
+                    "attempts": attempts,
+                    "successes": successes,
+                    "total_length": length,
+                    "total_time": elapsed,
+                    "last_attempt": last,
+                }
+            db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Could not open extractor stats at {self.path}: {e}")
+            db = sqlite3.connect(":memory:", check_same_thread=False)
+        self._db = db
+        return db
+
+    def record(self, domain: str, method: str, success: bool, length: int, elapsed: float):
+        """Record one extraction attempt of `method` on `domain`."""
+        with self._lock:
+            db = self._connect()
+            entry = self._stats.setdefault(domain, {}).setdefault(
+                method,
+                {"attempts": 0, "successes": 0, "total_length": 0, "total_time": 0.0},
+            )
+            entry["attempts"] += 1
+            entry["successes"] += int(success)
+            entry["total_length"] += length if success else 0
+            entry["total_time"] += elapsed
+            entry["last_attempt"] = time.time()
+            try:
+                db.execute(
+                    """
+                    INSERT INTO extractor_stats VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (domain, method) DO UPDATE SET
+                        attempts = excluded.attempts,
+                        successes = excluded.successes,
+                        total_length = excluded.total_length,
+                        total_time = excluded.total_time,
+                        last_attempt = excluded.last_attempt
+                    """,
+                    (
+                        domain,
+                        method,
+                        entry["attempts"],
+                        entry["successes"],
+                        entry["total_length"],
+                        entry["total_time"],
+                        entry["last_attempt"],
+                    ),
+                )
+                db.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to persist extractor stats: {e}")
+
+    def order(self, domain: str, methods: list) -> list:
+        """
+        Return `methods` reordered for `domain`, dropping always-failing ones.
+
+        Methods are ranked by smoothed success rate, then by mean parse time;
+        untried methods get a neutral prior so they are still explored. If
+        every method would be skipped, the full list is returned instead.
+        A skipped method whose last attempt is older than `reprobe_after`
+        goes first instead, so its stats can recover.
+        """
+        now = time.time()
+        with self._lock:
+            self._connect()
+            stats = dict(self._stats.get(domain, {}))
+            skipped = {
+                method
+                for method, entry in stats.items()
+                if entry["successes"] == 0 and entry["attempts"] >= self.skip_after
+            }
+            reprobe = [
+                method
+                for method in methods
+                if method in skipped
+                and now - stats[method].get("last_attempt", 0) >= self.reprobe_after
+            ][:1]
+            for method in reprobe:
+                # Claim the probe so concurrent requests don't all retry it.
+                self._stats[domain][method]["last_attempt"] = now
+                logger.info(f"Re-probing skipped extractor {method} on {domain}")
+
+        def rank(item):
+            index, method = item
+            entry = stats.get(method)
+            if not entry:
+                return (-0.5, 0.0, index)
+            rate = (entry["successes"] + 1) / (entry["attempts"] + 2)
+            return (-rate, entry["total_time"] / entry["attempts"], index)
+
+        ranked = [method for _, method in sorted(enumerate(methods), key=rank)]
+        kept = [method for method in ranked if method not in skipped]
+        return reprobe + kept if kept else ranked
+
+    def snapshot(self, domain: str | None = None) -> dict:
+        """Return per-method summaries for one domain or for all of them."""
+        with self._lock:
+            self._connect()
+            domains = [domain] if domain else list(self._stats)
+            return {
+                name: {
+                    method: {
+                        "attempts": entry["attempts"],
+                        "success_rate": round(entry["successes"] / entry["attempts"], 3),
+                        "avg_length": (
+                            round(entry["total_length"] / entry["successes"])
+                            if entry["successes"]
+                            else 0
+                        ),
+                        "avg_time": round(entry["total_time"] / entry["attempts"], 3),
+                    }
+                    for method, entry in self._stats.get(name, {}).items()
+                }
+                for name in domains
+            }
+
+
+domain_stats = DomainStats()
@@ -2,58 +2,121 @@
 extractor.py
 ------------
 Module for extracting article content from a given URL using multiple
-progressively robust methods. Attempts extraction with the following
-approaches in order:
+progressively robust methods. The page is downloaded once and the same
+HTML buffer is handed to each approach in order:
     1. Trafilatura
     2. Newspaper3k
     3. BeautifulSoup + Readability
 
 If one method fails, it falls back to the next until a valid article
-body is found.
+body is found. The fetch metadata (status, final URL, headers and byte
+count) is returned with the result under the "fetch" key.
+
+Every attempt is recorded in `domain_stats`, and methods are tried in the
+order that has worked best on the article's domain so far. Methods that
+have never succeeded on a domain are skipped there.
+
+In "race" mode all three methods run concurrently on the same HTML in a
+shared worker pool. Each candidate is scored with `quality.score_text`
+(length, sentence count, link density); the first candidate above the
+quality threshold wins and the remaining ones are cancelled, otherwise
+the best-scoring candidate is returned.
+
+Every attempt is also kept in `Article_extractor.attempts`. When the
+extractor runs in a worker process (see `process_pool`), the page is fetched
+and the method order decided by the parent, stats recording is switched off
+and the parent records the returned attempts instead.
+
+The parser libraries are imported on first use to keep application
+start-up fast.
+
+Environment Variables:
+    EXTRACTION_MODE (str): "sequential" (default) or "race".
+    EXTRACTION_QUALITY_THRESHOLD (float): Score that ends a race early (default 0.6).
+    EXTRACTION_RACE_TIMEOUT (float): Seconds to wait for candidates (default 20).
+    EXTRACTION_WORKERS (int): Size of the shared race worker pool (default 6).
 
 Classes:
     ArticleExtractor
         Encapsulates all extraction methods and fallback logic.
 """
 
-import trafilatura
-from newspaper import Article
-from bs4 import BeautifulSoup
-from readability import Document
-import requests
+from app.modules.scraper.fetcher import fetch_html, DEFAULT_HEADERS
+from app.modules.scraper.quality import anchor_texts, score_text
+from app.modules.scraper.domain_stats import domain_stats, domain_of
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import threading
+import time
 import logging
 import json
+import os
+
+EXTRACTION_MODE = os.getenv("EXTRACTION_MODE", "sequential")
+QUALITY_THRESHOLD = float(os.getenv("EXTRACTION_QUALITY_THRESHOLD", 0.6))
+RACE_TIMEOUT = float(os.getenv("EXTRACTION_RACE_TIMEOUT", 20))
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", 6))
+
+EXTRACTION_METHODS = ["trafilatura", "newspaper", "bs4"]
+
+_race_pool = None
+_race_pool_lock = threading.Lock()
+
+
+def _get_race_pool():
+    global _race_pool
+    if _race_pool is None:
+        with _race_pool_lock:
+            if _race_pool is None:
+                _race_pool = ThreadPoolExecutor(
+                    max_workers=EXTRACTION_WORKERS, thread_name_prefix="extractor"
+                )
+    return _race_pool
+
 
 # This class contains extractors that are more and more advanced from top to
 # bottom and they will try to extract any article.
 
 
 class Article_extractor:
-    def __init__(self, url):
+    """
+    Args:
+        url (str): Article URL.
+        mode (str, optional): "sequential" or "race"; `EXTRACTION_MODE` by default.
+        fetched (FetchResult, optional): Page downloaded beforehand.
+        order (list[str], optional): Method names to try, in order. Taken
+            from `domain_stats` by default.
+        record_stats (bool): Record attempts in `domain_stats`.
+    """
+
+    def __init__(self, url, mode=None, fetched=None, order=None, record_stats=True):
         self.url = url
-        self.headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-                " AppleWebKit/537.36 "
-                "(KHTML, like Gecko) Chrome/113.0 Safari/537.36"
-            )
-        }
+        self.mode = mode or EXTRACTION_MODE
+        self.headers = dict(DEFAULT_HEADERS)
+        self._fetched = fetched
+        self.order = order
+        self.record_stats = record_stats
+        self.attempts = []
 
     def _fetch_html(self):
-        try:
-            res = requests.get(self.url, self.headers, timeout=10)
-            res.raise_for_status()
-            return res.text
-        except requests.RequestException as e:
-            logging.error(f"failed to fetch: {self.url}-{e}")
-            return ""
+        """
+        Download the page once and reuse it on later calls.
+
+        Returns the body as decoded while streaming, so the parsers do not
+        each re-detect the encoding of the raw bytes.
+        """
+        if self._fetched is None:
+            self._fetched = fetch_html(self.url, headers=self.headers)
+        return self._fetched.text
 
     def extract_with_trafilatura(self):
-        downloaded = trafilatura.fetch_url(self.url)
+        import trafilatura
+
+        downloaded = self._fetch_html()
         if not downloaded:
             return {}
         result = trafilatura.extract(
             downloaded,
+            url=self.url,
             no_fallback=True,
             include_comments=False,
             include_tables=False,
@@ -65,9 +128,15 @@ class Article_extractor:
         return {}
 
     def extract_with_newspaper(self) -> dict:
+        from newspaper import Article
+
+        html = self._fetch_html()
+        if not html:
+            return {}
+
         try:
             article = Article(self.url)
-            article.download()
+            article.download(input_html=html)
             article.parse()
             return {
                 "title": article.title,
@@ -76,12 +145,16 @@ class Article_extractor:
                 "publish_date": (
                     article.publish_date.isoformat() if article.publish_date else None
                 ),
+                "canonical_url": article.canonical_link or None,
             }
         except Exception as e:
             logging.error(f"Newspaper3k failed: {e}")
             return {}
 
     def extract_with_bs4(self) -> dict:
+        from bs4 import BeautifulSoup
+        from readability import Document
+
         html = self._fetch_html()
         if not html:
             return {}
@@ -96,15 +169,120 @@ class Article_extractor:
             logging.error(f"BS4 + Readability fallback failed: {e}")
             return {}
 
-    def extract(self):
-        methods = [
-            self.extract_with_trafilatura,
-            self.extract_with_newspaper,
-            self.extract_with_bs4,
-        ]
-        for method in methods:
+    def _methods(self):
+        """Return (name, method) pairs in the order learned for this domain."""
+        methods = {
+            "trafilatura": self.extract_with_trafilatura,
+            "newspaper": self.extract_with_newspaper,
+            "bs4": self.extract_with_bs4,
+        }
+        order = self.order
+        if order is None:
+            order = domain_stats.order(domain_of(self.url), EXTRACTION_METHODS)
+        return [(name, methods[name]) for name in order if name in methods]
+
+    def _run_method(self, name, method):
+        """Run one method on the fetched HTML and record how it went."""
+        result = None
+        start = time.perf_counter()
+        try:
             result = method()
+            return result
+        finally:
+            elapsed = time.perf_counter() - start
+            text = (result or {}).get("text") or ""
+            attempt = {
+                "method": name,
+                "success": bool(text),
+                "length": len(text),
+                "elapsed": elapsed,
+            }
+            self.attempts.append(attempt)
+            if self.record_stats:
+                domain_stats.record(domain_of(self.url), **attempt)
+
+    def _success(self, result, method, quality=None):
+        result["url"] = self.url
+        # trafilatura reports the canonical/og:url link as "source"
+        result.setdefault("canonical_url", result.get("source"))
+        result["method"] = method
+        if quality is not None:
+            result["quality"] = quality
+        result["fetch"] = self._fetched.metadata()
+        return result
+
+    def _failure(self):
+        return {
+            "url": self.url,
+            "text": "",
+            "error": "Failed to extract article.",
+            "fetch": self._fetched.metadata() if self._fetched else None,
+        }
+
+    def extract(self):
+        if self.mode == "race":
+            return self.extract_race()
+
+        if not self._fetch_html():
+            return self._failure()
+
+        for name, method in self._methods():
+            result = self._run_method(name, method)
             if result and result.get("text"):
-                result["url"] = self.url
-                return result
-        return {"url": self.url, "text": "", "error": "Failed to extract article."}
+                return self._success(result, name)
+        return self._failure()
+
+    def extract_race(self):
+        """
+        Run every method concurrently on the same HTML and keep the best body.
+
+        Returns as soon as a candidate scores at least `QUALITY_THRESHOLD`,
+        cancelling candidates that have not started yet and no longer
+        waiting on the ones still running.
+        """
+        html = self._fetch_html()
+        if not html:
+            return self._failure()
+
+        link_texts = anchor_texts(html)
+        pool = _get_race_pool()
+        futures = {
+            pool.submit(self._run_method, name, method): name
+            for name, method in self._methods()
+        }
+        deadline = time.monotonic() + RACE_TIMEOUT
+
+        best, best_name, best_score = None, None, -1.0
+        pending = set(futures)
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logging.warning(f"Extraction race timed out for: {self.url}")
+                    break
+                done, pending = wait(
+                    pending, timeout=remaining, return_when=FIRST_COMPLETED
+                )
+                for future in done:
+                    name = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logging.error(f"{name} extractor failed: {e}")
+                        continue
+                    if not (result and result.get("text")):
+                        continue
+
+                    score = score_text(result["text"], link_texts)
+                    logging.debug(f"{name} candidate scored {score} for {self.url}")
+                    if score > best_score:
+                        best, best_name, best_score = result, name, score
+                if best_score >= QUALITY_THRESHOLD:
+                    break
+        finally:
+            for future in pending:
+                future.cancel()
+
+        if best is None:
+            return self._failure()
+        return self._success(best, best_name, best_score)
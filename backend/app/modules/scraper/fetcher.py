@@ -0,0 +1,218 @@
+"""
+fetcher.py
+----------
+Downloads article HTML once so every extraction strategy can parse the same
+buffer instead of re-fetching the page. Requests go through the shared
+pooled client in `app.utils.http_client`.
+
+Downloads are streamed: the Content-Type header and the first bytes of the
+body are checked before the rest is read, the body is capped at
+`SCRAPER_MAX_BYTES` and decoded incrementally as it arrives. PDFs, images,
+archives and oversized or endless responses are aborted early and counted
+in the `fetch_rejections` metric, labelled by reason.
+
+Every download waits for a slot from `scheduler.fetch_scheduler`, which
+limits concurrency and request rate per host. A 429 or 503 with a
+`Retry-After` header pauses the host; if the pause is short
+(`FETCH_RETRY_AFTER_LIMIT`), the fetch is retried once after it.
+
+With `PROVIDER_MODE=record|replay` (see `app.utils.providers`) fetch
+results are written to or served from fixtures (kind "fetch"); a replayed
+fetch does not touch the network or the scheduler.
+
+Classes:
+    FetchResult
+        Raw HTML bytes, the decoded text and fetch metadata (status, final
+        URL, headers and byte count).
+
+Functions:
+    fetch_html(url: str, headers: dict | None = None, timeout: float | None = None) -> FetchResult
+        Fetches a URL and returns the body. `timeout` overrides the client's
+        configured connect/read timeouts. Network and HTTP errors and
+        rejected responses are logged and reported through
+        `FetchResult.error` instead of being raised.
+
+Environment Variables:
+    SCRAPER_MAX_BYTES (int): Largest HTML body that is downloaded (default 5 MiB).
+    FETCH_RETRY_AFTER_LIMIT (float): Longest Retry-After that is waited out
+        and retried (default 10 seconds).
+"""
+
+from dataclasses import asdict, dataclass, field
+import base64
+import os
+import httpx
+from app.utils.http_client import get_http_client, ResponseRejected
+from app.modules.scraper.scheduler import (
+    fetch_scheduler,
+    parse_retry_after,
+    SchedulerTimeout,
+)
+from app.utils.providers import (
+    PROVIDER_MODE,
+    provide_sync,
+    FixtureNotFound,
+    SimulatedProviderError,
+)
+from app.utils.metrics import metrics
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+MAX_BYTES = int(os.getenv("SCRAPER_MAX_BYTES", 5 * 1024 * 1024))
+RETRY_AFTER_LIMIT = float(os.getenv("FETCH_RETRY_AFTER_LIMIT", 10))
+
+RETRY_AFTER_STATUSES = (429, 503)
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+        " AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/113.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.1",
+}
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+# Types that say nothing about the payload; the body is sniffed instead.
+UNSPECIFIC_CONTENT_TYPES = ("", "application/octet-stream", "binary/octet-stream")
+
+BINARY_SIGNATURES = (
+    b"%PDF",
+    b"PK\x03\x04",
+    b"\x89PNG",
+    b"GIF8",
+    b"\xff\xd8\xff",
+    b"RIFF",
+    b"ID3",
+    b"\x1f\x8b",
+    b"OggS",
+)
+HTML_MARKERS = (b"<!doctype html", b"<html", b"<head", b"<body", b"<meta", b"<title")
+
+
+def _inspect_html(headers: dict, prefix: bytes):
+    """Return a rejection reason if the response is clearly not an HTML page."""
+    content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+
+    if not prefix:
+        if content_type in HTML_CONTENT_TYPES or content_type in UNSPECIFIC_CONTENT_TYPES:
+            return None
+        return "content_type"
+
+    head = prefix[:1024].lstrip(b"\xef\xbb\xbf \t\r\n")
+    if head.startswith(BINARY_SIGNATURES) or b"\x00" in head:
+        return "binary"
+    if content_type in UNSPECIFIC_CONTENT_TYPES and not any(
+        marker in head.lower() for marker in HTML_MARKERS
+    ):
+        return "not_html"
+    return None
+
+
+@dataclass
+class FetchResult:
+    url: str
+    content: bytes = b""
+    text: str = ""
+    status: int | None = None
+    final_url: str | None = None
+    headers: dict = field(default_factory=dict)
+    error: str | None = None
+    revalidated: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return bool(self.content) and self.error is None
+
+    @property
+    def byte_count(self) -> int:
+        return len(self.content)
+
+    def metadata(self) -> dict:
+        """Fetch metadata without the body, safe to attach to API results."""
+        return {
+            "status": self.status,
+            "final_url": self.final_url or self.url,
+            "headers": self.headers,
+            "bytes": self.byte_count,
+            "error": self.error,
+            "revalidated": self.revalidated,
+        }
+
+
+def _scheduled_get(url, headers, timeout):
+    """Download `url` inside a scheduler slot; returns (response, retry_after)."""
+    with fetch_scheduler.slot(url) as outcome:
+        res = get_http_client().stream_get(
+            url,
+            headers=headers,
+            timeout=timeout,
+            max_bytes=MAX_BYTES,
+            inspect=_inspect_html,
+        )
+        retry_after = None
+        if res.status in RETRY_AFTER_STATUSES:
+            retry_after = parse_retry_after(res.headers.get("retry-after"))
+            outcome["retry_after"] = retry_after
+    return res, retry_after
+
+
+def _to_fixture(result: FetchResult) -> dict:
+    data = asdict(result)
+    data["content"] = base64.b64encode(result.content).decode("ascii")
+    return data
+
+
+def _from_fixture(data: dict) -> FetchResult:
+    return FetchResult(**{**data, "content": base64.b64decode(data["content"])})
+
+
+def fetch_html(
+    url: str, headers: dict | None = None, timeout: float | None = None
+) -> FetchResult:
+    if PROVIDER_MODE == "live":
+        return _fetch(url, headers, timeout)
+    try:
+        data = provide_sync(
+            "fetch", (url,), lambda: _to_fixture(_fetch(url, headers, timeout))
+        )
+    except (FixtureNotFound, SimulatedProviderError) as e:
+        logger.error(f"failed to fetch: {url}-{e}")
+        return FetchResult(url=url, error=str(e))
+    return _from_fixture(data)
+
+
+def _fetch(url, headers, timeout) -> FetchResult:
+    try:
+        res, retry_after = _scheduled_get(url, headers or DEFAULT_HEADERS, timeout)
+        if retry_after is not None and retry_after <= RETRY_AFTER_LIMIT:
+            # The scheduler holds the host back until the pause is over.
+            logger.info(f"Retrying {url} after Retry-After of {retry_after:.1f}s")
+            res, _ = _scheduled_get(url, headers or DEFAULT_HEADERS, timeout)
+    except SchedulerTimeout as e:
+        logger.warning(f"Gave up waiting to fetch {url}: {e}")
+        return FetchResult(url=url, error=str(e))
+    except ResponseRejected as e:
+        metrics.increment("fetch_rejections", reason=e.reason)
+        logger.warning(f"Rejected fetch of {url}: {e}")
+        return FetchResult(url=url, error=f"Rejected ({e.reason}): {e}")
+    except httpx.HTTPError as e:
+        logger.error(f"failed to fetch: {url}-{e}")
+        return FetchResult(url=url, error=str(e))
+
+    result = FetchResult(
+        url=url,
+        content=res.content,
+        text=res.text,
+        status=res.status,
+        final_url=res.url,
+        headers=res.headers,
+        revalidated=res.revalidated,
+    )
+    if not res.ok:
+        logger.error(f"failed to fetch: {url}-HTTP {res.status}")
+        result.content = b""
+        result.text = ""
+        result.error = f"HTTP {res.status}"
+    return result
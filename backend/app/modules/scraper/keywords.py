@@ -7,20 +7,289 @@ helps identify the most relevant and representative words or
 phrases in a body of text, often useful for summarization,
 tagging, search indexing, and content analysis.
 
+The RAKE extractor (stopword list, punctuation set and tokenizers) is built
+once per process by `KeywordEngine` and reused for every document. RAKE
+already returns its phrases ranked by score, so no extra sorting is done.
+
+Two scorers are available for the candidate phrases RAKE finds:
+    rake    RAKE's degree/frequency score (default).
+    tfidf   Sum of the TF-IDF weights of the phrase's words, with document
+            frequencies taken from previously processed articles. Words
+            that appear in most articles ("said", "year", ...) stop
+            dominating the keyword list. Until the corpus holds
+            `KEYWORD_TFIDF_MIN_DOCS` articles, the RAKE ranking is used.
+
+Classes:
+    CorpusStats
+        Thread-safe document-frequency table backed by SQLite.
+
+    KeywordEngine
+        Reusable keyword extractor with a batch API.
+
 Functions:
     extract_keywords(text: str, max_keywords: int = 15)
-        Runs the RAKE algorithm on the provided text and returns
+        Runs the shared engine on the provided text and returns
         the top-ranked keywords or phrases up to the specified limit.
 
+    extract_keywords_batch(texts: Iterable[str], max_keywords: int = 15)
+        Same as `extract_keywords` for many documents at once.
+
     extract_keyword_data(text: str) -> Dict
         Higher-level helper function that packages extracted
         keywords along with the top phrase and the total count
         into a single dictionary for convenient downstream use.
+
+    ensure_nltk_data() -> None
+        Downloads the NLTK corpora RAKE depends on if they are missing.
+        Called on first use and by the background start-up phase.
+
+`rake_nltk` (and with it NLTK) is imported on first use, so importing this
+module does not slow down application start-up.
+
+Attributes:
+    keyword_engine (KeywordEngine): Process-wide engine.
+
+Environment Variables:
+    KEYWORD_SCORER (str): "rake" (default) or "tfidf".
+    KEYWORD_CORPUS_PATH (str): SQLite file for the document frequencies
+        (default "keyword_corpus.db"). Use ":memory:" to disable persistence.
+    KEYWORD_TFIDF_MIN_DOCS (int): Articles needed before TF-IDF scoring is
+        used (default 20).
 """
 
 
-from rake_nltk import Rake
+import math
+import os
+import sqlite3
+import threading
+from collections import Counter
 from typing import Dict
+from app.utils.metrics import metrics
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+KEYWORD_SCORER = os.getenv("KEYWORD_SCORER", "rake").lower()
+CORPUS_PATH = os.getenv("KEYWORD_CORPUS_PATH", "keyword_corpus.db")
+TFIDF_MIN_DOCS = int(os.getenv("KEYWORD_TFIDF_MIN_DOCS", 20))
+
+NLTK_RESOURCES = {
+    "stopwords": "corpora/stopwords",
+    "punkt_tab": "tokenizers/punkt_tab",
+}
+
+_nltk_ready = False
+_nltk_lock = threading.Lock()
+
+
+def ensure_nltk_data() -> None:
+    global _nltk_ready
+    if _nltk_ready:
+        return
+    with _nltk_lock:
+        if _nltk_ready:
+            return
+        import nltk
+
+        for name, path in NLTK_RESOURCES.items():
+            try:
+                nltk.data.find(path)
+            except LookupError:
+                nltk.download(name)
+        _nltk_ready = True
+
+
+class CorpusStats:
+    """
+    Document frequencies of the words seen in processed articles.
+
+    Counts are kept in memory and written through to SQLite, one
+    transaction per batch of documents. The table is updated with
+    increments rather than absolute values, so worker processes with their
+    own in-memory copy can share one database file.
+
+    Args:
+        path (str): SQLite database path, or ":memory:".
+    """
+
+    def __init__(self, path: str = CORPUS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._df = Counter()
+        self._documents = 0
+        self._db = None
+
+    def _connect(self):
+        if self._db is not None:
+            return self._db
+        try:
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS keyword_df (
+                    word TEXT PRIMARY KEY,
+                    documents INTEGER NOT NULL
+                )
+                """
+            )
+            for word, documents in db.execute("SELECT word, documents FROM keyword_df"):
+                if word == "":
+                    self._documents = documents
+                else:
+                    self._df[word] = documents
+            db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Could not open keyword corpus at {self.path}: {e}")
+            db = sqlite3.connect(":memory:", check_same_thread=False)
+        self._db = db
+        return db
+
+    def add_documents(self, word_sets) -> None:
+        """Count each set of distinct words as one document."""
+        changed = Counter()
+        documents = 0
+        for words in word_sets:
+            changed.update(words)
+            documents += 1
+        if not documents:
+            return
+
+        with self._lock:
+            db = self._connect()
+            self._df.update(changed)
+            self._documents += documents
+            rows = list(changed.items())
+            # The total document count is stored under the empty word.
+            rows.append(("", documents))
+            try:
+                db.executemany(
+                    """
+                    INSERT INTO keyword_df VALUES (?, ?)
+                    ON CONFLICT (word) DO UPDATE
+                    SET documents = documents + excluded.documents
+                    """,
+                    rows,
+                )
+                db.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to persist keyword corpus: {e}")
+
+    def idf(self):
+        """Return (document count, idf function) for the current corpus."""
+        with self._lock:
+            self._connect()
+            total = self._documents
+            df = self._df.copy()
+
+        def weight(word):
+            return math.log((total + 1) / (df.get(word, 0) + 1)) + 1
+
+        return total, weight
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._connect()
+            return {"documents": self._documents, "vocabulary": len(self._df)}
+
+
+class KeywordEngine:
+    """
+    Keyword extractor whose RAKE instance is built once and reused.
+
+    `rake_nltk.Rake` keeps per-document state on the instance, so calls
+    are serialized with a lock; RAKE is pure Python and holds the GIL
+    throughout anyway.
+
+    Args:
+        scorer (str): "rake" or "tfidf".
+        corpus (CorpusStats, optional): Document frequencies for "tfidf".
+        min_documents (int): Corpus size needed before "tfidf" is used.
+    """
+
+    def __init__(
+        self,
+        scorer: str = KEYWORD_SCORER,
+        corpus: CorpusStats | None = None,
+        min_documents: int = TFIDF_MIN_DOCS,
+    ):
+        if scorer not in ("rake", "tfidf"):
+            logger.warning(f"Unknown keyword scorer '{scorer}', using RAKE")
+            scorer = "rake"
+        self.scorer = scorer
+        self.corpus = corpus
+        if scorer == "tfidf" and corpus is None:
+            self.corpus = CorpusStats()
+        self.min_documents = min_documents
+        self._rake = None
+        self._lock = threading.Lock()
+
+    def _get_rake(self):
+        if self._rake is None:
+            ensure_nltk_data()
+            from rake_nltk import Rake
+
+            self._rake = Rake()
+        return self._rake
+
+    def _analyze(self, text: str):
+        """Return RAKE's ranked (score, phrase) list and the word counts."""
+        if not text or not text.strip():
+            return [], Counter()
+        with self._lock:
+            rake = self._get_rake()
+            rake.extract_keywords_from_text(text)
+            return list(rake.get_ranked_phrases_with_scores()), Counter(
+                rake.get_word_frequency_distribution()
+            )
+
+    def _rank_tfidf(self, ranked, frequencies, idf):
+        total = sum(frequencies.values()) or 1
+        scored = []
+        for position, (_, phrase) in enumerate(ranked):
+            words = phrase.split()
+            score = sum(frequencies[w] / total * idf(w) for w in words)
+            scored.append((-score, position, phrase))
+        scored.sort()
+        return [phrase for _, _, phrase in scored]
+
+    def extract_batch(self, texts, max_keywords: int = 15) -> list:
+        """
+        Extract keywords from many documents.
+
+        With the "tfidf" scorer, the documents of the batch are added to the
+        corpus before scoring, so they also count towards each other's
+        document frequencies.
+
+        Returns:
+            list[list[str]]: Keywords per document, in input order.
+        """
+        analyses = [self._analyze(text) for text in texts]
+
+        if self.scorer != "tfidf":
+            return [
+                [phrase for _, phrase in ranked[:max_keywords]]
+                for ranked, _ in analyses
+            ]
+
+        self.corpus.add_documents(set(freq) for _, freq in analyses if freq)
+        documents, idf = self.corpus.idf()
+        if documents < self.min_documents:
+            return [
+                [phrase for _, phrase in ranked[:max_keywords]]
+                for ranked, _ in analyses
+            ]
+        return [
+            self._rank_tfidf(ranked, freq, idf)[:max_keywords]
+            for ranked, freq in analyses
+        ]
+
+    def extract(self, text: str, max_keywords: int = 15) -> list:
+        return self.extract_batch([text], max_keywords)[0]
+
+
+keyword_engine = KeywordEngine()
+if keyword_engine.corpus is not None:
+    metrics.register_collector("keyword_corpus", keyword_engine.corpus.stats)
 
 
 def extract_keywords(text: str, max_keywords: int = 15):
@@ -34,13 +303,21 @@ def extract_keywords(text: str, max_keywords: int = 15):
     Returns:
         List[str]: A list of important keywords/phrases.
     """
-    rake = Rake()
-    rake.extract_keywords_from_text(text)
-    keywords_with_scores = rake.get_ranked_phrases_with_scores()
+    return keyword_engine.extract(text, max_keywords)
 
-    # Sort and limit
-    keywords = [phrase for score, phrase in sorted(keywords_with_scores, reverse=True)]
-    return keywords[:max_keywords]
+
+def extract_keywords_batch(texts, max_keywords: int = 15):
+    """
+    Extracts keywords from many documents with the shared engine.
+
+    Args:
+        texts (Iterable[str]): Cleaned article texts.
+        max_keywords (int): Max number of keywords per document.
+
+    Returns:
+        List[List[str]]: Keywords per document, in input order.
+    """
+    return keyword_engine.extract_batch(texts, max_keywords)
 
 
 def extract_keyword_data(text: str) -> Dict:
@@ -0,0 +1,203 @@
+"""
+process_pool.py
+---------------
+Runs the CPU-bound scraping stages (HTML parsing and extraction, cleaning,
+keyword extraction and the article digest) either in the calling thread or in a pool of worker
+processes.
+
+In the default "thread" mode everything runs in the thread that called the
+pipeline, as before. trafilatura/lxml, readability, the cleaner and RAKE
+hold the GIL for most of their work, so with many articles in flight they
+queue behind each other. In "process" mode:
+    1. The page is downloaded in the calling thread through the shared
+       HTTP client (network waits do not need a process).
+    2. The extraction order is looked up in `domain_stats`.
+    3. The `FetchResult` and the order are sent to a worker process, which
+       extracts, cleans and scores keywords and returns a plain dict plus
+       the list of extraction attempts.
+    4. The attempts are recorded in `domain_stats` by the parent, so the
+       SQLite stats are written by one process only.
+
+Workers are started with the "spawn" method (the parent runs background
+threads, which do not survive a fork) and warmed by an initializer that
+imports the parsers and builds the keyword engine. A broken pool is
+replaced, and the affected article is processed in the calling thread.
+
+Functions:
+    process_article(url: str, fetched: FetchResult | None = None,
+                    order: list | None = None, record_stats: bool = True) -> tuple
+        Extracts, cleans and scores keywords for one article. Returns the
+        pipeline result and the extraction attempts.
+
+    scrape_article(url: str) -> dict
+        Runs `process_article` according to `SCRAPER_EXECUTION_MODE`.
+
+    warm_up_pool() -> int
+        Starts every worker process now; returns the number of workers.
+
+    shutdown_pool() -> None
+        Stops the worker processes.
+
+Environment Variables:
+    SCRAPER_EXECUTION_MODE (str): "thread" (default) or "process".
+    SCRAPER_PROCESS_WORKERS (int): Worker processes (default: CPU count).
+    SCRAPER_PROCESS_TIMEOUT (float): Seconds to wait for a worker (default 60).
+
+Metrics:
+    scraper_pool_tasks{outcome}: Articles handed to the pool, by outcome
+        ("completed", "fallback", "timeout").
+    scraper_pool_restarts: Broken pools that were replaced.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+from app.modules.scraper.extractor import Article_extractor, EXTRACTION_METHODS
+from app.modules.scraper.cleaner import clean_extracted_text
+from app.modules.scraper.keywords import extract_keywords
+from app.modules.scraper.digest import build_digest
+from app.modules.scraper.fetcher import fetch_html, DEFAULT_HEADERS
+from app.modules.scraper.domain_stats import domain_stats, domain_of
+from app.utils.metrics import metrics
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+EXECUTION_MODE = os.getenv("SCRAPER_EXECUTION_MODE", "thread").lower()
+PROCESS_WORKERS = int(os.getenv("SCRAPER_PROCESS_WORKERS", os.cpu_count() or 1))
+PROCESS_TIMEOUT = float(os.getenv("SCRAPER_PROCESS_TIMEOUT", 60))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def process_article(url, fetched=None, order=None, record_stats=True):
+    extractor = Article_extractor(
+        url, fetched=fetched, order=order, record_stats=record_stats
+    )
+    raw_text = extractor.extract()
+
+    result = {}
+    cleaned_text = clean_extracted_text(raw_text["text"])
+    result["cleaned_text"] = cleaned_text
+    result["canonical_url"] = raw_text.get("canonical_url")
+    result["fetch"] = raw_text.get("fetch")
+    result["keywords"] = extract_keywords(cleaned_text)
+    result["digest"] = build_digest(cleaned_text, result["keywords"])
+    return result, list(extractor.attempts)
+
+
+def _init_worker():
+    """Import the parsers and build the keyword engine before the first task."""
+    from app.startup import PARSER_MODULES
+    from app.modules.scraper.keywords import keyword_engine
+    import importlib
+
+    try:
+        for module in PARSER_MODULES:
+            importlib.import_module(module)
+        keyword_engine.extract("Worker warm-up sentence for the keyword engine.")
+    except Exception as e:
+        logger.warning(f"Scraper worker warm-up incomplete: {e}")
+
+
+def _ping(delay: float = 0.0):
+    time.sleep(delay)
+    return os.getpid()
+
+
+def _worker_process(url, fetched, order):
+    return process_article(url, fetched=fetched, order=order, record_stats=False)
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(
+                    max_workers=PROCESS_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                )
+                logger.info(f"Started scraper process pool with {PROCESS_WORKERS} workers")
+    return _pool
+
+
+def _replace_pool(broken):
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+            metrics.increment("scraper_pool_restarts")
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _scrape_in_process(url: str) -> dict:
+    fetched = fetch_html(url, headers=dict(DEFAULT_HEADERS))
+    domain = domain_of(url)
+    order = domain_stats.order(domain, EXTRACTION_METHODS)
+
+    pool = _get_pool()
+    try:
+        result, attempts = pool.submit(_worker_process, url, fetched, order).result(
+            timeout=PROCESS_TIMEOUT
+        )
+        metrics.increment("scraper_pool_tasks", outcome="completed")
+    except BrokenProcessPool as e:
+        logger.error(f"Scraper process pool broke while processing {url}: {e}")
+        metrics.increment("scraper_pool_tasks", outcome="fallback")
+        _replace_pool(pool)
+        return process_article(url, fetched=fetched, order=order)[0]
+    except TimeoutError:
+        # The worker keeps running; the article is reported as not extracted.
+        logger.error(f"Scraper worker timed out after {PROCESS_TIMEOUT}s for {url}")
+        metrics.increment("scraper_pool_tasks", outcome="timeout")
+        return {
+            "cleaned_text": "",
+            "canonical_url": None,
+            "fetch": fetched.metadata(),
+            "keywords": [],
+        }
+
+    for attempt in attempts:
+        domain_stats.record(domain, **attempt)
+    return result
+
+
+def scrape_article(url: str) -> dict:
+    if EXECUTION_MODE == "process":
+        return _scrape_in_process(url)
+    return process_article(url)[0]
+
+
+def warm_up_pool() -> int:
+    pool = _get_pool()
+    # Workers are spawned on demand; keep each one busy briefly so every
+    # submission needs a new worker.
+    futures = [pool.submit(_ping, 0.5) for _ in range(PROCESS_WORKERS)]
+    pids = {future.result() for future in futures}
+    logger.info(f"Scraper process pool ready ({len(pids)} workers answered)")
+    return PROCESS_WORKERS
+
+
+def shutdown_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def pool_stats() -> dict:
+    return {
+        "mode": EXECUTION_MODE,
+        "workers": PROCESS_WORKERS if EXECUTION_MODE == "process" else 0,
+        "running": _pool is not None,
+    }
+
+
+metrics.register_collector("scraper_pool", pool_stats)
@@ -0,0 +1,76 @@
+"""
+quality.py
+----------
+Cheap quality heuristics for comparing candidate article bodies produced by
+different extraction strategies.
+
+A real article body is long, made of many sentences and mostly free of
+navigation links; cookie banners, menus and "related stories" blocks fail
+at least one of these checks.
+
+Functions:
+    anchor_texts(html: bytes | str) -> set[str]
+        Collects the normalized text of every link on the page.
+
+    score_text(text: str, link_texts: set[str] | None = None) -> float
+        Scores a candidate body between 0 (junk) and 1 (full article).
+"""
+
+import html as html_lib
+import re
+
+TARGET_WORDS = 300
+TARGET_SENTENCES = 10
+
+_ANCHOR_RE = re.compile(r"<a\b[^>]*>(.*?)</a\s*>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+_SENTENCE_END_RE = re.compile(r"[.!?…][\"'”’)\]]*(?:\s|$)")
+
+
+def _normalize(text: str) -> str:
+    return _SPACE_RE.sub(" ", text).strip().lower()
+
+
+def anchor_texts(html) -> set:
+    """Return the normalized text of every `<a>` element in `html`."""
+    if isinstance(html, bytes):
+        html = html.decode("utf-8", errors="replace")
+    texts = set()
+    for match in _ANCHOR_RE.finditer(html or ""):
+        text = _normalize(html_lib.unescape(_TAG_RE.sub(" ", match.group(1))))
+        if text:
+            texts.add(text)
+    return texts
+
+
+def link_density(text: str, link_texts) -> float:
+    """Fraction of the candidate's characters that sit in lines which are link text."""
+    lines = [_normalize(line) for line in text.split("\n")]
+    lines = [line for line in lines if line]
+    total = sum(len(line) for line in lines)
+    if not total or not link_texts:
+        return 0.0
+    linked = sum(len(line) for line in lines if line in link_texts)
+    return linked / total
+
+
+def score_text(text: str, link_texts=None) -> float:
+    """
+    Score a candidate article body between 0 and 1.
+
+    Combines body length (words), sentence count and link density. Length
+    and sentence count saturate at `TARGET_WORDS` / `TARGET_SENTENCES`; the
+    result is scaled down by the share of text that is link text.
+    """
+    if not text or not text.strip():
+        return 0.0
+
+    words = len(text.split())
+    sentences = len(_SENTENCE_END_RE.findall(text))
+
+    length_score = min(1.0, words / TARGET_WORDS)
+    sentence_score = min(1.0, sentences / TARGET_SENTENCES)
+    density = link_density(text, link_texts)
+
+    return round((0.5 * length_score + 0.5 * sentence_score) * (1 - density), 4)
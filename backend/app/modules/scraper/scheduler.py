@@ -0,0 +1,327 @@
+"""
+scheduler.py
+------------
+Per-host politeness scheduler for article downloads.
+
+Every page fetch made by the scraper asks this scheduler for a slot first.
+A slot is granted when:
+    - fewer than `FETCH_MAX_CONCURRENCY` fetches are running in total,
+    - fewer than `FETCH_PER_HOST_CONCURRENCY` are running against the host,
+    - at least the host's interval has passed since its previous request
+      (`FETCH_HOST_INTERVAL`, raised to the robots.txt `Crawl-delay` when
+      the site asks for more), and
+    - the host is not paused by a `Retry-After` from an earlier 429/503.
+
+Waiting fetches are queued per host and slots are handed out round-robin
+across hosts, so a burst of requests for one publisher cannot starve the
+others. Queue depth, active fetches and wait times per host are published
+as the "fetch_scheduler" entry of `GET /api/metrics`.
+
+robots.txt is fetched once per host (single-flight) and cached for
+`FETCH_ROBOTS_TTL` seconds. Only `Crawl-delay` is used: the scraper fetches
+single articles that users asked for, it does not crawl.
+
+Classes:
+    SchedulerTimeout
+        Raised when a fetch waited longer than `FETCH_QUEUE_TIMEOUT`.
+
+    FetchScheduler
+        Thread-safe scheduler; `slot(url)` is a context manager.
+
+Functions:
+    parse_retry_after(value: str) -> float | None
+        Seconds from a Retry-After header (delta-seconds or HTTP date).
+
+Attributes:
+    fetch_scheduler (FetchScheduler): Process-wide scheduler.
+
+Environment Variables:
+    FETCH_MAX_CONCURRENCY (int): Fetches running at once, all hosts (default 16).
+    FETCH_PER_HOST_CONCURRENCY (int): Fetches running at once per host (default 2).
+    FETCH_HOST_INTERVAL (float): Minimum seconds between request starts on
+        one host (default 0.5).
+    FETCH_MAX_CRAWL_DELAY (float): Upper bound for robots.txt Crawl-delay
+        and Retry-After pauses (default 30).
+    FETCH_QUEUE_TIMEOUT (float): Seconds a fetch may wait for a slot (default 30).
+    FETCH_RESPECT_ROBOTS (bool): Read Crawl-delay from robots.txt (default true).
+    FETCH_ROBOTS_TTL (float): Seconds a robots.txt stays cached (default 86400).
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+import httpx
+from app.utils.http_client import get_http_client
+from app.utils.metrics import metrics
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+MAX_CONCURRENCY = int(os.getenv("FETCH_MAX_CONCURRENCY", 16))
+PER_HOST_CONCURRENCY = int(os.getenv("FETCH_PER_HOST_CONCURRENCY", 2))
+HOST_INTERVAL = float(os.getenv("FETCH_HOST_INTERVAL", 0.5))
+MAX_CRAWL_DELAY = float(os.getenv("FETCH_MAX_CRAWL_DELAY", 30))
+QUEUE_TIMEOUT = float(os.getenv("FETCH_QUEUE_TIMEOUT", 30))
+RESPECT_ROBOTS = os.getenv("FETCH_RESPECT_ROBOTS", "true").lower() in ("1", "true", "yes")
+ROBOTS_TTL = float(os.getenv("FETCH_ROBOTS_TTL", 86400))
+ROBOTS_TIMEOUT = 5.0
+
+# Idle hosts are forgotten after this many seconds to bound memory.
+HOST_IDLE_EXPIRY = 3600
+
+
+class SchedulerTimeout(Exception):
+    pass
+
+
+def parse_retry_after(value: str):
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def _host_of(url: str) -> str:
+    parts = urlsplit(url)
+    return (parts.netloc or "").lower()
+
+
+class _HostState:
+    def __init__(self):
+        self.queue = deque()
+        self.active = 0
+        self.next_start = 0.0
+        self.paused_until = 0.0
+        self.crawl_delay = 0.0
+        self.last_used = time.monotonic()
+        self.requests = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def interval(self) -> float:
+        return max(HOST_INTERVAL, self.crawl_delay)
+
+    def ready_at(self) -> float:
+        return max(self.next_start, self.paused_until)
+
+
+class FetchScheduler:
+    """
+    Grants fetch slots per host with concurrency, rate and fairness limits.
+
+    Args:
+        max_concurrency (int): Fetches running at once across all hosts.
+        per_host (int): Fetches running at once against one host.
+        respect_robots (bool): Apply robots.txt Crawl-delay.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = MAX_CONCURRENCY,
+        per_host: int = PER_HOST_CONCURRENCY,
+        respect_robots: bool = RESPECT_ROBOTS,
+    ):
+        self.max_concurrency = max_concurrency
+        self.per_host = per_host
+        self.respect_robots = respect_robots
+        self._cond = threading.Condition()
+        self._hosts = {}
+        # Hosts with queued fetches, in round-robin order.
+        self._waiting = OrderedDict()
+        self._active = 0
+        self._robots = {}
+        self._robots_lock = threading.Lock()
+
+    # robots.txt
+
+    def _load_crawl_delay(self, url: str) -> float:
+        parts = urlsplit(url)
+        robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+        try:
+            res = get_http_client().get(robots_url, timeout=ROBOTS_TIMEOUT)
+        except httpx.HTTPError as e:
+            logger.debug(f"Could not fetch {robots_url}: {e}")
+            return 0.0
+        if not res.ok:
+            return 0.0
+        parser = RobotFileParser()
+        parser.parse(res.text.splitlines())
+        delay = parser.crawl_delay("*") or 0.0
+        return min(float(delay), MAX_CRAWL_DELAY)
+
+    def _crawl_delay(self, host: str, url: str) -> float:
+        """Return the host's Crawl-delay, fetching robots.txt at most once per TTL."""
+        with self._robots_lock:
+            entry = self._robots.get(host)
+            if entry and entry[0] > time.monotonic():
+                future, owner = entry[1], False
+            else:
+                future, owner = Future(), True
+                self._robots[host] = (time.monotonic() + ROBOTS_TTL, future)
+        if owner:
+            try:
+                future.set_result(self._load_crawl_delay(url))
+            except Exception as e:
+                logger.warning(f"robots.txt lookup failed for {host}: {e}")
+                future.set_result(0.0)
+        return future.result()
+
+    # slot bookkeeping (callers hold self._cond)
+
+    def _host(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState()
+        return state
+
+    def _dispatch(self, now: float) -> None:
+        """Grant queued tickets round-robin until no host can start another fetch."""
+        granted, any_granted = True, False
+        while granted and self._active < self.max_concurrency:
+            granted = False
+            for host in list(self._waiting):
+                state = self._hosts[host]
+                if state.active >= self.per_host or state.ready_at() > now:
+                    continue
+                ticket = state.queue.popleft()
+                ticket["granted"] = True
+                state.active += 1
+                state.requests += 1
+                state.next_start = now + state.interval()
+                self._active += 1
+                # Served hosts go to the back of the line.
+                del self._waiting[host]
+                if state.queue:
+                    self._waiting[host] = True
+                granted = any_granted = True
+                break
+        if any_granted:
+            self._cond.notify_all()
+
+    def _next_wakeup(self, now: float) -> float | None:
+        times = [
+            self._hosts[host].ready_at()
+            for host in self._waiting
+            if self._hosts[host].active < self.per_host
+        ]
+        future = [t - now for t in times if t > now]
+        return min(future) if future else None
+
+    def _prune(self, now: float) -> None:
+        for host in [
+            host
+            for host, state in self._hosts.items()
+            if not state.queue
+            and not state.active
+            and now - state.last_used > HOST_IDLE_EXPIRY
+        ]:
+            del self._hosts[host]
+
+    # public API
+
+    def acquire(self, url: str, timeout: float = QUEUE_TIMEOUT) -> str:
+        """Block until `url`'s host may be fetched; returns the host key."""
+        host = _host_of(url)
+        crawl_delay = self._crawl_delay(host, url) if self.respect_robots else 0.0
+
+        ticket = {"granted": False}
+        enqueued = time.monotonic()
+        deadline = enqueued + timeout
+        with self._cond:
+            state = self._host(host)
+            state.crawl_delay = crawl_delay
+            state.queue.append(ticket)
+            self._waiting.setdefault(host, True)
+            while True:
+                now = time.monotonic()
+                self._dispatch(now)
+                if ticket["granted"]:
+                    break
+                if now >= deadline:
+                    state.queue.remove(ticket)
+                    if not state.queue:
+                        self._waiting.pop(host, None)
+                    metrics.increment("fetch_scheduler_timeouts")
+                    raise SchedulerTimeout(
+                        f"Waited more than {timeout}s for a fetch slot on {host}"
+                    )
+                wakeup = self._next_wakeup(now)
+                wait_for = deadline - now if wakeup is None else min(wakeup, deadline - now)
+                self._cond.wait(timeout=wait_for)
+
+            waited = time.monotonic() - enqueued
+            state.wait_total += waited
+            state.wait_max = max(state.wait_max, waited)
+            state.last_used = time.monotonic()
+        return host
+
+    def release(self, host: str, retry_after: float | None = None) -> None:
+        """Free the slot taken by `acquire`, pausing the host on Retry-After."""
+        with self._cond:
+            state = self._hosts[host]
+            state.active -= 1
+            self._active -= 1
+            now = time.monotonic()
+            if retry_after:
+                pause = min(retry_after, MAX_CRAWL_DELAY)
+                state.paused_until = max(state.paused_until, now + pause)
+                metrics.increment("fetch_retry_after_pauses")
+                logger.info(f"Pausing fetches to {host} for {pause:.1f}s (Retry-After)")
+            state.last_used = now
+            self._prune(now)
+            self._dispatch(now)
+
+    @contextmanager
+    def slot(self, url: str, timeout: float = QUEUE_TIMEOUT):
+        """
+        Hold a fetch slot for `url` while the block runs.
+
+        Yields a dict; set its "retry_after" key (seconds) to pause the host
+        after the slot is released.
+        """
+        host = self.acquire(url, timeout)
+        outcome = {"retry_after": None}
+        try:
+            yield outcome
+        finally:
+            self.release(host, outcome["retry_after"])
+
+    def stats(self) -> dict:
+        with self._cond:
+            now = time.monotonic()
+            return {
+                "active": self._active,
+                "queued": sum(len(s.queue) for s in self._hosts.values()),
+                "hosts": {
+                    host: {
+                        "active": state.active,
+                        "queued": len(state.queue),
+                        "requests": state.requests,
+                        "interval": state.interval(),
+                        "paused_for": round(max(0.0, state.paused_until - now), 1),
+                        "avg_wait": (
+                            round(state.wait_total / state.requests, 3)
+                            if state.requests
+                            else 0.0
+                        ),
+                        "max_wait": round(state.wait_max, 3),
+                    }
+                    for host, state in self._hosts.items()
+                },
+            }
+
+
+fetch_scheduler = FetchScheduler()
+metrics.register_collector("fetch_scheduler", fetch_scheduler.stats)
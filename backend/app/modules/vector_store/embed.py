@@ -8,7 +8,9 @@ Workflow:
     1. Validates that each chunk is a dictionary containing the 'text'
        field.
     2. Extracts all chunk texts and generates embeddings using the
-       "all-MiniLM-L6-v2" model.
+       shared "all-MiniLM-L6-v2" model from `app.utils.registry`.
+       The call goes through `app.utils.providers` (kind "embedding"),
+       so embeddings can be recorded and replayed.
     3. Packages each embedding with its corresponding chunk ID and
        metadata for downstream storage in a vector database.
 
@@ -22,11 +24,10 @@ Functions:
 """
 
 
-from sentence_transformers import SentenceTransformer
+from app.utils.registry import get_embedder, EMBEDDING_MODEL
+from app.utils.providers import provide_sync
 from typing import List, Dict, Any
 
-embedder = SentenceTransformer("all-MiniLM-L6-v2")
-
 
 def embed_chunks(chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     if not chunks:
@@ -40,7 +41,11 @@ def embed_chunks(chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
             )
 
     texts = [chunk["text"] for chunk in chunks]
-    embeddings = embedder.encode(texts).tolist()
+    embeddings = provide_sync(
+        "embedding",
+        (EMBEDDING_MODEL, texts),
+        lambda: get_embedder().encode(texts).tolist(),
+    )
 
     vectors = []
     for chunk, embedding in zip(chunks, embeddings):
@@ -14,35 +14,73 @@ Endpoints:
 
     POST /process
         Accepts a URL, scrapes and processes the article content, then executes the
-        LangGraph workflow for sentiment analysis, fact-checking, perspective generation,
-        and final result assembly.
+        LangGraph workflow for sentiment analysis, fact-checking and bias scoring (run
+        in parallel), perspective generation, and final result assembly. The result
+        includes `bias_score` (null when the article could not be scored), so a
+        separate `/bias` call is not needed.
+
+    POST /process/batch
+        Accepts a list of URLs and runs each one through the same pipeline as
+        `/process`, a few at a time. Results are streamed back as
+        newline-delimited JSON, one line per URL in completion order, each
+        with its own status, so one bad URL does not fail the batch.
 
     POST /chat
         Accepts a user query, searches stored vector data in Pinecone, and queries an LLM
         to produce a contextual answer.
 
+    POST /chat/stream
+        Same as `/chat`, but streams the answer as server-sent events while
+        the LLM generates it: one `data: {"token": "..."}` event per chunk,
+        then an `event: done` (or `event: error` with a message). Stops
+        generating when the client disconnects.
+
+    GET /ready
+        Readiness probe: 200 once the background start-up phase has finished,
+        503 while it is still running.
+
+    GET /metrics
+        Returns in-process counters (e.g. fetch rejections by reason) and
+        component statistics such as article cache hits and misses.
+
+    GET /extractor/stats
+        Returns per-domain extraction stats (success rate, text length and parse time
+        per method), optionally filtered with `?domain=`.
+
 Core Components:
     - run_scraper_pipeline: Extracts and cleans article text, then identifies keywords.
+      Results are cached per URL, so `/bias` and `/process` share one extraction.
     - run_langgraph_workflow: Executes the LangGraph pipeline for deep content analysis.
     - check_bias: Scores and analyzes potential bias in article content.
     - search_pinecone: Retrieves relevant RAG data for a given query.
     - ask_llm: Generates a natural language answer using retrieved context.
+    - stream_llm: Streams the same answer chunk by chunk.
 """
 
 
-from fastapi import APIRouter
-from pydantic import BaseModel
+from contextlib import aclosing
+from fastapi import APIRouter, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from app.modules.pipeline import run_scraper_pipeline
 from app.modules.pipeline import run_langgraph_workflow
 from app.modules.bias_detection.check_bias import check_bias
 from app.modules.chat.get_rag_data import search_pinecone
-from app.modules.chat.llm_processing import ask_llm
+from app.modules.chat.llm_processing import ask_llm, stream_llm
+from app.modules.scraper.domain_stats import domain_stats
+from app.utils.metrics import metrics
+from app.startup import readiness
 from app.logging.logging_config import setup_logger
 import asyncio
 import json
+import os
 
 logger = setup_logger(__name__)
 
+BATCH_MAX_URLS = int(os.getenv("BATCH_MAX_URLS", 50))
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", 4))
+
 router = APIRouter()
 
 
@@ -50,6 +88,11 @@ class URlRequest(BaseModel):
     url: str
 
 
+class BatchRequest(BaseModel):
+    urls: list[str] = Field(..., min_length=1, max_length=BATCH_MAX_URLS)
+    concurrency: int | None = Field(None, ge=1, le=BATCH_CONCURRENCY)
+
+
 class ChatQuery(BaseModel):
     message: str
 
@@ -59,10 +102,17 @@ async def home():
     return {"message": "Perspective API is live!"}
 
 
+@router.get("/ready")
+async def ready():
+    report = readiness()
+    status_code = 503 if report["status"] == "starting" else 200
+    return JSONResponse(status_code=status_code, content=report)
+
+
 @router.post("/bias")
 async def bias_detection(request: URlRequest):
     content = await asyncio.to_thread(run_scraper_pipeline, (request.url))
-    bias_score = await asyncio.to_thread(check_bias, (content))
+    bias_score = await check_bias(content)
     logger.info(f"Bias detection result: {bias_score}")
     return bias_score
 
@@ -71,15 +121,117 @@ async def bias_detection(request: URlRequest):
 async def run_pipelines(request: URlRequest):
     article_text = await asyncio.to_thread(run_scraper_pipeline, (request.url))
     logger.debug(f"Scraper output: {json.dumps(article_text, indent=2, ensure_ascii=False)}")
-    data = await asyncio.to_thread(run_langgraph_workflow, (article_text))
+    data = await run_langgraph_workflow(article_text)
     return data
 
 
+async def _process_batch_item(index: int, url: str, semaphore: asyncio.Semaphore):
+    async with semaphore:
+        try:
+            article_text = await asyncio.to_thread(run_scraper_pipeline, url)
+            if not article_text.get("cleaned_text"):
+                error = (article_text.get("fetch") or {}).get("error")
+                return {
+                    "index": index,
+                    "url": url,
+                    "status": "error",
+                    "error_from": "scraper",
+                    "message": error or "Failed to extract article.",
+                }
+            data = await run_langgraph_workflow(article_text)
+        except Exception as e:
+            logger.exception(f"Batch item {index} failed for {url}: {e}")
+            return {
+                "index": index,
+                "url": url,
+                "status": "error",
+                "error_from": "pipeline",
+                "message": str(e),
+            }
+
+    if data.get("status") == "stopped_due_to_error":
+        return {
+            "index": index,
+            "url": url,
+            "status": "error",
+            "error_from": data.get("error_from"),
+            "message": data.get("message"),
+        }
+    return {"index": index, "url": url, "status": "success", "result": data}
+
+
+@router.post("/process/batch")
+async def run_pipelines_batch(request: BatchRequest):
+    semaphore = asyncio.Semaphore(request.concurrency or BATCH_CONCURRENCY)
+
+    async def stream():
+        tasks = [
+            asyncio.create_task(_process_batch_item(i, url, semaphore))
+            for i, url in enumerate(request.urls)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                item = await next_done
+                yield json.dumps(jsonable_encoder(item), ensure_ascii=False) + "\n"
+        finally:
+            # Client went away: do not start the remaining URLs.
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
 @router.post("/chat")
 async def answer_query(request: ChatQuery):
     query = request.message
-    results = search_pinecone(query)
-    answer = ask_llm(query, results)
+    results = await search_pinecone(query)
+    answer = await ask_llm(query, results)
     logger.info(f"Chat answer generated: {answer}")
 
     return {"answer": answer}
+
+
+def _sse(data: dict, event: str | None = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/chat/stream")
+async def stream_answer(request: ChatQuery, http_request: Request):
+    query = request.message
+
+    async def stream():
+        # Sent before retrieval so the client sees the response start at once.
+        yield ": retrieving\n\n"
+        try:
+            results = await search_pinecone(query)
+            # aclosing() ends the LLM stream (and frees its slot) if the
+            # client goes away or this generator is cancelled.
+            tokens = stream_llm(query, results)
+            async with aclosing(tokens):
+                async for token in tokens:
+                    if await http_request.is_disconnected():
+                        logger.info("Chat stream client disconnected")
+                        return
+                    yield _sse({"token": token})
+        except Exception as e:
+            logger.exception(f"Chat stream failed: {e}")
+            yield _sse({"message": str(e)}, event="error")
+            return
+        yield _sse({}, event="done")
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/extractor/stats")
+async def extractor_stats(domain: str | None = None):
+    return domain_stats.snapshot(domain)
+
+
+@router.get("/metrics")
+async def get_metrics():
+    return metrics.snapshot()
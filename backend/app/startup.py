@@ -0,0 +1,144 @@
+"""
+startup.py
+----------
+Background start-up phase of the Perspective API.
+
+Importing the application only loads what is needed to serve requests;
+parsers, NLTK data, the LangGraph workflow and (optionally) the shared
+models and clients are prepared here, in a background thread started by
+the application lifespan. The server accepts connections right away and
+`GET /api/ready` reports when preparation has finished. Requests that
+arrive earlier still work: every step is also done lazily on first use.
+
+Steps:
+    nltk_data   Downloads the NLTK corpora used by RAKE if missing.
+    parsers     Imports the HTML extraction libraries.
+    langgraph   Compiles the LangGraph workflow.
+    scraper_pool
+                Starts the scraper worker processes (only when
+                `SCRAPER_EXECUTION_MODE=process`).
+    models      Loads the embedder, Groq clients and Pinecone index
+                (only when `WARM_UP_ON_STARTUP` is enabled).
+
+Functions:
+    run_startup() -> dict
+        Runs every step in order and records its status and duration.
+
+    readiness() -> dict
+        Current start-up status: "starting", "ready" or "degraded" (a step
+        failed), with per-step details. Also published as the "startup"
+        entry of `GET /api/metrics`.
+
+Environment Variables:
+    WARM_UP_ON_STARTUP (bool): Also load models and clients during start-up
+        (default false).
+"""
+
+import importlib
+import os
+import threading
+import time
+from app.utils.metrics import metrics
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+PARSER_MODULES = ("trafilatura", "newspaper", "bs4", "readability")
+
+_lock = threading.Lock()
+_steps = {}
+_state = {"status": "starting", "started_at": None, "finished_at": None}
+
+
+def _warm_up_enabled() -> bool:
+    return os.getenv("WARM_UP_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+
+
+def _load_nltk_data():
+    from app.modules.scraper.keywords import ensure_nltk_data
+
+    ensure_nltk_data()
+
+
+def _import_parsers():
+    for module in PARSER_MODULES:
+        importlib.import_module(module)
+
+
+def _compile_workflow():
+    from app.modules.pipeline import get_workflow
+
+    get_workflow()
+
+
+def _start_scraper_pool():
+    from app.modules.scraper.process_pool import warm_up_pool
+
+    warm_up_pool()
+
+
+def _warm_up_models():
+    from app.utils.registry import warm_up
+
+    failed = {name: res for name, res in warm_up().items() if res != "ok"}
+    if failed:
+        raise RuntimeError(f"Warm-up failed for: {failed}")
+
+
+def _startup_steps():
+    steps = [
+        ("nltk_data", _load_nltk_data),
+        ("parsers", _import_parsers),
+        ("langgraph", _compile_workflow),
+    ]
+    if os.getenv("SCRAPER_EXECUTION_MODE", "thread").lower() == "process":
+        steps.append(("scraper_pool", _start_scraper_pool))
+    if _warm_up_enabled():
+        steps.append(("models", _warm_up_models))
+    return steps
+
+
+def run_startup() -> dict:
+    """
+    Run the start-up steps in order. A failing step is logged and recorded
+    but does not stop the remaining ones.
+
+    Returns:
+        dict: The final `readiness()` report.
+    """
+    steps = _startup_steps()
+    with _lock:
+        _state["started_at"] = time.time()
+        for name, _ in steps:
+            _steps[name] = {"status": "pending"}
+
+    for name, step in steps:
+        with _lock:
+            _steps[name] = {"status": "running"}
+        start = time.perf_counter()
+        try:
+            step()
+            outcome = {"status": "ok"}
+        except Exception as e:
+            logger.exception(f"Start-up step '{name}' failed: {e}")
+            outcome = {"status": "error", "message": str(e)}
+        outcome["seconds"] = round(time.perf_counter() - start, 3)
+        with _lock:
+            _steps[name] = outcome
+
+    with _lock:
+        _state["finished_at"] = time.time()
+        failed = any(s["status"] == "error" for s in _steps.values())
+        _state["status"] = "degraded" if failed else "ready"
+
+    report = readiness()
+    logger.info(f"Start-up finished: {report}")
+    return report
+
+
+def readiness() -> dict:
+    with _lock:
+        return {**_state, "steps": {name: dict(s) for name, s in _steps.items()}}
+
+
+metrics.register_collector("startup", readiness)
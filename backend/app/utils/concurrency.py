@@ -0,0 +1,87 @@
+"""
+concurrency.py
+--------------
+Named concurrency limits for the async parts of the backend.
+
+LangGraph nodes, the chat route and the ingestion CLI run on an event loop
+and await their network calls, so the number of OS threads no longer caps
+how much work is in flight. These semaphores do instead: every LLM call,
+web search, vector-store request, embedding batch and workflow run holds a
+slot of its limit while it runs.
+
+asyncio semaphores belong to one event loop, so one set is kept per loop.
+
+Functions:
+    limit(name: str) -> asyncio.Semaphore
+        Semaphore for `name` ("llm", "search", "vector", "embedding" or
+        "workflow") on the running loop. Use as `async with limit("llm"):`.
+
+    async gather_bounded(coros, concurrency: int, timeout: float | None = None) -> list
+        Runs coroutines with at most `concurrency` at once, each with its
+        own timeout. Results come back in input order; a coroutine that
+        failed or timed out is represented by its exception.
+
+    in_use() -> dict
+        Slots currently taken per limit, published as the "concurrency"
+        entry of `GET /api/metrics`.
+
+Environment Variables:
+    LLM_MAX_CONCURRENCY (int): Concurrent LLM calls (default 8).
+    SEARCH_MAX_CONCURRENCY (int): Concurrent web searches (default 8).
+    VECTOR_MAX_CONCURRENCY (int): Concurrent Pinecone requests (default 8).
+    EMBEDDING_MAX_CONCURRENCY (int): Concurrent embedding batches (default 2).
+    WORKFLOW_MAX_CONCURRENCY (int): LangGraph runs at once (default 16).
+"""
+
+import asyncio
+import os
+import threading
+import weakref
+from app.utils.metrics import metrics
+
+LIMITS = {
+    "llm": int(os.getenv("LLM_MAX_CONCURRENCY", 8)),
+    "search": int(os.getenv("SEARCH_MAX_CONCURRENCY", 8)),
+    "vector": int(os.getenv("VECTOR_MAX_CONCURRENCY", 8)),
+    "embedding": int(os.getenv("EMBEDDING_MAX_CONCURRENCY", 2)),
+    "workflow": int(os.getenv("WORKFLOW_MAX_CONCURRENCY", 16)),
+}
+
+_lock = threading.Lock()
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def limit(name: str) -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    with _lock:
+        per_loop = _semaphores.get(loop)
+        if per_loop is None:
+            per_loop = _semaphores[loop] = {}
+        semaphore = per_loop.get(name)
+        if semaphore is None:
+            semaphore = per_loop[name] = asyncio.Semaphore(LIMITS[name])
+    return semaphore
+
+
+async def gather_bounded(coros, concurrency: int, timeout: float | None = None) -> list:
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def run(coro):
+        async with semaphore:
+            # The timeout starts once the coroutine has a slot.
+            return await asyncio.wait_for(coro, timeout)
+
+    return await asyncio.gather(*(run(coro) for coro in coros), return_exceptions=True)
+
+
+def in_use() -> dict:
+    with _lock:
+        loops = list(_semaphores.values())
+    usage = {name: 0 for name in LIMITS}
+    for per_loop in loops:
+        for name, semaphore in per_loop.items():
+            usage[name] += LIMITS[name] - semaphore._value
+    return {"limits": dict(LIMITS), "in_use": usage}
+
+
+metrics.register_collector("concurrency", in_use)
@@ -7,74 +7,110 @@ verification to produce a structured set of fact verification results.
 
 Pipeline Steps:
     1. Claim Extraction:
-        - Uses the `run_claim_extractor_sdk` to identify verifiable claims from the
-          provided article state.
+        - Uses the claims already in the state (from the combined analysis)
+          when present, otherwise `run_claim_extractor_sdk` to identify
+          verifiable claims from the provided article state.
         - Claims are parsed from markdown-like bullet point output.
 
     2. Web Search:
-        - For each extracted claim, executes a Google search via `search_google` to find
+        - For each extracted claim, executes a Google search via `asearch_google` to find
           relevant supporting or refuting sources.
-        - Stores the top search result along with the associated claim.
-        - Implements basic error handling and skips claims with no search results.
+        - Claims are searched concurrently (at most `FACT_CHECK_CONCURRENCY`
+          at once), each within `FACT_CHECK_SEARCH_TIMEOUT` seconds.
+        - Stores the top search result along with the associated claim, in
+          claim order.
+        - Skips claims whose search failed, timed out or returned nothing.
 
     3. Fact Verification:
         - Passes search results to `run_fact_verifier_sdk` for LLM-based evaluation.
-        - Produces verdicts and explanations for each claim.
+        - Produces verdicts and explanations for each claim; claims are
+          verified concurrently as well, so the stage takes about as long
+          as its slowest claim.
 
 Returns:
     - A list of verification objects containing verdicts, reasoning, and source metadata.
     - An error message if the process fails at any stage.
 
+Environment Variables:
+    FACT_CHECK_CONCURRENCY (int): Claims searched at once (default 4).
+    FACT_CHECK_SEARCH_TIMEOUT (float): Seconds allowed for one claim's
+        search (default 15).
+
+Metrics:
+    fact_check_claims{stage,outcome}: Claims dropped at "search" or
+        "verify" because of a "timeout" or an "error".
+
 Usage:
-    final_results, error = run_fact_check_pipeline(state)
+    final_results, error = await run_fact_check_pipeline(state)
 """
 
 
-from app.modules.facts_check.web_search import search_google
+from app.modules.facts_check.web_search import asearch_google
 from app.modules.facts_check.llm_processing import (
     run_claim_extractor_sdk,
     run_fact_verifier_sdk,
 )
+from app.utils.concurrency import gather_bounded
+from app.utils.metrics import metrics
 from app.logging.logging_config import setup_logger
+import asyncio
+import os
 import re
 
 logger = setup_logger(__name__)
 
+SEARCH_CONCURRENCY = int(os.getenv("FACT_CHECK_CONCURRENCY", 4))
+SEARCH_TIMEOUT = float(os.getenv("FACT_CHECK_SEARCH_TIMEOUT", 15))
+
 
-def run_fact_check_pipeline(state):
-    result = run_claim_extractor_sdk(state)
+async def _search_claim(claim):
+    logger.info(f"\n🔍 Searching for claim: {claim}")
+    results = await asearch_google(claim)
+    if not results:
+        return None
+    results[0]["claim"] = claim
+    return results[0]
+
+
+async def run_fact_check_pipeline(state):
+    claims = state.get("claims")
+    if not claims:
+        result = await run_claim_extractor_sdk(state)
 
-    if state.get("status") != "success":
-        logger.error("❌ Claim extraction failed.")
-        return [], "Claim extraction failed."
+        if result.get("status") != "success":
+            logger.error("❌ Claim extraction failed.")
+            return [], "Claim extraction failed."
 
-    # Step 1: Extract claims
-    raw_output = result.get("verifiable_claims", "")
-    claims = re.findall(r"^[\*\-•]\s+(.*)", raw_output, re.MULTILINE)
-    claims = [claim.strip() for claim in claims if claim.strip()]
+        # Step 1: Extract claims
+        raw_output = result.get("verifiable_claims", "")
+        claims = re.findall(r"^[\*\-•]\s+(.*)", raw_output, re.MULTILINE)
+        claims = [claim.strip() for claim in claims if claim.strip()]
     logger.info(f"🧠 Extracted claims: {claims}")
 
     if not claims:
         return [], "No verifiable claims found."
 
-    # Step 2: Search each claim with polite delay
+    # Step 2: Search all claims at once, keeping the claim order
+    outcomes = await gather_bounded(
+        (_search_claim(claim) for claim in claims), SEARCH_CONCURRENCY, SEARCH_TIMEOUT
+    )
     search_results = []
-    for claim in claims:
-        logger.info(f"\n🔍 Searching for claim: {claim}")
-        try:
-            results = search_google(claim)
-            if results:
-                results[0]["claim"] = claim
-                search_results.append(results[0])
-                logger.info(f"✅ Found result: {results[0]['title']}")
-            else:
-                logger.warning(f"⚠️ No search result for: {claim}")
-        except Exception as e:
-            logger.error(f"❌ Search failed for: {claim} -> {e}")
+    for claim, outcome in zip(claims, outcomes):
+        if isinstance(outcome, asyncio.TimeoutError):
+            logger.error(f"❌ Search timed out for: {claim}")
+            metrics.increment("fact_check_claims", stage="search", outcome="timeout")
+        elif isinstance(outcome, Exception):
+            logger.error(f"❌ Search failed for: {claim} -> {outcome}")
+            metrics.increment("fact_check_claims", stage="search", outcome="error")
+        elif outcome is None:
+            logger.warning(f"⚠️ No search result for: {claim}")
+        else:
+            logger.info(f"✅ Found result: {outcome['title']}")
+            search_results.append(outcome)
 
     if not search_results:
         return [], "All claim searches failed or returned no results."
 
     # Step 3: Verify facts using LLM
-    final = run_fact_verifier_sdk(search_results)
+    final = await run_fact_verifier_sdk(search_results)
     return final.get("verifications", []), None
@@ -0,0 +1,385 @@
+"""
+http_client.py
+--------------
+Shared, pooled HTTP client used for every outbound request made by the
+scraper and the fact-check web search.
+
+A single `httpx.AsyncClient` runs on a dedicated background event loop, so
+keep-alive connections (and TLS sessions) are reused across requests no
+matter whether the caller is a worker thread (the scraper) or a coroutine
+on the FastAPI event loop.
+
+Main Features:
+    - Keep-alive connection pools per host with configurable limits.
+    - HTTP/2 when the host negotiates it (`h2` comes with the
+      `httpx[http2]` dependency; without it the client falls back to
+      HTTP/1.1).
+    - Configurable connect and read timeouts.
+    - ETag / Last-Modified revalidation: validators and bodies of recent
+      responses are remembered and re-requested conditionally, so an
+      unchanged page comes back as a cheap 304.
+    - Streaming downloads with a byte cap, an `inspect` hook that can reject
+      a response from its headers and first bytes before the body is read,
+      and incremental decoding of the body as it arrives.
+
+Classes:
+    HttpResponse
+        Plain response snapshot (status, final URL, headers and body).
+
+    ResponseRejected
+        Raised when a streamed response is aborted early; `reason` is a
+        short machine-readable label such as "too_large".
+
+    HttpClient
+        Owns the background loop and the pooled async client. Offers
+        blocking `get`/`stream_get` for worker threads and awaitable
+        `aget`/`apost` for coroutines.
+
+Functions:
+    get_http_client() -> HttpClient
+        Returns the process-wide client, creating it on first use.
+
+Environment Variables:
+    HTTP_CONNECT_TIMEOUT (float): Connect timeout in seconds (default 5).
+    HTTP_READ_TIMEOUT (float): Read timeout in seconds (default 15).
+    HTTP_MAX_CONNECTIONS (int): Total pooled connections (default 100).
+    HTTP_MAX_KEEPALIVE (int): Idle keep-alive connections kept (default 20).
+    HTTP_KEEPALIVE_EXPIRY (float): Seconds an idle connection is kept (default 30).
+    HTTP_VALIDATOR_CACHE_SIZE (int): Responses kept for revalidation (default 128).
+"""
+
+import asyncio
+import codecs
+import importlib.util
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import json
+import httpx
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", 15))
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", 100))
+MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", 20))
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30))
+VALIDATOR_CACHE_SIZE = int(os.getenv("HTTP_VALIDATOR_CACHE_SIZE", 128))
+
+# Bodies larger than this are not kept for revalidation.
+MAX_REVALIDATION_BODY = 2 * 1024 * 1024
+
+_META_CHARSET_RE = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?([\w.:-]+)""", re.IGNORECASE
+)
+
+
+class ResponseRejected(Exception):
+    def __init__(self, reason: str, message: str = ""):
+        super().__init__(message or reason)
+        self.reason = reason
+
+
+def _charset_from_headers(headers: dict):
+    content_type = headers.get("content-type", "")
+    for part in content_type.split(";"):
+        name, _, value = part.strip().partition("=")
+        if name.lower() == "charset" and value:
+            return value.strip("\"'")
+    return None
+
+
+def _incremental_decoder(headers: dict, first_chunk: bytes):
+    """Pick a decoder from the Content-Type charset, a <meta> tag or UTF-8."""
+    candidates = [_charset_from_headers(headers)]
+    match = _META_CHARSET_RE.search(first_chunk[:4096])
+    if match:
+        candidates.append(match.group(1).decode("ascii", errors="ignore"))
+    for charset in candidates:
+        if not charset:
+            continue
+        try:
+            return codecs.getincrementaldecoder(charset)(errors="replace")
+        except LookupError:
+            continue
+    return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+
+@dataclass
+class HttpResponse:
+    status: int
+    url: str
+    headers: dict = field(default_factory=dict)
+    content: bytes = b""
+    revalidated: bool = False
+    decoded: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 400
+
+    @property
+    def text(self) -> str:
+        if self.decoded is not None:
+            return self.decoded
+        return self.content.decode(self.encoding, errors="replace")
+
+    @property
+    def encoding(self) -> str:
+        return _charset_from_headers(self.headers) or "utf-8"
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class HttpClient:
+    """
+    Pooled async HTTP client running on its own event loop thread.
+
+    Use `get()` from synchronous code (worker threads) and `aget()` from
+    coroutines; both share the same connection pool.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self._thread = None
+        self._client = None
+        self._lock = threading.Lock()
+        self._validators = OrderedDict()
+        self._validators_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._loop is not None:
+            return self._loop
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="http-client", daemon=True
+                )
+                thread.start()
+                self._client = asyncio.run_coroutine_threadsafe(
+                    self._create_client(), loop
+                ).result()
+                self._thread = thread
+                self._loop = loop
+                logger.info(f"HTTP client started (http2={HTTP2_AVAILABLE})")
+        return self._loop
+
+    async def _create_client(self):
+        return httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            follow_redirects=True,
+            timeout=httpx.Timeout(
+                CONNECT_TIMEOUT, connect=CONNECT_TIMEOUT, read=READ_TIMEOUT
+            ),
+            limits=httpx.Limits(
+                max_connections=MAX_CONNECTIONS,
+                max_keepalive_connections=MAX_KEEPALIVE,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    def _cache_key(self, url, params):
+        return str(httpx.URL(url, params=params))
+
+    def _conditional_headers(self, key):
+        with self._validators_lock:
+            cached = self._validators.get(key)
+            if cached is None:
+                return None, {}
+            self._validators.move_to_end(key)
+        headers = {}
+        if cached.headers.get("etag"):
+            headers["If-None-Match"] = cached.headers["etag"]
+        if cached.headers.get("last-modified"):
+            headers["If-Modified-Since"] = cached.headers["last-modified"]
+        return cached, headers
+
+    def _revalidated(self, key, cached: HttpResponse) -> HttpResponse:
+        # The query string can carry API keys (Google Custom Search).
+        url = httpx.URL(key).copy_with(query=None)
+        logger.debug(f"Revalidated unchanged response for: {url}")
+        return HttpResponse(
+            status=cached.status,
+            url=cached.url,
+            headers=cached.headers,
+            content=cached.content,
+            revalidated=True,
+            decoded=cached.decoded,
+        )
+
+    def _remember(self, key, response: HttpResponse):
+        if not (
+            response.status == 200
+            and len(response.content) <= MAX_REVALIDATION_BODY
+            and ("etag" in response.headers or "last-modified" in response.headers)
+        ):
+            return
+        with self._validators_lock:
+            self._validators[key] = response
+            self._validators.move_to_end(key)
+            while len(self._validators) > VALIDATOR_CACHE_SIZE:
+                self._validators.popitem(last=False)
+
+    async def _request(
+        self, method, url, params=None, headers=None, timeout=None, json=None
+    ):
+        key = self._cache_key(url, params)
+        cached, conditional = (None, {})
+        if method == "GET":
+            cached, conditional = self._conditional_headers(key)
+
+        res = await self._client.request(
+            method,
+            url,
+            params=params,
+            headers={**(headers or {}), **conditional},
+            json=json,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        )
+
+        if res.status_code == 304 and cached is not None:
+            return self._revalidated(key, cached)
+
+        response = HttpResponse(
+            status=res.status_code,
+            url=str(res.url),
+            headers={k.lower(): v for k, v in res.headers.items()},
+            content=res.content,
+        )
+        if method == "GET":
+            self._remember(key, response)
+        return response
+
+    async def _stream(self, url, headers=None, timeout=None, max_bytes=None, inspect=None):
+        key = self._cache_key(url, None)
+        cached, conditional = self._conditional_headers(key)
+
+        async with self._client.stream(
+            "GET",
+            url,
+            headers={**(headers or {}), **conditional},
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        ) as res:
+            if res.status_code == 304 and cached is not None:
+                return self._revalidated(key, cached)
+
+            response_headers = {k.lower(): v for k, v in res.headers.items()}
+            # Only successful responses are checked; error responses (a 429
+            # with a JSON body, say) go back as-is so callers can act on
+            # their status and headers. Their bodies are truncated instead.
+            checked = 200 <= res.status_code < 300
+            declared = response_headers.get("content-length", "")
+            if checked and max_bytes and declared.isdigit() and int(declared) > max_bytes:
+                raise ResponseRejected(
+                    "too_large", f"Content-Length {declared} exceeds {max_bytes} bytes"
+                )
+            if checked and inspect:
+                reason = inspect(response_headers, b"")
+                if reason:
+                    raise ResponseRejected(reason, f"Rejected from headers: {reason}")
+
+            chunks, parts, total, decoder = [], [], 0, None
+            async for chunk in res.aiter_bytes():
+                if decoder is None:
+                    if checked and inspect:
+                        reason = inspect(response_headers, chunk)
+                        if reason:
+                            raise ResponseRejected(
+                                reason, f"Rejected from content: {reason}"
+                            )
+                    decoder = _incremental_decoder(response_headers, chunk)
+                total += len(chunk)
+                if max_bytes and total > max_bytes:
+                    if not checked:
+                        break
+                    raise ResponseRejected(
+                        "too_large", f"Body exceeded {max_bytes} bytes"
+                    )
+                chunks.append(chunk)
+                parts.append(decoder.decode(chunk))
+            if decoder is not None:
+                parts.append(decoder.decode(b"", final=True))
+
+        response = HttpResponse(
+            status=res.status_code,
+            url=str(res.url),
+            headers=response_headers,
+            content=b"".join(chunks),
+            decoded="".join(parts),
+        )
+        self._remember(key, response)
+        return response
+
+    def stream_get(
+        self, url, headers=None, timeout=None, max_bytes=None, inspect=None
+    ) -> HttpResponse:
+        """
+        Blocking, streamed GET that can abort before the whole body is read.
+
+        Args:
+            max_bytes (int, optional): Abort once the body exceeds this size.
+            inspect (Callable[[dict, bytes], str | None], optional): Called
+                with the lowercased headers and b"" before the body is read,
+                then with the first chunk. Returning a reason string aborts
+                the download with `ResponseRejected`.
+
+        `max_bytes` and `inspect` only reject 2xx responses; any other
+        status is returned normally, its body cut at `max_bytes`.
+
+        Raises:
+            ResponseRejected: If the size cap or `inspect` rejects the response.
+            httpx.HTTPError: On network errors.
+        """
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(
+            self._stream(url, headers, timeout, max_bytes, inspect), loop
+        )
+        return future.result()
+
+    def get(self, url, params=None, headers=None, timeout=None) -> HttpResponse:
+        """Blocking GET for synchronous callers. Raises `httpx.HTTPError`."""
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(
+            self._request("GET", url, params, headers, timeout), loop
+        )
+        return future.result()
+
+    async def aget(self, url, params=None, headers=None, timeout=None) -> HttpResponse:
+        """Awaitable GET usable from any event loop. Raises `httpx.HTTPError`."""
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(
+            self._request("GET", url, params, headers, timeout), loop
+        )
+        return await asyncio.wrap_future(future)
+
+    async def apost(self, url, json=None, headers=None, timeout=None) -> HttpResponse:
+        """Awaitable POST with a JSON body. Raises `httpx.HTTPError`."""
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(
+            self._request("POST", url, None, headers, timeout, json=json), loop
+        )
+        return await asyncio.wrap_future(future)
+
+    def close(self) -> None:
+        """Close pooled connections and stop the background loop."""
+        with self._lock:
+            if self._loop is None:
+                return
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop = self._thread = self._client = None
+
+
+_http_client = HttpClient()
+
+
+def get_http_client() -> HttpClient:
+    return _http_client
@@ -0,0 +1,313 @@
+"""
+llm.py
+------
+Single entry point for LLM calls, with response caching.
+
+The helpers are coroutines: they use the async Groq client and LangChain's
+`ainvoke`, so graph nodes awaiting them do not hold a worker thread while
+the provider answers. At most `LLM_MAX_CONCURRENCY` calls are in flight
+per event loop (see `app.utils.concurrency`). Cache reads and writes run
+in a worker thread, since they touch SQLite.
+
+Rate limits:
+    Calls that miss the cache take a slot from `app.utils.rate_limiter`
+    for their model (requests/tokens per minute and an adaptive
+    concurrency window). A 429 or 503 from the provider pauses the model
+    for its Retry-After (or a jittered backoff) and the call is retried up
+    to `LLM_MAX_RETRIES` times, so a burst no longer sends the graph to
+    its error handler. The Groq clients themselves do not retry (see
+    `GROQ_MAX_RETRIES` in `app.utils.registry`).
+
+Record/replay:
+    Provider calls go through `app.utils.providers`, so with
+    `PROVIDER_MODE=record|replay` replies are written to or served from
+    fixtures (kind "llm"). In those modes a stream is one chunk.
+
+Every module that talks to an LLM goes through one of the helpers below
+instead of calling the Groq client or a LangChain model directly, so
+caching (and anything else that has to apply to every call) lives in one
+place.
+
+Caching:
+    Responses are stored in `app.utils.llm_cache`, keyed on the call kind,
+    model, parameters and prompt. The `cache` argument of every helper
+    controls it per call:
+        None       cache when the temperature is at most
+                   `LLM_CACHE_MAX_TEMPERATURE` (the default)
+        True       always use the cache
+        False      bypass the cache (no read, no write)
+        "refresh"  skip the lookup but store the new response
+
+    Callers that parse the reply pass `cacheable`, a function of the reply
+    that returns whether it parsed. Replies it rejects are returned but
+    not stored, so a malformed reply is not served again from the cache
+    when the caller retries or falls back. They are counted as
+    `llm_cache{result="rejected"}`.
+
+Functions:
+    async chat_completion(messages: list[dict], model: str, cache=None,
+                          cacheable=None, **params) -> str
+        Groq chat completion; returns the message content.
+
+    async stream_chat_completion(messages: list[dict], model: str, cache=None,
+                                 **params) -> AsyncIterator[str]
+        Streaming Groq chat completion; yields the reply as it is
+        generated. Shares cache entries with `chat_completion`: a cached
+        reply is yielded in one piece, and a completed stream is stored.
+        The provider stream is read by a background task that holds the
+        rate-limiter and concurrency slots only until the provider is
+        done, not until the caller has read every chunk. Closing the
+        generator early (`aclose()`) cancels that task.
+
+    async invoke_chat_model(messages: list[dict], model: str, cache=None,
+                            cacheable=None, **params) -> str
+        LangChain `ChatGroq` invocation; returns the message content.
+
+    async invoke_structured(chain, inputs: dict, schema, model: str, namespace: str,
+                      cache=None, **params) -> pydantic.BaseModel
+        Invokes a LangChain chain that returns a `schema` instance.
+
+Environment Variables:
+    LLM_CACHE_ENABLED (bool): Master switch for the cache (default true).
+    LLM_CACHE_MAX_TEMPERATURE (float): Highest temperature that is cached
+        by default (default 0.3).
+    LLM_MAX_RETRIES (int): Retries after a rate-limit reply (default 3).
+"""
+
+import asyncio
+import os
+from app.utils.concurrency import limit
+from app.utils.llm_cache import llm_cache, make_key
+from app.utils.rate_limiter import llm_rate_limiter
+from app.utils.providers import PROVIDER_MODE, provide
+from app.modules.scraper.digest import estimate_tokens
+from app.modules.scraper.scheduler import parse_retry_after
+from app.utils.registry import get_async_groq_client, get_chat_model
+from app.utils.metrics import metrics
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+CACHE_MAX_TEMPERATURE = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", 0.3))
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 3))
+
+RETRY_STATUSES = (429, 503)
+# Reply budget assumed when a call does not set max_tokens.
+DEFAULT_MAX_TOKENS = 512
+
+# Providers default to a temperature of 1 when none is given.
+DEFAULT_TEMPERATURE = 1.0
+
+# Marks the end of a provider stream in `_produce_stream`'s queue.
+_STREAM_END = object()
+
+
+def _use_cache(cache, params: dict) -> bool:
+    if not CACHE_ENABLED or cache is False:
+        return False
+    if cache is None:
+        return params.get("temperature", DEFAULT_TEMPERATURE) <= CACHE_MAX_TEMPERATURE
+    return True
+
+
+def _estimate(prompt, params: dict) -> int:
+    return estimate_tokens(str(prompt)) + params.get("max_tokens", DEFAULT_MAX_TOKENS)
+
+
+def _rate_limit_delay(error):
+    """Return the Retry-After of a rate-limit error (0 if absent), or None for other errors."""
+    if getattr(error, "status_code", None) not in RETRY_STATUSES:
+        return None
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    return parse_retry_after(headers.get("retry-after")) or 0.0
+
+
+async def _scheduled(model: str, tokens: int, call, request: tuple):
+    """Run `call()` in a rate-limiter slot, retrying rate-limited attempts."""
+    for attempt in range(MAX_RETRIES + 1):
+        async with llm_rate_limiter.slot(model, tokens) as outcome:
+            async with limit("llm"):
+                try:
+                    value, outcome["used"] = await provide("llm", request, call)
+                    outcome["ok"] = True
+                    return value
+                except Exception as e:
+                    delay = _rate_limit_delay(e)
+                    if delay is None:
+                        raise
+                    outcome["retry_after"] = delay or llm_rate_limiter.backoff(attempt)
+                    if attempt == MAX_RETRIES:
+                        raise
+        metrics.increment("llm_retries", model=model)
+
+
+async def _cached(kind: str, key_parts: tuple, call, cache, params: dict, cacheable=None):
+    """
+    Return the cached result of `_scheduled(...)` or run it and store the
+    result, unless `cacheable` rejects it.
+    """
+    model, prompt = key_parts[0], key_parts[-1]
+
+    async def run():
+        return await _scheduled(
+            model, _estimate(prompt, params), call, (kind, *key_parts)
+        )
+
+    if not _use_cache(cache, params):
+        metrics.increment("llm_cache", kind=kind, result="bypass")
+        return await run()
+
+    key = make_key(kind, *key_parts)
+    if cache != "refresh":
+        value = await asyncio.to_thread(llm_cache.get, key)
+        if value is not None:
+            metrics.increment("llm_cache", kind=kind, result="hit")
+            logger.debug(f"LLM cache hit for {kind}")
+            return value
+
+    metrics.increment("llm_cache", kind=kind, result="miss")
+    value = await run()
+    if value is None:
+        return value
+    if cacheable is not None and not cacheable(value):
+        metrics.increment("llm_cache", kind=kind, result="rejected")
+        logger.debug(f"Not caching unparseable {kind} reply")
+        return value
+    await asyncio.to_thread(llm_cache.put, key, value)
+    return value
+
+
+async def _chat(messages, model, params: dict):
+    completion = await get_async_groq_client().chat.completions.create(
+        messages=messages, model=model, **params
+    )
+    usage = getattr(completion, "usage", None)
+    return completion.choices[0].message.content, getattr(usage, "total_tokens", None)
+
+
+async def chat_completion(messages, model, cache=None, cacheable=None, **params) -> str:
+    async def call():
+        return await _chat(messages, model, params)
+
+    return await _cached(
+        "chat", (model, params, messages), call, cache, params, cacheable
+    )
+
+
+async def _produce_stream(messages, model, params: dict, queue: asyncio.Queue):
+    """
+    Read the provider stream into `queue` inside a rate-limiter slot.
+
+    Puts each chunk, then `_STREAM_END` or the exception that ended the
+    stream. The slot is released as soon as the provider is done, however
+    slowly the consumer reads the queue.
+    """
+    sent = False
+    tokens = _estimate(messages, params)
+    try:
+        for attempt in range(MAX_RETRIES + 1):
+            async with llm_rate_limiter.slot(model, tokens) as outcome:
+                async with limit("llm"):
+                    try:
+                        if PROVIDER_MODE != "live":
+                            # Fixtures hold whole replies (shared with chat_completion).
+                            content, outcome["used"] = await provide(
+                                "llm",
+                                ("chat", model, params, messages),
+                                lambda: _chat(messages, model, params),
+                            )
+                            queue.put_nowait(content)
+                            outcome["ok"] = True
+                            break
+                        stream = await get_async_groq_client().chat.completions.create(
+                            messages=messages, model=model, stream=True, **params
+                        )
+                        async for chunk in stream:
+                            delta = chunk.choices[0].delta.content if chunk.choices else None
+                            if delta:
+                                sent = True
+                                queue.put_nowait(delta)
+                            # Groq reports usage on the last chunk.
+                            usage = getattr(getattr(chunk, "x_groq", None), "usage", None)
+                            if usage is not None:
+                                outcome["used"] = usage.total_tokens
+                        outcome["ok"] = True
+                        break
+                    except Exception as e:
+                        delay = _rate_limit_delay(e)
+                        # Once text has been sent, a retry would repeat it.
+                        if delay is None or sent:
+                            raise
+                        outcome["retry_after"] = delay or llm_rate_limiter.backoff(attempt)
+                        if attempt == MAX_RETRIES:
+                            raise
+            metrics.increment("llm_retries", model=model)
+    except Exception as e:
+        queue.put_nowait(e)
+    else:
+        queue.put_nowait(_STREAM_END)
+
+
+async def stream_chat_completion(messages, model, cache=None, **params):
+    use_cache = _use_cache(cache, params)
+    key = make_key("chat", model, params, messages)
+    if use_cache and cache != "refresh":
+        value = await asyncio.to_thread(llm_cache.get, key)
+        if value is not None:
+            metrics.increment("llm_cache", kind="chat", result="hit")
+            yield value
+            return
+    metrics.increment("llm_cache", kind="chat", result="miss" if use_cache else "bypass")
+
+    parts = []
+    queue = asyncio.Queue()
+    producer = asyncio.create_task(_produce_stream(messages, model, params, queue))
+    try:
+        while (item := await queue.get()) is not _STREAM_END:
+            if isinstance(item, Exception):
+                raise item
+            parts.append(item)
+            yield item
+    finally:
+        # The consumer stopped early (closed or cancelled): stop the
+        # provider stream too, which releases its slot.
+        producer.cancel()
+
+    if use_cache and parts:
+        await asyncio.to_thread(llm_cache.put, key, "".join(parts))
+
+
+async def invoke_chat_model(messages, model, cache=None, cacheable=None, **params) -> str:
+    async def call():
+        response = await get_chat_model(model, **params).ainvoke(messages)
+        usage = getattr(response, "usage_metadata", None) or {}
+        return response.content, usage.get("total_tokens")
+
+    return await _cached(
+        "langchain", (model, params, messages), call, cache, params, cacheable
+    )
+
+
+async def invoke_structured(
+    chain, inputs, schema, model, namespace, cache=None, **params
+):
+    """
+    Invoke `chain` (which must return a `schema` instance) with caching.
+
+    `model`, `params` and `namespace` only describe the chain for the cache
+    key; the chain itself is built by the caller.
+    """
+
+    async def call():
+        # Structured chains do not report usage; the estimate stands.
+        return (await chain.ainvoke(inputs)).model_dump(), None
+
+    value = await _cached(
+        f"structured:{namespace}",
+        (model, params, schema.__name__, inputs),
+        call,
+        cache,
+        params,
+    )
+    return schema.model_validate(value)
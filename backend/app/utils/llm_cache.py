@@ -0,0 +1,207 @@
+"""
+llm_cache.py
+------------
+Disk-backed cache for LLM responses, stored in a local SQLite file.
+
+Re-analyzing an article, or asking the same chat question twice, repeats
+identical LLM calls. `app.utils.llm` looks every call up here first, keyed
+on a hash of the model, the call parameters and the prompt.
+
+Main Features:
+    - Entries expire after a TTL.
+    - The least recently used entries are evicted once the cache holds more
+      than `LLM_CACHE_MAX_ENTRIES` entries or `LLM_CACHE_MAX_MB` of data.
+    - Hits and misses are counted in the `llm_cache` metric, labelled by
+      call kind; the entry count and size are published as the
+      "llm_cache_store" entry of `GET /api/metrics`.
+
+Classes:
+    LLMCache
+        Thread-safe SQLite cache of JSON-serializable values.
+
+Functions:
+    make_key(*parts) -> str
+        SHA-256 of the JSON encoding of `parts`.
+
+Attributes:
+    llm_cache (LLMCache): Process-wide cache.
+
+Environment Variables:
+    LLM_CACHE_PATH (str): SQLite file (default "llm_cache.db"). Use
+        ":memory:" to keep the cache in memory only.
+    LLM_CACHE_TTL (float): Seconds an entry stays valid (default 7 days).
+    LLM_CACHE_MAX_ENTRIES (int): Maximum number of entries (default 10000).
+    LLM_CACHE_MAX_MB (float): Maximum total size of the values (default 100).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from app.utils.metrics import metrics
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.db")
+CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600))
+CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 10000))
+CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", 100))
+
+# Eviction runs after this many writes (or a tenth of the entry limit, if
+# smaller) rather than on every write, so the limits are soft.
+EVICT_EVERY = 50
+
+
+def make_key(*parts) -> str:
+    encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    SQLite-backed TTL + LRU cache.
+
+    Args:
+        path (str): SQLite database path, or ":memory:".
+        ttl (float): Seconds an entry stays valid.
+        max_entries (int): Maximum number of entries.
+        max_mb (float): Maximum total size of the stored values.
+    """
+
+    def __init__(
+        self,
+        path: str = CACHE_PATH,
+        ttl: float = CACHE_TTL,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        max_mb: float = CACHE_MAX_MB,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = int(max_mb * 2**20)
+        self._lock = threading.Lock()
+        self._db = None
+        self._writes = 0
+
+    def _connect(self):
+        if self._db is not None:
+            return self._db
+        try:
+            db = sqlite3.connect(self.path, check_same_thread=False)
+            if self.path != ":memory:":
+                db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)"
+            )
+            db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Could not open LLM cache at {self.path}: {e}")
+            db = sqlite3.connect(":memory:", check_same_thread=False)
+            db.execute(
+                "CREATE TABLE llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "size INTEGER NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+        self._db = db
+        self._evict(db)
+        return db
+
+    def get(self, key: str):
+        """Return the cached value for `key`, or None."""
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            try:
+                row = db.execute(
+                    "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                value, created_at = row
+                if created_at + self.ttl < now:
+                    db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    db.commit()
+                    return None
+                db.execute(
+                    "UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                db.commit()
+            except sqlite3.Error as e:
+                logger.error(f"LLM cache read failed: {e}")
+                return None
+        return json.loads(value)
+
+    def put(self, key: str, value) -> None:
+        encoded = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            db = self._connect()
+            try:
+                db.execute(
+                    "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?)",
+                    (key, encoded, len(encoded.encode("utf-8")), now, now),
+                )
+                db.commit()
+            except sqlite3.Error as e:
+                logger.error(f"LLM cache write failed: {e}")
+                return
+            self._writes += 1
+            if self._writes % max(1, min(EVICT_EVERY, self.max_entries // 10)) == 0:
+                self._evict(db)
+
+    def _evict(self, db) -> None:
+        """Drop expired entries, then the least recently used ones over the limits."""
+        try:
+            db.execute(
+                "DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl,)
+            )
+            count, size = db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+            if count > self.max_entries or size > self.max_bytes:
+                evicted = 0
+                rows = db.execute(
+                    "SELECT key, size FROM llm_cache ORDER BY accessed_at"
+                ).fetchall()
+                for key, entry_size in rows:
+                    if count <= self.max_entries and size <= self.max_bytes:
+                        break
+                    db.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    count -= 1
+                    size -= entry_size
+                    evicted += 1
+                metrics.increment("llm_cache_evictions", evicted)
+            db.commit()
+        except sqlite3.Error as e:
+            logger.error(f"LLM cache eviction failed: {e}")
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._connect()
+            db.execute("DELETE FROM llm_cache")
+            db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            db = self._connect()
+            count, size = db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        return {"entries": count, "size_mb": round(size / 2**20, 2)}
+
+
+llm_cache = LLMCache()
+metrics.register_collector("llm_cache_store", llm_cache.stats)
@@ -0,0 +1,66 @@
+"""
+metrics.py
+----------
+Minimal in-process metrics registry exposed through `GET /api/metrics`.
+
+Counters are identified by a name plus optional labels, e.g.
+`metrics.increment("fetch_rejections", reason="too_large")`. Components that
+already keep their own statistics (caches, schedulers) register a collector
+callable instead, which is evaluated when a snapshot is taken.
+
+Classes:
+    Metrics
+        Thread-safe labelled counters plus named collectors.
+
+Attributes:
+    metrics (Metrics): Process-wide registry.
+"""
+
+import threading
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._collectors = {}
+
+    def increment(self, name: str, value: float = 1, **labels) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def register_collector(self, name: str, collector) -> None:
+        """Register a zero-argument callable whose result is added to snapshots."""
+        with self._lock:
+            self._collectors[name] = collector
+
+    def snapshot(self) -> dict:
+        """
+        Return all counters and collector outputs.
+
+        Counters are grouped by name; labelled values are keyed by a
+        "label=value,..." string, unlabelled ones by "total".
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            collectors = dict(self._collectors)
+
+        result = {}
+        for (name, labels), value in sorted(counters.items()):
+            label_key = ",".join(f"{k}={v}" for k, v in labels) or "total"
+            result.setdefault(name, {})[label_key] = value
+
+        for name, collector in collectors.items():
+            try:
+                result[name] = collector()
+            except Exception as e:
+                logger.error(f"Metrics collector '{name}' failed: {e}")
+                result[name] = {"error": str(e)}
+        return result
+
+
+metrics = Metrics()
@@ -0,0 +1,176 @@
+"""
+providers.py
+------------
+Record/replay layer for the external services the pipeline calls: Groq
+(LLM), Google Custom Search, article downloads, Pinecone and the embedding
+model.
+
+Each call site passes its request (the parts that determine the answer)
+and a function doing the real call to `provide()` / `provide_sync()`.
+What happens then depends on `PROVIDER_MODE`:
+    live     The real call is made; nothing is recorded (default).
+    record   The real call is made and its JSON-serializable result is
+             written to `PROVIDER_FIXTURES_DIR/<kind>/<sha256>.json`.
+    replay   No real call: the recorded result is returned after a
+             simulated latency, or a simulated error is raised at
+             `PROVIDER_REPLAY_ERROR_RATE`. A request with no fixture
+             raises `FixtureNotFound`.
+
+Clients are only built inside the real-call functions, so in replay mode
+no API keys or network access are needed. Record a run once with real
+keys, then profile `run_langgraph_workflow`, the routes or the ingest CLI
+against the fixtures on an isolated machine. Raise `LLM_RPM`/`LLM_TPM`
+for replay runs, or the LLM rate limiter paces them like the real API.
+
+Simulated errors are `SimulatedProviderError`, an `httpx.HTTPError` with a
+`status_code` and a `Retry-After` header, so the same handling that
+covers real failures (LLM retries, skipped claims, failed fetches) is
+exercised.
+
+Classes:
+    FixtureNotFound
+        Raised in replay mode for a request that was never recorded.
+
+    SimulatedProviderError
+        Error raised at the configured replay error rate.
+
+Functions:
+    async provide(kind: str, request: tuple, live) -> Any
+        Result of `await live()` according to the provider mode.
+
+    provide_sync(kind: str, request: tuple, live) -> Any
+        Same for synchronous call sites.
+
+    load_fixture(kind: str, request: tuple) -> Any
+        Recorded result of a request, without latency or errors.
+
+    save_fixture(kind: str, request: tuple, response) -> None
+        Records the result of a request.
+
+Environment Variables:
+    PROVIDER_MODE (str): "live" (default), "record" or "replay".
+    PROVIDER_FIXTURES_DIR (str): Fixture directory (default "fixtures").
+    PROVIDER_REPLAY_LATENCY (str): Seconds added to each replayed call;
+        a number, or a JSON object per kind such as
+        '{"llm": 0.8, "search": 0.3, "default": 0.1}' (default 0).
+    PROVIDER_REPLAY_JITTER (float): Random share of the latency added or
+        removed, 0 to 1 (default 0.2).
+    PROVIDER_REPLAY_ERROR_RATE (float): Share of replayed calls that fail
+        (default 0).
+    PROVIDER_REPLAY_ERROR_STATUS (int): Status of simulated errors
+        (default 429).
+"""
+
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import httpx
+from app.utils.llm_cache import make_key
+from app.utils.metrics import metrics
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+PROVIDER_MODE = os.getenv("PROVIDER_MODE", "live").lower()
+FIXTURES_DIR = os.getenv("PROVIDER_FIXTURES_DIR", "fixtures")
+REPLAY_JITTER = float(os.getenv("PROVIDER_REPLAY_JITTER", 0.2))
+REPLAY_ERROR_RATE = float(os.getenv("PROVIDER_REPLAY_ERROR_RATE", 0))
+REPLAY_ERROR_STATUS = int(os.getenv("PROVIDER_REPLAY_ERROR_STATUS", 429))
+
+if PROVIDER_MODE not in ("live", "record", "replay"):
+    logger.warning(f"Unknown PROVIDER_MODE '{PROVIDER_MODE}', using live")
+    PROVIDER_MODE = "live"
+
+
+def _load_latency() -> dict:
+    raw = os.getenv("PROVIDER_REPLAY_LATENCY", "0")
+    try:
+        value = json.loads(raw)
+    except json.JSONDecodeError:
+        logger.error(f"Ignoring invalid PROVIDER_REPLAY_LATENCY: {raw}")
+        return {"default": 0.0}
+    if isinstance(value, dict):
+        return {kind: float(seconds) for kind, seconds in value.items()}
+    return {"default": float(value)}
+
+
+REPLAY_LATENCY = _load_latency()
+
+
+class FixtureNotFound(LookupError):
+    pass
+
+
+class SimulatedProviderError(httpx.HTTPError):
+    def __init__(self, kind: str, status_code: int = REPLAY_ERROR_STATUS):
+        super().__init__(f"Simulated {kind} provider error (HTTP {status_code})")
+        self.status_code = status_code
+        self.response = httpx.Response(status_code, headers={"retry-after": "1"})
+
+
+def _path(kind: str, request: tuple) -> str:
+    return os.path.join(FIXTURES_DIR, kind, f"{make_key(kind, *request)}.json")
+
+
+def load_fixture(kind: str, request: tuple):
+    path = _path(kind, request)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["response"]
+    except FileNotFoundError:
+        metrics.increment("provider_replay", kind=kind, result="missing")
+        raise FixtureNotFound(f"No recorded {kind} response for this request ({path})")
+
+
+def save_fixture(kind: str, request: tuple, response) -> None:
+    path = _path(kind, request)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    record = {"kind": kind, "request": request, "response": response}
+    # A temp file per writer, replaced atomically, so concurrent recorders
+    # of the same request never leave a torn or mixed file.
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, default=str)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    metrics.increment("provider_record", kind=kind)
+
+
+def _replay_delay(kind: str) -> float:
+    latency = REPLAY_LATENCY.get(kind, REPLAY_LATENCY.get("default", 0.0))
+    return max(0.0, latency * (1 + random.uniform(-REPLAY_JITTER, REPLAY_JITTER)))
+
+
+def _replay(kind: str, request: tuple):
+    if random.random() < REPLAY_ERROR_RATE:
+        metrics.increment("provider_replay", kind=kind, result="error")
+        raise SimulatedProviderError(kind)
+    response = load_fixture(kind, request)
+    metrics.increment("provider_replay", kind=kind, result="hit")
+    return response
+
+
+async def provide(kind: str, request: tuple, live):
+    if PROVIDER_MODE == "replay":
+        await asyncio.sleep(_replay_delay(kind))
+        return _replay(kind, request)
+    response = await live()
+    if PROVIDER_MODE == "record":
+        await asyncio.to_thread(save_fixture, kind, request, response)
+    return response
+
+
+def provide_sync(kind: str, request: tuple, live):
+    if PROVIDER_MODE == "replay":
+        time.sleep(_replay_delay(kind))
+        return _replay(kind, request)
+    response = live()
+    if PROVIDER_MODE == "record":
+        save_fixture(kind, request, response)
+    return response
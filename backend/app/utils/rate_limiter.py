@@ -0,0 +1,264 @@
+"""
+rate_limiter.py
+---------------
+Per-model request scheduler for LLM calls, so bursts of graph runs stay
+under the provider's rate limits instead of failing with 429s.
+
+Every LLM call made through `app.utils.llm` asks this scheduler for a slot
+on its model first. A slot is granted when:
+    - the model's requests-per-minute bucket has a request left,
+    - its tokens-per-minute bucket holds the call's estimated tokens
+      (prompt plus `max_tokens`); the estimate is corrected with the real
+      usage once the reply arrives,
+    - fewer calls are in flight than the model's concurrency window, and
+    - the model is not paused after a rate-limit reply.
+
+The concurrency window adapts with additive increase / multiplicative
+decrease: every successful call widens it by 1/window (about one extra
+slot per window's worth of successes), every rate-limit reply halves it.
+A 429/503 also pauses the model for the reply's Retry-After, or for an
+exponential backoff with jitter when the provider sends none.
+
+Both buckets refill continuously, so a per-minute limit of 30 means one
+request every two seconds rather than 30 at the top of each minute.
+Limits per model come from `LLM_RATE_LIMITS`; other models use the
+`LLM_RPM`/`LLM_TPM` defaults. State per model is published as the
+"llm_rate_limits" entry of `GET /api/metrics`.
+
+Classes:
+    ModelLimiter
+        Buckets, window and pause for one model.
+
+    LLMRateLimiter
+        Registry of model limiters; `slot(model, tokens)` is an async
+        context manager.
+
+Attributes:
+    llm_rate_limiter (LLMRateLimiter): Process-wide scheduler.
+
+Environment Variables:
+    LLM_RATE_LIMITS (str): JSON object of per-model limits, e.g.
+        '{"gemma2-9b-it": {"rpm": 30, "tpm": 15000}}'.
+    LLM_RPM (int): Requests per minute for other models (default 30).
+    LLM_TPM (int): Tokens per minute for other models (default 15000).
+    LLM_INITIAL_WINDOW (float): Starting concurrency window (default 4).
+    LLM_MAX_WINDOW (float): Largest concurrency window (default
+        `LLM_MAX_CONCURRENCY`).
+    LLM_BACKOFF_BASE (float): First backoff in seconds without
+        Retry-After (default 2).
+    LLM_BACKOFF_MAX (float): Longest pause in seconds (default 60).
+"""
+
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from contextlib import asynccontextmanager
+from app.utils.concurrency import LIMITS
+from app.utils.metrics import metrics
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+DEFAULT_RPM = int(os.getenv("LLM_RPM", 30))
+DEFAULT_TPM = int(os.getenv("LLM_TPM", 15000))
+INITIAL_WINDOW = float(os.getenv("LLM_INITIAL_WINDOW", 4))
+MAX_WINDOW = float(os.getenv("LLM_MAX_WINDOW", LIMITS["llm"]))
+BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", 2))
+BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", 60))
+
+# Rate-limit replies within this many seconds of a decrease are treated as
+# the same congestion event, so a burst of 429s halves the window once.
+DECREASE_HOLDOFF = 1.0
+# How often a call blocked only by the window re-checks for a free slot.
+POLL_INTERVAL = 0.05
+
+
+def _load_limits() -> dict:
+    raw = os.getenv("LLM_RATE_LIMITS")
+    if not raw:
+        return {}
+    try:
+        limits = json.loads(raw)
+    except json.JSONDecodeError as e:
+        logger.error(f"Ignoring invalid LLM_RATE_LIMITS: {e}")
+        return {}
+    return limits if isinstance(limits, dict) else {}
+
+
+class _Bucket:
+    """Continuously refilling bucket holding at most `per_minute` units."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """Seconds until `amount` units are available (0 if they are now)."""
+        missing = amount - self.level
+        return missing / self.rate if missing > 0 else 0.0
+
+
+class ModelLimiter:
+    """
+    Rate and concurrency state for one model.
+
+    Args:
+        rpm (int): Requests per minute.
+        tpm (int): Tokens per minute.
+    """
+
+    def __init__(self, rpm: int = DEFAULT_RPM, tpm: int = DEFAULT_TPM):
+        self.requests = _Bucket(rpm)
+        self.tokens = _Bucket(tpm)
+        self.window = min(INITIAL_WINDOW, MAX_WINDOW)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.last_decrease = 0.0
+        self.rate_limited = 0
+        self.granted = 0
+        self.wait_total = 0.0
+
+    def try_acquire(self, tokens: float, now: float) -> float:
+        """Take a slot and return 0, or return how long to wait before retrying."""
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        wait = max(
+            self.paused_until - now,
+            self.requests.wait_for(1),
+            self.tokens.wait_for(tokens),
+        )
+        if wait > 0:
+            return wait
+        if self.in_flight >= int(self.window):
+            return POLL_INTERVAL
+        self.requests.level -= 1
+        self.tokens.level -= tokens
+        self.in_flight += 1
+        self.granted += 1
+        return 0.0
+
+    def release(self, estimated: float, used, retry_after, ok: bool, now: float) -> None:
+        self.in_flight -= 1
+        if used is not None:
+            # Charge the real usage; the bucket may go negative until it refills.
+            self.tokens.level -= used - estimated
+        if ok:
+            self.window = min(MAX_WINDOW, self.window + 1 / self.window)
+        if retry_after is None:
+            return
+        self.rate_limited += 1
+        self.paused_until = max(self.paused_until, now + retry_after)
+        if now - self.last_decrease > DECREASE_HOLDOFF:
+            self.window = max(1.0, self.window / 2)
+            self.last_decrease = now
+
+    def stats(self, now: float) -> dict:
+        self.requests.refill(now)
+        self.tokens.refill(now)
+        return {
+            "window": round(self.window, 2),
+            "in_flight": self.in_flight,
+            "requests_available": round(self.requests.level, 1),
+            "tokens_available": round(self.tokens.level),
+            "paused_for": round(max(0.0, self.paused_until - now), 1),
+            "granted": self.granted,
+            "rate_limited": self.rate_limited,
+            "avg_wait": round(self.wait_total / self.granted, 3) if self.granted else 0.0,
+        }
+
+
+class LLMRateLimiter:
+    """
+    Hands out LLM call slots per model.
+
+    State is guarded by a thread lock and waiting is done with
+    `asyncio.sleep`, so one limiter serves every event loop in the process
+    (the API's, and the ones started by the CLI and start-up threads).
+
+    Args:
+        limits (dict, optional): {model: {"rpm": int, "tpm": int}}.
+    """
+
+    def __init__(self, limits: dict | None = None):
+        self.limits = _load_limits() if limits is None else limits
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def _model(self, model: str) -> ModelLimiter:
+        limiter = self._models.get(model)
+        if limiter is None:
+            config = self.limits.get(model, {})
+            limiter = self._models[model] = ModelLimiter(
+                rpm=config.get("rpm", DEFAULT_RPM), tpm=config.get("tpm", DEFAULT_TPM)
+            )
+        return limiter
+
+    def backoff(self, attempt: int) -> float:
+        """Pause for a rate-limit reply without Retry-After (full jitter)."""
+        return random.uniform(0.5, 1.0) * min(BACKOFF_MAX, BACKOFF_BASE * 2**attempt)
+
+    async def acquire(self, model: str, tokens: float) -> float:
+        """Wait for a slot on `model`; returns the token estimate charged."""
+        start = time.monotonic()
+        with self._lock:
+            limiter = self._model(model)
+            # A call larger than the whole bucket would never fit.
+            tokens = min(tokens, limiter.tokens.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = limiter.try_acquire(tokens, now)
+                if not wait:
+                    limiter.wait_total += now - start
+                    return tokens
+            await asyncio.sleep(wait)
+
+    def release(
+        self, model: str, tokens: float, used=None, retry_after=None, ok: bool = True
+    ) -> None:
+        with self._lock:
+            limiter = self._model(model)
+            if retry_after is not None:
+                retry_after = min(retry_after, BACKOFF_MAX)
+                metrics.increment("llm_rate_limited", model=model)
+                logger.warning(
+                    f"Rate limited on {model}; pausing {retry_after:.1f}s, "
+                    f"window {limiter.window:.1f}"
+                )
+            limiter.release(tokens, used, retry_after, ok, time.monotonic())
+
+    @asynccontextmanager
+    async def slot(self, model: str, tokens: float):
+        """
+        Hold a call slot on `model` while the block runs.
+
+        Yields a dict: set "ok" once the call succeeded, "used" to its real
+        token count, and "retry_after" (seconds) when the provider
+        rate-limited it. Only successful calls widen the window.
+        """
+        tokens = await self.acquire(model, tokens)
+        outcome = {"ok": False, "used": None, "retry_after": None}
+        try:
+            yield outcome
+        finally:
+            self.release(
+                model, tokens, outcome["used"], outcome["retry_after"], outcome["ok"]
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            return {model: limiter.stats(now) for model, limiter in self._models.items()}
+
+
+llm_rate_limiter = LLMRateLimiter()
+metrics.register_collector("llm_rate_limits", llm_rate_limiter.stats)
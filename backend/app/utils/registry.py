@@ -0,0 +1,244 @@
+"""
+registry.py
+-----------
+Process-wide registry of heavy, shareable resources: the sentence embedding
+model, one LLM client per provider and one vector-index handle.
+
+Every module asks the registry instead of building its own instance, so a
+worker process loads `all-MiniLM-L6-v2` once, reuses a single Groq connection
+pool for both the SDK and LangChain calls, and keeps one Pinecone index
+handle. Resources are created lazily on first use; `warm_up()` creates them
+ahead of time. Each component has its own creation lock, so loading a slow
+one (the embedding model) does not hold up lookups of the others.
+
+Functions:
+    get_embedder() -> SentenceTransformer
+        Shared embedding model.
+
+    get_groq_client() -> groq.Groq
+        Shared synchronous Groq client.
+
+    get_async_groq_client() -> groq.AsyncGroq
+        Shared asynchronous Groq client.
+
+    get_chat_model(model: str, **params) -> ChatGroq
+        LangChain chat model bound to the shared Groq clients, cached per
+        model and parameter set.
+
+    get_pinecone_client() -> Pinecone
+        Shared Pinecone client.
+
+    get_index() -> pinecone.Index
+        Shared handle to the Perspective index, created if missing.
+
+    get_async_index() -> AsyncIndex
+        Shared async handle to the same index.
+
+    warm_up(components: Iterable[str] | None = None) -> dict
+        Loads the given components (all by default) and reports their status.
+
+    memory_report() -> dict
+        Current and peak RSS of this process plus the RSS growth measured
+        while each loaded component was created. Also published as the
+        "process" entry of `GET /api/metrics`.
+
+Environment Variables:
+    GROQ_API_KEY (str): API key for authenticating with Groq.
+    PINECONE_API_KEY (str): API key for authenticating with Pinecone.
+    EMBEDDING_MODEL (str): Sentence-transformers model (default "all-MiniLM-L6-v2").
+    GROQ_MAX_RETRIES (int): Retries done by the Groq SDK itself (default 0;
+        rate-limited calls are retried by `app.utils.llm`).
+"""
+
+import os
+import resource
+import sys
+import threading
+import time
+from dotenv import load_dotenv
+from app.utils.metrics import metrics
+from app.logging.logging_config import setup_logger
+
+logger = setup_logger(__name__)
+
+load_dotenv()
+
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", 0))
+
+# Guards the dicts below; never held while a component is being created.
+_lock = threading.Lock()
+_creation_locks = {}
+_instances = {}
+_load_stats = {}
+
+
+def _rss_bytes() -> int:
+    """Current resident set size of this process, in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return _peak_rss_bytes()
+
+
+def _peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _get_or_create(name, factory):
+    instance = _instances.get(name)
+    if instance is not None:
+        return instance
+    with _lock:
+        creation_lock = _creation_locks.setdefault(name, threading.Lock())
+    # One creator per component; callers of other components are not blocked.
+    with creation_lock:
+        instance = _instances.get(name)
+        if instance is None:
+            rss_before = _rss_bytes()
+            start = time.perf_counter()
+            instance = factory()
+            # Approximate when other components load at the same time.
+            stats = {
+                "load_seconds": round(time.perf_counter() - start, 3),
+                "rss_delta_mb": round((_rss_bytes() - rss_before) / 2**20, 1),
+            }
+            with _lock:
+                _load_stats[name] = stats
+                _instances[name] = instance
+            logger.info(f"Registry loaded '{name}' {stats}")
+    return instance
+
+
+def get_embedder():
+    def create():
+        from sentence_transformers import SentenceTransformer
+
+        return SentenceTransformer(EMBEDDING_MODEL)
+
+    return _get_or_create("embedder", create)
+
+
+def get_groq_client():
+    def create():
+        from groq import Groq
+
+        return Groq(api_key=os.getenv("GROQ_API_KEY"), max_retries=GROQ_MAX_RETRIES)
+
+    return _get_or_create("groq", create)
+
+
+def get_async_groq_client():
+    def create():
+        from groq import AsyncGroq
+
+        return AsyncGroq(
+            api_key=os.getenv("GROQ_API_KEY"), max_retries=GROQ_MAX_RETRIES
+        )
+
+    return _get_or_create("groq_async", create)
+
+
+def get_chat_model(model: str, **params):
+    """
+    Return a LangChain `ChatGroq` for `model` that reuses the shared Groq clients.
+
+    Instances are cached per (model, params), so structured-output wrappers
+    built on top of them are created once as well.
+    """
+    key = f"chat:{model}:" + ",".join(f"{k}={v}" for k, v in sorted(params.items()))
+
+    def create():
+        from langchain_groq import ChatGroq
+
+        return ChatGroq(
+            model=model,
+            client=get_groq_client().chat.completions,
+            async_client=get_async_groq_client().chat.completions,
+            **params,
+        )
+
+    return _get_or_create(key, create)
+
+
+def get_pinecone_client():
+    def create():
+        from pinecone import Pinecone
+
+        api_key = os.getenv("PINECONE_API_KEY")
+        if not api_key:
+            raise ValueError("PINECONE_API_KEY environment variable is required")
+        try:
+            return Pinecone(api_key=api_key)
+        except Exception as e:
+            raise RuntimeError(f"Error occured while intialising pinecone client:{e}")
+
+    return _get_or_create("pinecone", create)
+
+
+def get_index():
+    def create():
+        from app.db.vector_store import init_index
+
+        return init_index(get_pinecone_client())
+
+    return _get_or_create("index", create)
+
+
+def get_async_index():
+    def create():
+        from app.db.vector_store import AsyncIndex, INDEX_NAME
+
+        get_index()  # make sure the index exists
+        host = get_pinecone_client().describe_index(INDEX_NAME).host
+        return AsyncIndex(host, os.getenv("PINECONE_API_KEY"))
+
+    return _get_or_create("async_index", create)
+
+
+WARM_UP_COMPONENTS = {
+    "embedder": get_embedder,
+    "groq": get_groq_client,
+    "groq_async": get_async_groq_client,
+    "index": get_index,
+    "async_index": get_async_index,
+}
+
+
+def warm_up(components=None) -> dict:
+    """
+    Create the given registry components now instead of on first use.
+
+    Args:
+        components (Iterable[str], optional): Names from `WARM_UP_COMPONENTS`;
+            all of them by default.
+
+    Returns:
+        dict: Per-component "ok" or the error message.
+    """
+    results = {}
+    for name in components or WARM_UP_COMPONENTS:
+        try:
+            WARM_UP_COMPONENTS[name]()
+            results[name] = "ok"
+        except Exception as e:
+            logger.exception(f"Warm-up of '{name}' failed: {e}")
+            results[name] = str(e)
+    return results
+
+
+def memory_report() -> dict:
+    with _lock:
+        loaded = {name: dict(stats) for name, stats in _load_stats.items()}
+    return {
+        "pid": os.getpid(),
+        "rss_mb": round(_rss_bytes() / 2**20, 1),
+        "peak_rss_mb": round(_peak_rss_bytes() / 2**20, 1),
+        "loaded": loaded,
+    }
+
+
+metrics.register_collector("process", memory_report)
@@ -4,7 +4,7 @@ store_vectors.py
 Provides a utility for persisting vector embeddings into a Pinecone index.
 
 Functions:
-    store(vectors: List[Dict[str, Any]], namespace: str = "default") -> None
+    async store(vectors: List[Dict[str, Any]], namespace: str = "default") -> None
         - Validates and upserts a batch of vector embeddings into the 
           configured Pinecone namespace.
         - Parameters:
@@ -15,22 +15,26 @@ Functions:
             RuntimeError: If the upsert operation to Pinecone fails.
 
 Notes:
+    - Upserts go through the async index handle, so the event loop is not
+      blocked while Pinecone answers, and through `app.utils.providers`
+      (kind "pinecone"), so they can be recorded and replayed.
     - Logs success and failure events for monitoring.
     - Intended to be used after generating embeddings via 
       the embed.py module before retrieval/semantic search.
 """
 
 
-from app.db.vector_store import index
-
-
+import asyncio
+from app.utils.registry import get_async_index
+from app.utils.concurrency import limit
+from app.utils.providers import provide
 from typing import List, Dict, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def store(vectors: List[Dict[str, Any]], namespace: str = "default") -> None:
+async def store(vectors: List[Dict[str, Any]], namespace: str = "default") -> None:
     """
     Store vectors in the Pinecone index.
 
@@ -45,8 +49,14 @@ def store(vectors: List[Dict[str, Any]], namespace: str = "default") -> None:
     if not vectors:
         raise ValueError("Vectors list cannot be empty")
 
+    async def live():
+        # The first call resolves the index host, which blocks.
+        index = await asyncio.to_thread(get_async_index)
+        return await index.upsert(vectors, namespace=namespace)
+
     try:
-        index.upsert(vectors, namespace=namespace)
+        async with limit("vector"):
+            await provide("pinecone", ("upsert", namespace, vectors), live)
         logger.info(
             f"Successfully stored {len(vectors)} vectors in namespace '{namespace}'"
         )
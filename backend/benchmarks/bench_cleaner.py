@@ -0,0 +1,122 @@
+"""
+bench_cleaner.py
+----------------
+Checks that `clean_extracted_text` produces exactly the same output as the
+original multi-pass implementation, and measures the speedup.
+
+The fixture corpus is generated deterministically (articles of increasing
+length with boilerplate lines mixed in); extra real-world fixtures can be
+passed as paths to .txt files.
+
+Usage:
+    $ uv run python -m benchmarks.bench_cleaner [fixture.txt ...]
+"""
+
+import random
+import re
+import sys
+import time
+from app.modules.scraper.cleaner import BOILERPLATE_PATTERNS, clean_extracted_text
+
+
+def legacy_clean(text: str):
+    """The cleaner as it was before patterns were compiled into one pass."""
+    if not text:
+        return ""
+    text = re.sub(r"\n{2,}", "\n\n", text)
+    for pattern in BOILERPLATE_PATTERNS:
+        text = re.sub(pattern, "", text, flags=re.IGNORECASE)
+    lines = text.split("\n")
+    cleaned_lines = [line.strip() for line in lines if len(line.strip()) > 30]
+    cleaned_text = "\n\n".join(cleaned_lines)
+    cleaned_text = re.sub(r"[ \t]{2,}", " ", cleaned_text).strip()
+    return cleaned_text
+
+
+WORDS = (
+    "government policy report minister economy market growth election vote "
+    "climate energy court ruling officials said according data percent year "
+    "city council people public health study researchers found million"
+).split()
+
+JUNK = [
+    "Advertisement",
+    "Read more at The Daily Example",
+    "Subscribe to our newsletter for updates",
+    "© 2024 Example Media. All rights reserved.",
+    "Photo by Jane Doe / Getty Images",
+    "Share this article",
+    "Related Articles",
+    "   ",
+    "",
+    "Click here to   download our app and stay connected with us",
+    "The minister said about us that   the report was\tfinal advertisement today.",
+    "DON’T MISS OUT ON the biggest stories — Sponsored Content from partners",
+]
+
+# Characters that exercise the exact (slow) screening path.
+CASEFOLD_EDGE_CASES = [
+    "An ADVERTİSEMENT block followed by a long enough sentence of article text.",
+    "A ſubscribe to link and a \u212aelvin sign inside an otherwise normal line.",
+]
+
+
+def make_article(rng: random.Random, paragraphs: int) -> str:
+    lines = []
+    for _ in range(paragraphs):
+        if rng.random() < 0.3:
+            lines.append(rng.choice(JUNK))
+        sentence_count = rng.randint(1, 6)
+        lines.append(
+            " ".join(
+                " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 20))).capitalize()
+                + "."
+                for _ in range(sentence_count)
+            )
+        )
+        lines.append("\n" * rng.randint(0, 3))
+    return "\n".join(lines)
+
+
+def corpus(paths):
+    rng = random.Random(1234)
+    docs = [make_article(rng, n) for n in (5, 20, 50, 200, 1000, 5000) for _ in range(3)]
+    docs += ["", "short", "\r\n".join(JUNK), "\n".join(JUNK * 3)]
+    docs += [doc + "\n" + "\n".join(CASEFOLD_EDGE_CASES) for doc in docs[:6]]
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            docs.append(f.read())
+    return docs
+
+
+def timed(fn, docs, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for doc in docs:
+            fn(doc)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(paths):
+    docs = corpus(paths)
+
+    mismatches = [i for i, doc in enumerate(docs) if legacy_clean(doc) != clean_extracted_text(doc)]
+    if mismatches:
+        print(f"Output differs from the legacy cleaner for documents: {mismatches}")
+        return 1
+    print(f"Output identical on {len(docs)} documents.")
+
+    long_docs = [doc for doc in docs if len(doc) > 100_000] or docs
+    legacy = timed(legacy_clean, long_docs)
+    current = timed(clean_extracted_text, long_docs)
+    size = sum(len(doc) for doc in long_docs) / 1e6
+    print(f"Long articles: {len(long_docs)} docs, {size:.1f} MB")
+    print(f"  legacy:  {legacy * 1000:8.1f} ms")
+    print(f"  current: {current * 1000:8.1f} ms  ({legacy / current:.1f}x faster)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
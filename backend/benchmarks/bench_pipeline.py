@@ -0,0 +1,66 @@
+"""
+bench_pipeline.py
+-----------------
+End-to-end load test of the scraper pipeline and the LangGraph workflow
+against recorded provider responses (see `app.utils.providers`), so it
+runs without API keys or network access.
+
+Record the fixtures once with real keys, then replay them with simulated
+provider latency, errors and as many concurrent articles as needed. The
+LLM response cache and the rate limiter are part of what is measured;
+disable or widen them for a provider-bound baseline.
+
+Usage:
+    $ PROVIDER_MODE=record uv run python -m benchmarks.bench_pipeline urls.txt
+    $ PROVIDER_MODE=replay PROVIDER_REPLAY_LATENCY='{"llm": 0.8, "search": 0.3}' \\
+      LLM_CACHE_ENABLED=false LLM_RPM=100000 LLM_TPM=100000000 \\
+      uv run python -m benchmarks.bench_pipeline urls.txt --concurrency 8 --repeat 3
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from app.cli.ingest import ingest_url, print_summary, read_urls, summarize
+from app.utils.providers import PROVIDER_MODE
+from app.utils.metrics import metrics
+
+
+async def run(urls, concurrency: int) -> list:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(url):
+        async with semaphore:
+            return await ingest_url(url)
+
+    return await asyncio.gather(*(one(url) for url in urls))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay the pipeline under load.")
+    parser.add_argument("input", help="File with one article URL per line")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=1, help="Times each URL is run")
+    args = parser.parse_args(argv)
+
+    if PROVIDER_MODE == "live":
+        print("PROVIDER_MODE is 'live'; set it to 'record' or 'replay'.", file=sys.stderr)
+        return 2
+
+    with open(args.input, encoding="utf-8") as f:
+        urls = read_urls(f) * args.repeat
+
+    start = time.perf_counter()
+    records = asyncio.run(run(urls, args.concurrency))
+    summary = summarize(records, 0, time.perf_counter() - start)
+    print_summary(summary)
+
+    snapshot = metrics.snapshot()
+    for name in ("provider_replay", "provider_record", "llm_rate_limited", "llm_retries"):
+        if name in snapshot:
+            print(f"  {name}: {snapshot[name]}")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+bench_startup.py
+----------------
+Measures how long it takes to import the application, i.e. the time before
+uvicorn can accept the first connection, and lists the slowest imports.
+
+Each run imports the target module in a fresh interpreter with
+`python -X importtime` and sums the cumulative time of top-level imports.
+
+Usage:
+    $ uv run python -m benchmarks.bench_startup [--module main] [--runs 3] [--top 15]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+def import_profile(module: str) -> dict:
+    """Return {imported module: cumulative microseconds} for one cold import."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        # Nesting is shown by indentation; only keep top-level imports.
+        if name.startswith("  "):
+            continue
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def main(argv) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    totals, profiles = [], []
+    for _ in range(args.runs):
+        profile = import_profile(args.module)
+        profiles.append(profile)
+        totals.append(sum(profile.values()) / 1000)
+
+    print(f"import {args.module}: median {statistics.median(totals):.0f} ms "
+          f"over {args.runs} runs (min {min(totals):.0f} ms)")
+
+    slowest = sorted(profiles[-1].items(), key=lambda item: item[1], reverse=True)
+    print("\nSlowest top-level imports (last run):")
+    for name, micros in slowest[: args.top]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -10,6 +10,12 @@ Key Features:
     - Serves as the main entry point for the Perspective backend.
     - Configures CORS middleware to allow cross-origin requests.
     - Includes article processing routes via FastAPI's router.
+    - Starts the background start-up phase (`app.startup`) without
+      blocking the server; `GET /api/ready` reports when it is done.
+      With `WARM_UP_ON_STARTUP=true` it also loads the shared models and
+      clients so the first request does not pay for loading them.
+    - Closes the shared pooled HTTP client and stops the scraper worker
+      processes on shutdown.
     - Can be run directly using uvicorn.
 
 Usage:
@@ -19,18 +25,35 @@ Attributes:
     app (FastAPI): The FastAPI application instance.
 """
 
+from contextlib import asynccontextmanager
+import asyncio
+import os
 from fastapi import FastAPI
 from app.routes.routes import router as article_router
 from fastapi.middleware.cors import CORSMiddleware
 from app.logging.logging_config import setup_logger
+from app.utils.http_client import get_http_client
+from app.startup import run_startup
+from app.modules.scraper.process_pool import shutdown_pool
     
 # Setup logger for this module
 logger = setup_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Keep a reference so the task is not garbage collected while running.
+    app.state.startup_task = asyncio.create_task(asyncio.to_thread(run_startup))
+    yield
+    shutdown_pool()
+    get_http_client().close()
+
+
 app = FastAPI(
     title="Perspective API",
     version="1.0.0",
     description=("An API to generate alternative perspectives on biased articles"),
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -45,7 +68,6 @@ app.include_router(article_router, prefix="/api", tags=["Articles"])
 
 if __name__ == "__main__":
     import uvicorn
-    import os
 
     port = int(os.environ.get("PORT", 7860))
     logger.info(f" Server is running on http://localhost:{port}")
@@ -0,0 +1,25 @@
+from app.modules.scraper.digest import CHARS_PER_TOKEN, STAGE_BUDGETS, stage_text
+
+
+def test_over_budget_cjk_text_is_cut_not_dropped():
+    text = "这是一个没有英文句号的很长的中文句子" * 800
+    result = stage_text({"cleaned_text": text}, "sentiment")
+    assert result
+    assert len(result) <= STAGE_BUDGETS["sentiment"] * CHARS_PER_TOKEN
+    assert text.startswith(result)
+
+
+def test_over_budget_text_without_sentence_breaks_is_cut_not_dropped():
+    text = ("lorem ipsum dolor sit amet consectetur " * 400)[:13800]
+    result = stage_text({"cleaned_text": text}, "sentiment")
+    assert result
+    assert len(result) <= STAGE_BUDGETS["sentiment"] * CHARS_PER_TOKEN
+
+
+def test_long_sentence_is_cut_to_the_remaining_budget():
+    lead = "The council met on Monday. "
+    text = lead + "It " + "argued about the budget at length " * 400 + "."
+    result = stage_text({"cleaned_text": text}, "sentiment")
+    assert result.startswith(lead.strip())
+    assert len(result) > len(lead)
+    assert len(result) <= STAGE_BUDGETS["sentiment"] * CHARS_PER_TOKEN
@@ -73,19 +73,20 @@ export default function LoadingPage() {
         setArticleUrl(storedUrl);
 
         try {
-          const [processRes, biasRes] = await Promise.all([
-            axios.post("https://thunder1245-perspective-backend.hf.space/api/process", {
+          // /process scores bias as part of the same run
+          const processRes = await axios.post(
+            "https://thunder1245-perspective-backend.hf.space/api/process",
+            {
               url: storedUrl,
-            }),
-            axios.post("https://thunder1245-perspective-backend.hf.space/api/bias", {
-              url: storedUrl,
-            }),
-          ]);
+            }
+          );
 
-          sessionStorage.setItem("BiasScore", JSON.stringify(biasRes.data));
+          sessionStorage.setItem(
+            "BiasScore",
+            JSON.stringify({ bias_score: processRes.data.bias_score })
+          );
 
           console.log("Bias score saved");
-          console.log(biasRes);
 
           // Save response to sessionStorage
           sessionStorage.setItem(
@@ -136,8 +136,17 @@ export default function AnalyzePage() {
           </Badge>
         </div>
         <div className="bg-card rounded-lg border p-4 mb-8">
-          <BiasMeter score={biasScore} />
-          <p className="text-sm mt-2">Bias Score: {biasScore}</p>
+          {typeof biasScore === "number" ? (
+            <>
+              <BiasMeter score={biasScore} />
+              <p className="text-sm mt-2">Bias Score: {biasScore}</p>
+            </>
+          ) : (
+            // The backend returns a null score when bias scoring failed.
+            <p className="text-sm text-muted-foreground">
+              Bias score unavailable for this article.
+            </p>
+          )}
         </div>
 
         <div className="grid grid-cols-1 lg:grid-cols-3 gap-6">